@@ -4,7 +4,6 @@
 支持天气、加密货币、日历等功能
 """
 import time
-import spidev
 import os
 import io
 import threading
@@ -12,7 +11,6 @@ import requests
 import psutil
 import socket
 import urllib3
-import numpy as np
 import calendar
 import textwrap
 import re
@@ -21,13 +19,32 @@ import hashlib
 import json
 import logging
 from typing import Dict, List, Tuple, Optional, Callable
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance
+from PIL import Image, ImageDraw, ImageFont
 from zhdate import ZhDate
 from datetime import datetime, timedelta
 
-# 导入新的模块化 Worker
+# 导入新的模块化组件
+from screen.core.config import load_config
+from screen.core.display import init_global_driver
+from screen.core.frame_export import FrameReader
+from screen.core.rgb565 import rgb565_to_rgb888
+from screen.core.power import PowerManager
+from screen.core.recorder import FrameRecorder
+from screen.core.scroll import HardwareScroller
+from screen.core.stream import StreamReceiver
 from screen.workers.system import SystemWorker
 from screen.workers.weather import WeatherWorker
+from screen.ui.themes import create_dynamic_background, get_time_based_colors, paste_header_gradient
+from screen.ui.weather_icons import draw_weather_icon
+from screen.ui.components import blit_decoration, configure_decoration_cache, decoration_cache
+from screen.ui.compositor import Compositor
+from screen.ui.charts import candle_geometry, draw_bars, draw_candles, draw_mini_kline, price_scale, to_y
+from screen.ui.text_cache import CachedDraw, configure_text_cache, text_cache
+from screen.ui.glyph_atlas import register_atlas
+from screen.ui.nixie_assets import NIXIE_DIR_NAME, get_nixie_assets
+from screen.ui.thumbnails import configure_thumb_cache, get_thumbnail, has_thumbnail, store_thumbnail
+from screen.ui.transitions import TransitionEngine
+from screen.ui.widgets import Label, Widget, WidgetPage
 
 # 配置热加载
 try:
@@ -90,13 +107,8 @@ QWEATHER_KEY = "04cdddbc959545bb89dd599ce28e0cb7"
 CITY_ID = "101130601"
 WEATHER_UPDATE_INTERVAL = 1800  # 30分钟
 
-# 硬件配置
-DC, RST, CS = "75", "79", "233" 
-BUTTON_PIN = "70"  # PC6引脚
+# 硬件配置（引脚、SPI 参数见 screen/config/default.yaml）
 W, H = 320, 240
-SPI_BUS = 1
-SPI_DEVICE = 0
-SPI_MAX_SPEED = 62500000  # 62.5MHz - ST7789最大支持速度
 
 # 代理配置（支持环境变量）
 PROXIES = {
@@ -162,6 +174,12 @@ MAX_PAGES = 7  # 时钟、物流、B站、加密货币、日历、Beszel、Teleg
 AUTO_PAGE_SWITCH_ENABLED = False  # 确保自动切换也被禁用
 AUTO_PAGE_SWITCH_INTERVAL = 10  # 自动切换间隔（秒）
 
+# 列表页分屏（内容超过一屏时按屏轮播，屏间用硬件滚动滑动切换）
+LIST_SUB_PAGE_INTERVAL = 6  # 每屏停留时间（秒）
+TRACKING_PER_SCREEN = 2  # 物流页每屏包裹数
+BILIBILI_PER_SCREEN = 8  # B站页每屏主播数
+TELEGRAM_CHANNELS_PER_SCREEN = 3  # Telegram页每屏频道数
+
 # 物流追踪配置
 TRACKING_API_URL = "https://uapis.cn/api/v1/misc/tracking/query"
 TRACKING_UPDATE_INTERVAL = 43200  # 12小时更新一次
@@ -183,189 +201,59 @@ BESZEL_AUTH_EMAIL = "169hanser@gmail.com"
 BESZEL_AUTH_PASSWORD = "ljl2001."
 
 # ================= 2. 硬件驱动 =================
-try:
-    spi = spidev.SpiDev()
-    spi.open(SPI_BUS, SPI_DEVICE)
-    spi.max_speed_hz = SPI_MAX_SPEED
-    spi.mode = 0
-    logger.info("SPI初始化成功")
-except Exception as e:
-    logger.error(f"SPI初始化失败: {e}")
-    spi = None
-
-
-def gpio_set(pin: str, value: int) -> None:
-    """设置GPIO引脚值"""
+# ST7789 驱动已迁移到 screen.core.display，引脚与 SPI 参数见 default.yaml 的 hardware 段
+app_config = load_config()
+display_driver = init_global_driver(app_config, logger)
+# 列表页分屏之间的滑动切换（ST7789 硬件滚动）
+page_scroller = HardwareScroller(display_driver, app_config, logger)
+# 按键切换页面的过渡动画（slide / wipe / fade，超出帧预算时直接切换）
+page_transition = TransitionEngine(display_driver, app_config, logger)
+# 各页面的传输像素格式：文字为主的页面用 12 位 RGB444，时钟保持 RGB565
+DEFAULT_PIXEL_FORMAT = app_config.get("display.pixel_format", "rgb565")
+PAGE_PIXEL_FORMATS = app_config.get("display.page_pixel_formats", {}) or {}
+# 面板电源状态（按时间表睡眠 / 局部显示 / 8 色空闲）
+power_manager = PowerManager(display_driver, app_config, logger)
+# 远程渲染接收端：主机推送画面期间主循环不在本地绘制
+stream_receiver = StreamReceiver(display_driver, app_config, logger) if app_config.get("display.stream.receiver.enabled", False) else None
+# 帧录制：送往屏幕的每一帧写入录制文件（关键帧 + 异或增量游程编码）
+frame_recorder = None
+if app_config.get("display.record.enabled", False):
     try:
-        os.system(f"echo {value} > /sys/class/gpio/gpio{pin}/value 2>/dev/null")
-    except Exception as e:
-        logger.warning(f"GPIO设置失败 pin={pin}, value={value}: {e}")
-
-
-def init_gpio(pin: str, direction: str = "out") -> bool:
-    """初始化GPIO引脚"""
-    try:
-        gpio_path = f"/sys/class/gpio/gpio{pin}"
-        if not os.path.exists(gpio_path):
-            os.system(f"echo {pin} > /sys/class/gpio/export 2>/dev/null")
-        time.sleep(0.1)
-        os.system(f"echo {direction} > {gpio_path}/direction 2>/dev/null")
-        return True
-    except Exception as e:
-        logger.error(f"GPIO初始化失败 pin={pin}: {e}")
-        return False
+        frame_recorder = FrameRecorder(app_config.get("display.record.path", "/tmp/tftscreen.tftr"),
+                                       display_driver.width, display_driver.height,
+                                       app_config.get("display.record.keyframe_interval", 300), logger)
+        display_driver.add_frame_listener(frame_recorder.write)
+    except OSError as e:
+        logger.error(f"创建录制文件失败: {e}")
+# 文字栅格缓存：页面中不变的文字只栅格化一次，之后直接贴掩码
+configure_text_cache(app_config.get("display.text_cache_kb", 2048) * 1024)
+# 装饰图层缓存：卡片底、光晕、背景纹理按几何与颜色渲染一次，之后只贴图
+configure_decoration_cache(app_config.get("display.decoration_cache_kb", 1024) * 1024)
+# 缩略图缓存：后台线程按页面槽位尺寸解码一次，页面直接贴图
+configure_thumb_cache(app_config.get("display.thumb_cache_kb", 512) * 1024)
+# Web 截图读取共享内存中的帧导出（首次请求时打开）
+screenshot_reader = None
 
 
 def init_button_gpio() -> bool:
     """初始化按键GPIO"""
-    return init_gpio(BUTTON_PIN, "in")
+    return display_driver.init_button_gpio()
 
 
 def read_button_raw() -> bool:
     """读取按键原始状态"""
-    try:
-        with open(f"/sys/class/gpio/gpio{BUTTON_PIN}/value", "r") as f:
-            return f.read().strip() == "0"
-    except Exception as e:
-        logger.debug(f"读取按键失败: {e}")
-        return False
-
+    return display_driver.read_button_raw()
 
-def write_cmd(cmd: int) -> None:
-    """写入命令到显示器"""
-    if spi is None:
-        return
-    try:
-        gpio_set(CS, 0)
-        gpio_set(DC, 0)
-        spi.writebytes([cmd])
-        gpio_set(CS, 1)
-    except Exception as e:
-        logger.error(f"写入命令失败 cmd=0x{cmd:02X}: {e}")
-
-
-def write_data(data) -> None:
-    """写入数据到显示器"""
-    if spi is None:
-        return
-    try:
-        gpio_set(CS, 0)
-        gpio_set(DC, 1)
-        if isinstance(data, int):
-            spi.writebytes([data])
-        else:
-            spi.writebytes(list(data))
-        gpio_set(CS, 1)
-    except Exception as e:
-        logger.error(f"写入数据失败: {e}")
 
 def init_display() -> bool:
     """初始化显示器"""
-    try:
-        # 初始化按键GPIO
-        init_button_gpio()
-        
-        # 初始化显示器控制GPIO
-        for pin in [DC, RST, CS]:
-            if not init_gpio(pin, "out"):
-                logger.error(f"显示器GPIO初始化失败: {pin}")
-                return False
-        
-        # 硬件复位
-        gpio_set(RST, 0)
-        time.sleep(0.1)
-        gpio_set(RST, 1)
-        time.sleep(0.1)
-        
-        # 初始化序列
-        write_cmd(0x01)  # Software reset
-        time.sleep(0.1)
-        write_cmd(0x11)  # Sleep out
-        time.sleep(0.1)
-        write_cmd(0x36)  # Memory access control
-        write_data(0x28)
-        write_cmd(0x3A)  # Pixel format
-        write_data(0x55)  # 16-bit RGB565
-        write_cmd(0x29)  # Display on
-        
-        logger.info("显示器初始化成功")
-        import sys
-        sys.stdout.flush()
-        sys.stderr.flush()
-        return True
-    except Exception as e:
-        logger.error(f"显示器初始化失败: {e}")
-        return False
+    return display_driver.init_display()
 
-def rgb_to_rgb565(r: int, g: int, b: int) -> int:
-    """将RGB888转换为RGB565格式"""
-    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-
-
-def image_to_rgb565_bytes(image: Image.Image) -> bytes:
-    """使用 NumPy 向量化操作将 PIL 图像转换为 RGB565 字节数组 (性能提升约 50-100 倍)"""
-    # 确保图像为 RGB 模式并转换为 numpy 数组
-    img_array = np.array(image.convert("RGB"), dtype=np.uint16)
-    
-    # 提取 R, G, B 通道
-    r = img_array[:, :, 0]
-    g = img_array[:, :, 1]
-    b = img_array[:, :, 2]
-    
-    # 转换为 RGB565: (R & 0xF8) << 8 | (G & 0xFC) << 3 | (B >> 3)
-    # NumPy 会并行处理所有像素
-    rgb565 = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-    
-    # 将 16 位整数数组转换为大端序字节
-    return rgb565.byteswap().tobytes()
-
-
-def display_image(image: Image.Image) -> None:
-    """在显示器上显示图像 - 优化版"""
-    if spi is None:
-        return
-    
-    try:
-        # 设置显示窗口 (320x240)
-        write_cmd(0x2A)  # Column address set
-        write_data([0x00, 0x00, 0x01, 0x3F])
-        write_cmd(0x2B)  # Row address set
-        write_data([0x00, 0x00, 0x00, 0xEF])
-        write_cmd(0x2C)  # Memory write
-        
-        gpio_set(CS, 0)
-        gpio_set(DC, 1)
-        
-        # 转换并发送像素数据
-        pixels = image_to_rgb565_bytes(image)
-        spi.writebytes2(pixels)
-        
-        gpio_set(CS, 1)
-    except Exception as e:
-        logger.error(f"显示图像失败: {e}")
-        # 尝试重新初始化SPI
-        try:
-            if spi:
-                spi.close()
-            time.sleep(0.1)
-            init_display()
-        except:
-            pass
 
+def display_image(image: Image.Image, regions: Optional[List[tuple]] = None) -> None:
+    """在显示器上显示图像（仅发送变化区域；regions 为可选的变化区域提示）"""
+    display_driver.display_image(image, regions)
 
-def clear_display() -> None:
-    """清空显示器"""
-    if spi is None:
-        return
-    try:
-        write_cmd(0x2C)  # Memory write
-        gpio_set(CS, 0)
-        gpio_set(DC, 1)
-        # 发送全黑数据
-        spi.writebytes2(bytearray(W * H * 2))
-        gpio_set(CS, 1)
-    except Exception as e:
-        logger.error(f"清空显示器失败: {e}")
 
 # ================= 3. 数据中心 =================
 class DataStore:
@@ -585,6 +473,7 @@ def weather_worker() -> None:
                 info.update({
                     "temp": now_data.get("temp", "--"),
                     "text": now_data.get("text", "..."),
+                    "icon": now_data.get("icon", ""),
                     "feelsLike": now_data.get("feelsLike", "--"),
                     "humidity": now_data.get("humidity", "--"),
                     "windSpeed": now_data.get("windSpeed", "--"),
@@ -1396,6 +1285,19 @@ def telegram_worker() -> None:
         info["telegram_status"] = "Deps Missing"
         return
     
+    async def fetch_telegram_thumb(client, msg, thumb_key: str, thumb_size: Tuple[int, int]) -> Optional[str]:
+        """
+        下载消息缩略图并按槽位尺寸解码进缓存（已缓存时不再下载）
+        
+        Returns:
+            缓存中可用时返回 thumb_key，否则返回 None
+        """
+        if not has_thumbnail(thumb_key, thumb_size):
+            thumb_bytes = await client.download_media(msg.media, bytes, thumb=0)
+            if thumb_bytes:
+                store_thumbnail(thumb_key, thumb_bytes, [thumb_size])
+        return thumb_key if has_thumbnail(thumb_key, thumb_size) else None
+    
     async def fetch_messages():
         """异步获取频道消息"""
         session_path = os.path.join(os.path.dirname(__file__), 'telegram_session')
@@ -1428,9 +1330,11 @@ def telegram_worker() -> None:
                     
                     # 获取所有频道的消息
                     all_channel_data = []
-                    telegram_thumbs = {}
                     
-                    for channel_username in channels:
+                    for ch_index, channel_username in enumerate(channels):
+                        # 缩略图槽位尺寸取决于该频道所在分屏的频道数
+                        screen_start = ch_index - ch_index % TELEGRAM_CHANNELS_PER_SCREEN
+                        thumb_size = telegram_thumb_size(min(TELEGRAM_CHANNELS_PER_SCREEN, len(channels) - screen_start))
                         try:
                             # 获取频道实体
                             channel = await client.get_entity(channel_username)
@@ -1463,12 +1367,8 @@ def telegram_worker() -> None:
                                 if isinstance(msg.media, MessageMediaPhoto):
                                     msg_data["media_type"] = "photo"
                                     try:
-                                        thumb_bytes = await client.download_media(msg.media, bytes, thumb=0)
-                                        if thumb_bytes:
-                                            thumb_img = Image.open(io.BytesIO(thumb_bytes)).convert("RGB")
-                                            thumb_key = f"tg_{channel_username}_{msg.id}"
-                                            telegram_thumbs[thumb_key] = thumb_img
-                                            msg_data["thumb_key"] = thumb_key
+                                        msg_data["thumb_key"] = await fetch_telegram_thumb(
+                                            client, msg, f"tg_{channel_username}_{msg.id}", thumb_size)
                                     except Exception as e:
                                         logger.debug(f"下载图片缩略图失败: {e}")
                                         
@@ -1484,12 +1384,8 @@ def telegram_worker() -> None:
                                     
                                     if msg.media.document and msg.media.document.thumbs:
                                         try:
-                                            thumb_bytes = await client.download_media(msg.media, bytes, thumb=0)
-                                            if thumb_bytes:
-                                                thumb_img = Image.open(io.BytesIO(thumb_bytes)).convert("RGB")
-                                                thumb_key = f"tg_{channel_username}_{msg.id}"
-                                                telegram_thumbs[thumb_key] = thumb_img
-                                                msg_data["thumb_key"] = thumb_key
+                                            msg_data["thumb_key"] = await fetch_telegram_thumb(
+                                                client, msg, f"tg_{channel_username}_{msg.id}", thumb_size)
                                         except Exception as e:
                                             logger.debug(f"下载视频缩略图失败: {e}")
                                 
@@ -1508,7 +1404,6 @@ def telegram_worker() -> None:
                     
                     # 更新数据
                     info["telegram_channel_data"] = all_channel_data
-                    info["telegram_thumbs"] = telegram_thumbs
                     info["telegram_channels"] = channels
                     info["telegram_status"] = "Updated"
                     info["telegram_last_update"] = time.time()
@@ -1909,6 +1804,30 @@ def tracking_web_worker() -> None:
             self.end_headers()
             self.wfile.write(html.encode('utf-8'))
         
+        def send_screenshot(self):
+            """从共享内存读取屏幕当前画面，返回 PNG"""
+            global screenshot_reader
+            try:
+                if screenshot_reader is None:
+                    screenshot_reader = FrameReader(app_config.get("display.export.path", "/dev/shm/tftscreen.frame"))
+                result = screenshot_reader.read()
+            except Exception as e:
+                logger.warning(f"读取屏幕画面失败: {e}")
+                result = None
+            if result is None:
+                self.send_json({"success": False, "message": "暂无画面"}, 503)
+                return
+            frame, seq, timestamp, page = result
+            buf = io.BytesIO()
+            Image.fromarray(rgb565_to_rgb888(frame), "RGB").save(buf, "PNG")
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Cache-Control', 'no-store')
+            self.send_header('X-Frame-Seq', str(seq))
+            self.send_header('X-Frame-Page', str(page))
+            self.end_headers()
+            self.wfile.write(buf.getvalue())
+        
         def do_GET(self):
             parsed = urlparse(self.path)
             path = parsed.path
@@ -1918,6 +1837,9 @@ def tracking_web_worker() -> None:
                 self.send_html(WEB_MANAGER_HTML)
             
             # ===== 物流API =====
+            elif path == '/api/screenshot':
+                self.send_screenshot()
+            
             elif path == '/api/packages':
                 packages = load_tracking_packages()
                 live_data = info.get("tracking_packages", [])
@@ -2687,6 +2609,11 @@ except Exception as e:
     logger.error(f"中文字体加载失败: {e}，使用默认字体")
     f_nixie = f_asset_lg = f_asset_md = f_asset = f_date = f_lunar = f_big = f_mid = f_sm = f_tiny = ImageFont.load_default()
 
+# 状态文字的小字号预先建立字形图集，中文字符在首次出现时追加
+if app_config.get("display.glyph_atlas", True):
+    for atlas_font in (f_tiny, f_sm):
+        register_atlas(atlas_font)
+
 # reNix 辉光管字体
 try:
     f_renix_big = ImageFont.truetype(nixie_font_path, 78)
@@ -2707,11 +2634,6 @@ def is_night_mode() -> bool:
     return start_minutes <= current_minutes < end_minutes
 
 
-def adjust_brightness(img: Image.Image, factor: float) -> Image.Image:
-    """调整图像亮度"""
-    return ImageEnhance.Brightness(img).enhance(factor)
-
-
 def draw_centered_text(draw: ImageDraw.Draw, text: str, font: ImageFont.FreeTypeFont, y: int, color: Tuple[int, int, int]) -> None:
     """绘制居中文本"""
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -2720,42 +2642,6 @@ def draw_centered_text(draw: ImageDraw.Draw, text: str, font: ImageFont.FreeType
     draw.text((x, y), text, fill=color, font=font)
 
 
-def get_time_based_colors() -> Tuple[Tuple[int, int, int], Tuple[int, int, int], Tuple[int, int, int]]:
-    """根据时间返回动态色调 (背景主色, 背景副色, 装饰色)"""
-    hour = datetime.now().hour
-    
-    if 5 <= hour < 8:  # 清晨 - 淡橙暖色
-        return (22, 18, 28), (28, 22, 18), (80, 60, 40)
-    elif 8 <= hour < 12:  # 上午 - 清新蓝绿
-        return (15, 20, 28), (18, 25, 32), (40, 70, 80)
-    elif 12 <= hour < 17:  # 下午 - 明亮蓝
-        return (16, 22, 32), (20, 26, 38), (50, 80, 100)
-    elif 17 <= hour < 20:  # 傍晚 - 暖橙紫
-        return (25, 18, 25), (30, 20, 28), (90, 60, 70)
-    elif 20 <= hour < 23:  # 夜晚 - 深蓝紫
-        return (18, 16, 28), (22, 18, 35), (60, 50, 90)
-    else:  # 深夜 - 深邃蓝黑
-        return (12, 14, 22), (15, 16, 26), (40, 45, 70)
-
-
-def create_dynamic_background(width: int = W, height: int = H) -> Image.Image:
-    """创建带时间动态色调的背景"""
-    bg_top, bg_bottom, accent = get_time_based_colors()
-    
-    img = Image.new("RGB", (width, height), bg_top)
-    draw = ImageDraw.Draw(img)
-    
-    # 垂直渐变
-    for y in range(height):
-        ratio = y / height
-        r = int(bg_top[0] * (1 - ratio) + bg_bottom[0] * ratio)
-        g = int(bg_top[1] * (1 - ratio) + bg_bottom[1] * ratio)
-        b = int(bg_top[2] * (1 - ratio) + bg_bottom[2] * ratio)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-    
-    return img
-
-
 # ================= 公共绘图工具函数 =================
 
 def calc_text_width(text: str) -> int:
@@ -2897,74 +2783,12 @@ def get_wind_direction_text(wind_dir: str) -> str:
     return wind_map.get(wind_dir.upper(), wind_dir[:2])
 
 
-def draw_weather_icon(draw: ImageDraw.Draw, x: int, y: int, size: int, weather: str, frame: int = 0) -> None:
-    """绘制动态天气图标"""
-    cx, cy = x + size // 2, y + size // 2
-    
-    if "晴" in weather:
-        # 太阳 - 带旋转光芒动效
-        sun_color = (255, 200, 80)
-        ray_color = (255, 180, 60)
-        # 太阳主体
-        r = size // 3
-        draw.ellipse([cx - r, cy - r, cx + r, cy + r], fill=sun_color)
-        # 光芒（根据frame旋转）
-        import math
-        for i in range(8):
-            angle = math.radians(i * 45 + frame * 3)
-            x1 = cx + int(math.cos(angle) * (r + 3))
-            y1 = cy + int(math.sin(angle) * (r + 3))
-            x2 = cx + int(math.cos(angle) * (r + 8))
-            y2 = cy + int(math.sin(angle) * (r + 8))
-            draw.line([x1, y1, x2, y2], fill=ray_color, width=2)
-    
-    elif "雨" in weather:
-        # 云+雨滴
-        cloud_color = (120, 140, 160)
-        rain_color = (100, 180, 255)
-        # 云
-        draw.ellipse([cx - 12, cy - 8, cx + 2, cy + 4], fill=cloud_color)
-        draw.ellipse([cx - 4, cy - 12, cx + 12, cy + 2], fill=cloud_color)
-        draw.ellipse([cx + 2, cy - 6, cx + 14, cy + 4], fill=cloud_color)
-        # 雨滴（动态下落）
-        drop_offset = (frame * 2) % 10
-        for i, dx in enumerate([-6, 2, 10]):
-            dy = (drop_offset + i * 3) % 10
-            draw.line([cx + dx, cy + 6 + dy, cx + dx - 2, cy + 12 + dy], fill=rain_color, width=2)
-    
-    elif "云" in weather or "阴" in weather:
-        # 云朵
-        cloud_color = (150, 160, 175)
-        cloud_dark = (120, 130, 145)
-        # 主云
-        draw.ellipse([cx - 14, cy - 4, cx + 2, cy + 10], fill=cloud_color)
-        draw.ellipse([cx - 6, cy - 10, cx + 10, cy + 6], fill=cloud_color)
-        draw.ellipse([cx + 2, cy - 2, cx + 16, cy + 10], fill=cloud_dark)
-    
-    elif "雪" in weather:
-        # 雪花
-        snow_color = (220, 230, 255)
-        import math
-        # 雪花图案
-        for i in range(6):
-            angle = math.radians(i * 60 + frame * 2)
-            x1 = cx + int(math.cos(angle) * 4)
-            y1 = cy + int(math.sin(angle) * 4)
-            x2 = cx + int(math.cos(angle) * 10)
-            y2 = cy + int(math.sin(angle) * 10)
-            draw.line([x1, y1, x2, y2], fill=snow_color, width=1)
-        draw.ellipse([cx - 2, cy - 2, cx + 2, cy + 2], fill=snow_color)
-    
-    else:
-        # 默认：小太阳
-        draw.ellipse([cx - 6, cy - 6, cx + 6, cy + 6], fill=(200, 180, 100))
-
-
-def draw_weather_card_enhanced(draw: ImageDraw.Draw, x: int, y: int, width: int, height: int, night: bool) -> None:
+def draw_weather_card_enhanced(img: Image.Image, draw: ImageDraw.Draw, x: int, y: int, width: int, height: int,
+                               night: bool) -> None:
     """绘制简洁美观的天气卡片"""
     # 卡片背景
     bg_color = (18, 22, 30)
-    draw.rounded_rectangle([x, y, x + width, y + height], 6, fill=bg_color)
+    blit_decoration(img, (x, y), "card", w=width, h=height, radius=6, fill=bg_color)
     
     # 左侧渐变装饰条
     for i in range(4):
@@ -2985,7 +2809,7 @@ def draw_weather_card_enhanced(draw: ImageDraw.Draw, x: int, y: int, width: int,
     # 左侧：天气图标
     icon_x = x + 10
     icon_y = y + 8
-    draw_weather_icon(draw, icon_x, icon_y, 32, weather_text, frame)
+    draw_weather_icon(img, icon_x, icon_y, 32, weather_text, frame, info.get('icon'))
     
     # 中间：温度（大号）
     temp_str = f"{temp}°"
@@ -3020,25 +2844,25 @@ def draw_weather_card_enhanced(draw: ImageDraw.Draw, x: int, y: int, width: int,
         draw.text((x + width - tom_w - 6, y + height - 14), tom_text, (120, 130, 150), f_tiny)
 
 
-def draw_forecast_cards(draw: ImageDraw.Draw, y_s: int, night: bool) -> None:
+def draw_forecast_cards(img: Image.Image, draw: ImageDraw.Draw, y_s: int, night: bool) -> None:
     """绘制天气和系统监控卡片"""
     card_width, card_height, gap = 140, 50, 10
     start_x = (W - (card_width * 2 + gap)) // 2
     
     # 左侧卡片：天气信息
     left_x = start_x
-    draw_weather_card_enhanced(draw, left_x, y_s, card_width, card_height, night)
+    draw_weather_card_enhanced(img, draw, left_x, y_s, card_width, card_height, night)
     
     # 右侧卡片：系统监控（重构版）
     right_x = start_x + card_width + gap
-    draw_system_card(draw, right_x, y_s, card_width, card_height)
+    draw_system_card(img, draw, right_x, y_s, card_width, card_height)
 
 
-def draw_system_card(draw: ImageDraw.Draw, x: int, y: int, width: int, height: int) -> None:
+def draw_system_card(img: Image.Image, draw: ImageDraw.Draw, x: int, y: int, width: int, height: int) -> None:
     """绘制系统监控卡片 - 简洁美观版"""
     # 卡片背景
     bg_color = (18, 22, 30)
-    draw.rounded_rectangle([x, y, x + width, y + height], 6, fill=bg_color)
+    blit_decoration(img, (x, y), "card", w=width, h=height, radius=6, fill=bg_color)
     
     # 右侧渐变装饰条
     for i in range(3):
@@ -3101,90 +2925,13 @@ def draw_system_card(draw: ImageDraw.Draw, x: int, y: int, width: int, height: i
     draw.text((x + 96, val_y), f"{disk_usage}%", (140, 150, 170), f_tiny)
 
         
-def draw_premium_bg(draw: ImageDraw.Draw, tube_centers: List[Tuple[int, int]]) -> None:
-    """绘制高级背景效果 - 包含光晕、渐变和纹理"""
-    # 深色渐变背景
-    bg_dark = (8, 8, 10)
-    bg_medium = (12, 12, 15)
-    bg_light = (18, 18, 22)
-    
-    # 顶部较暗
-    draw.rectangle([0, 0, W, H // 3], fill=bg_dark)
-    # 中间（辉光管区域）
-    draw.rectangle([0, H // 3, W, 2 * H // 3], fill=bg_medium)
-    # 底部较亮
-    draw.rectangle([0, 2 * H // 3, W, H], fill=bg_light)
-    
-    # 细节点阵纹理（降低密度，更精致）
-    dot_color = (20, 20, 24)
-    for x in range(0, W, 8):
-        for y in range(0, H, 8):
-            if (x + y) % 16 < 8:  # 棋盘模式
-                draw.point((x, y), fill=dot_color)
-    
-    # 为每个辉光管添加环境光晕（仅轻微效果，避免黑色圆圈）
-    for center_x, center_y in tube_centers:
-        # 只绘制轻微的背景光晕，减少层数和范围
-        for radius, alpha_mult in [(30, 0.12), (20, 0.08)]:
-            alpha = alpha_mult
-            glow_color = tuple(int(c * alpha) for c in (255, 140, 50))
-            # 只绘制2层，避免产生黑色圆圈
-            for i in range(2, 0, -1):
-                alpha_factor = i / 2 * alpha
-                glow = tuple(int(c * alpha_factor) for c in glow_color)
-                glow_r = radius + i * 2
-                # 确保颜色不会太暗
-                if min(glow) < 5:  # 如果颜色太暗，跳过
-                    continue
-                draw.ellipse(
-                    [center_x - glow_r, center_y - glow_r, center_x + glow_r, center_y + glow_r],
-                    fill=glow,
-                    outline=None
-                )
-    
-    # 精致底座（带渐变和阴影）
-    base_x, base_y, base_w, base_h = 25, 138, 270, 12
-    # 底座阴影
-    draw.rounded_rectangle(
-        [base_x + 2, base_y + 2, base_x + base_w + 2, base_y + base_h + 2],
-        radius=6,
-        fill=(5, 5, 8)
-    )
-    # 底座主体
-    draw.rounded_rectangle(
-        [base_x, base_y, base_x + base_w, base_y + base_h],
-        radius=6,
-        fill=(25, 25, 32),
-        outline=(45, 45, 55),
-        width=2
-    )
-    # 底座高光
-    draw.line(
-        [base_x + 5, base_y + 2, base_x + base_w - 5, base_y + 2],
-        fill=(50, 50, 60),
-        width=1
-    )
-    
-    # 顶部装饰线条
-    draw.line([10, 25, W - 10, 25], fill=(30, 30, 38), width=1)
-    draw.line([10, 27, W - 10, 27], fill=(20, 20, 28), width=1)
-
-def draw_glow_effect(draw: ImageDraw.Draw, x: int, y: int, radius: int, color: Tuple[int, int, int], intensity: int = 5) -> None:
-    """绘制发光效果（通过多个同心圆模拟）"""
-    r, g, b = color
-    for i in range(intensity, 0, -1):
-        alpha_factor = i / intensity * 0.3
-        glow_color = (
-            int(r * alpha_factor),
-            int(g * alpha_factor),
-            int(b * alpha_factor)
-        )
-        glow_radius = radius + i * 2
-        draw.ellipse(
-            [x - glow_radius, y - glow_radius, x + glow_radius, y + glow_radius],
-            fill=glow_color,
-            outline=None
-        )
+def draw_premium_bg(img: Image.Image, tube_centers: List[Tuple[int, int]]) -> None:
+    """绘制高级背景效果 - 包含光晕、渐变和纹理（按辉光管位置缓存，整屏一次贴图）"""
+    blit_decoration(img, (0, 0), "premium_bg", tube_centers=tube_centers)
+
+def draw_glow_effect(img: Image.Image, x: int, y: int, radius: int, color: Tuple[int, int, int], intensity: int = 5) -> None:
+    """绘制发光效果（通过多个同心圆模拟，按半径/颜色/强度缓存）"""
+    blit_decoration(img, (x, y), "glow", radius=radius, color=color, intensity=intensity)
 
 
 def draw_clock() -> Image.Image:
@@ -3194,7 +2941,7 @@ def draw_clock() -> Image.Image:
     
     # 极深黑背景
     img = Image.new("RGB", (W, H), (5, 5, 8))
-    draw = ImageDraw.Draw(img)
+    draw = CachedDraw(img)
     
     # 获取时间色调
     bg_top, _, accent = get_time_based_colors()
@@ -3202,13 +2949,8 @@ def draw_clock() -> Image.Image:
     # ========== 1. 顶部信息栏 ==========
     header_h = 28
     
-    # 顶部渐变背景
-    for hy in range(header_h):
-        alpha = hy / header_h
-        r = int(15 * (1 - alpha) + 8 * alpha)
-        g = int(18 * (1 - alpha) + 10 * alpha)
-        b = int(25 * (1 - alpha) + 15 * alpha)
-        draw.rectangle([0, hy, W, hy + 1], fill=(r, g, b))
+    # 顶部渐变背景（按时段缓存的图层）
+    paste_header_gradient(img, header_h, (15, 18, 25), (8, 10, 15))
     
     # 底部发光线
     draw.rectangle([0, header_h - 2, W, header_h - 1], fill=(50, 80, 120))
@@ -3261,33 +3003,8 @@ def draw_clock() -> Image.Image:
         draw.rounded_rectangle([life_x - 3, 5, life_x + life_w + 3, 19], 3, fill=(40, 35, 25))
         draw.text((life_x, 6), life_text, (255, 200, 100), f_tiny)
     
-    # ========== 2. 加载辉光管素材图片 (带全局缓存) ==========
-    global NIXIE_IMAGE_CACHE
-    if 'NIXIE_IMAGE_CACHE' not in globals():
-        NIXIE_IMAGE_CACHE = {}
-    
-    nixie_dir = os.path.join(BASE_DIR, "辉光管素材图")
-    tube_target_h = 110
-    width_scale = 1.45
-    
-    # 如果缓存为空，则加载一次
-    if not NIXIE_IMAGE_CACHE:
-        logger.info("正在加载辉光管素材至内存缓存...")
-        for d in range(10):
-            try:
-                img_path = f"{nixie_dir}/{d}.png"
-                if os.path.exists(img_path):
-                    nixie_img = Image.open(img_path).convert("RGBA")
-                    ratio = tube_target_h / nixie_img.height
-                    new_w = int(nixie_img.width * ratio * width_scale)
-                    nixie_img = nixie_img.resize((new_w, tube_target_h), Image.Resampling.LANCZOS)
-                    NIXIE_IMAGE_CACHE[str(d)] = nixie_img
-                else:
-                    logger.warning(f"素材文件不存在: {img_path}")
-            except Exception as e:
-                logger.warning(f"加载辉光管素材 {d}.png 失败: {e}")
-    
-    nixie_images = NIXIE_IMAGE_CACHE
+    # ========== 2. 加载辉光管素材（编译为 RGB565 并 mmap，进程内只加载一次） ==========
+    nixie_images = get_nixie_assets(os.path.join(BASE_DIR, NIXIE_DIR_NAME), logger=logger)
     
     # ========== 3. 计算布局 ==========
     time_str = now.strftime("%H%M")
@@ -3295,7 +3012,7 @@ def draw_clock() -> Image.Image:
     
     # 获取单个管子宽度
     if nixie_images:
-        sample_img = list(nixie_images.values())[0]
+        sample_img = next(iter(nixie_images.values()))
         tube_w = sample_img.width
         tube_h = sample_img.height
     else:
@@ -3316,8 +3033,7 @@ def draw_clock() -> Image.Image:
         
         # 粘贴数字图片
         if digit in nixie_images:
-            nixie_img = nixie_images[digit]
-            img.paste(nixie_img, (curr_x, base_y), nixie_img)
+            nixie_images[digit].blit(img, (curr_x, base_y))
         else:
             draw.text((curr_x + 15, base_y + 30), digit, (255, 140, 40), f_renix_big)
         
@@ -3328,7 +3044,7 @@ def draw_clock() -> Image.Image:
             curr_x += colon_w
     
     # ========== 5. 底部天气卡片区域 ==========
-    draw_forecast_cards(draw, 155, night)
+    draw_forecast_cards(img, draw, 155, night)
     
     # ========== 8. 底部信息栏 ==========
     footer_y = H - 16
@@ -3368,79 +3084,44 @@ def draw_clock() -> Image.Image:
         temp_color = (255, 80, 80) if cpu_t > 70 else (255, 200, 100) if cpu_t > 55 else (100, 180, 150)
         draw.text((W - 42, text_y), f"{cpu_t}C", temp_color, f_tiny)
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
 
-def draw_mini_kline(draw: ImageDraw.Draw, x: int, y: int, w: int, h: int, 
-                    data: List[float], up_color: tuple = (100, 255, 180), 
-                    down_color: tuple = (255, 100, 100)) -> None:
-    """绘制迷你K线图（蜡烛图样式）"""
-    if not data or len(data) < 2:
-        return
-    
-    n = len(data)
-    bar_width = max(3, (w - n * 2) // n)
-    gap = 1
-    total_bar_width = bar_width + gap
-    
-    # 计算数据范围，扩展以容纳影线
-    min_val = min(data)
-    max_val = max(data)
-    margin = (max_val - min_val) * 0.15 if max_val != min_val else max_val * 0.01
-    min_val -= margin
-    max_val += margin
-    val_range = max_val - min_val if max_val != min_val else 1
-    
-    # 绘制每根K线蜡烛
-    for i in range(1, n):
-        prev_val = data[i - 1]
-        curr_val = data[i]
-        
-        bx = x + (i - 1) * total_bar_width
-        center_x = bx + bar_width // 2
-        
-        # 开盘价、收盘价
-        open_price = prev_val
-        close_price = curr_val
-        
-        # 模拟高低价（基于开收盘价波动）
-        volatility = abs(curr_val - prev_val) * 0.15
-        high_price = max(open_price, close_price) + volatility
-        low_price = min(open_price, close_price) - volatility
-        
-        # 归一化到像素坐标
-        high_y = y + int((1 - (high_price - min_val) / val_range) * h)
-        low_y = y + int((1 - (low_price - min_val) / val_range) * h)
-        open_y = y + int((1 - (open_price - min_val) / val_range) * h)
-        close_y = y + int((1 - (close_price - min_val) / val_range) * h)
-        
-        # 限制Y坐标范围
-        high_y = max(y, min(y + h, high_y))
-        low_y = max(y, min(y + h, low_y))
-        open_y = max(y, min(y + h, open_y))
-        close_y = max(y, min(y + h, close_y))
-        
-        # 涨跌颜色
-        is_up = close_price >= open_price
-        color = up_color if is_up else down_color
-        
-        # 绘制影线（上下细线）
-        draw.line([center_x, high_y, center_x, low_y], fill=color, width=1)
-        
-        # 绘制实体（蜡烛主体）
-        body_top = min(open_y, close_y)
-        body_bottom = max(open_y, close_y)
-        if body_bottom - body_top < 1:
-            body_bottom = body_top + 1
-        draw.rectangle([bx, body_top, bx + bar_width, body_bottom], fill=color)
+# 局部显示时钟直接合成到常驻 RGB565 帧缓冲，每次只擦除并重绘数字所在区域
+night_canvas = Compositor(W, H)
+night_clock_boxes: List[Tuple[int, int, int, int]] = []
 
+def draw_night_clock() -> Compositor:
+    """绘制局部显示模式下的精简时钟（时、分上下排列在点亮的竖条内）"""
+    now = datetime.now()
+    for box in night_clock_boxes:
+        night_canvas.fill_rect(box, (0, 0, 0))
+    night_clock_boxes.clear()
+    
+    x0, x1 = power_manager.partial_columns
+    center_x = (x0 + x1) // 2
+    for text, center_y in ((f"{now.hour:02d}", H // 4 + 8), (f"{now.minute:02d}", H * 3 // 4 - 8)):
+        bbox = night_canvas.textbbox((0, 0), text, f_renix_big)
+        text_w = bbox[2] - bbox[0]
+        text_h = bbox[3] - bbox[1]
+        xy = (center_x - text_w // 2 - bbox[0], center_y - text_h // 2 - bbox[1])
+        night_canvas.text(xy, text, (255, 140, 40), f_renix_big)
+        left, top, right, bottom = night_canvas.textbbox(xy, text, f_renix_big)
+        night_clock_boxes.append((left, top, right - 1, bottom - 1))
+    
+    return night_canvas
+
+def page_image(page) -> Image.Image:
+    """页面结果统一为 PIL 图像（合成器页面交给切换动画/硬件滚动时整帧比对重新开始）"""
+    if isinstance(page, Compositor):
+        page.mark_all()
+        return page.to_image()
+    return page
 
 def draw_crypto() -> Image.Image:
     """绘制加密货币监控页面 - 资产+三币种K线图"""
-    night = is_night_mode()
-    
     # 使用动态背景
     img = create_dynamic_background()
-    draw = ImageDraw.Draw(img)
+    draw = CachedDraw(img)
     bg_top, _, accent = get_time_based_colors()
     
     # 颜色定义
@@ -3476,7 +3157,7 @@ def draw_crypto() -> Image.Image:
     # 资产迷你图
     if len(asset_history) >= 3:
         prices = [p[1] for p in asset_history[-15:]]
-        draw_mini_kline(draw, 170, 4, 80, 16, prices, up_color, down_color)
+        draw_mini_kline(img, 170, 4, 80, 16, prices, up_color, down_color)
     
     draw.line([0, header_h, W, header_h], fill=(40, 50, 65))
     
@@ -3540,56 +3221,15 @@ def draw_crypto() -> Image.Image:
         # 使用真实K线数据绘制蜡烛图
         klines = crypto_klines.get(coin_name, [])
         if len(klines) >= 3:
-            # 提取OHLC数据
-            all_highs = [k["high"] for k in klines]
-            all_lows = [k["low"] for k in klines]
-            
-            min_p = min(all_lows)
-            max_p = max(all_highs)
-            # 扩展范围
-            margin = (max_p - min_p) * 0.05 if max_p != min_p else max_p * 0.01
-            min_p -= margin
-            max_p += margin
-            p_range = max_p - min_p if max_p != min_p else 1
-            
+            # 蜡烛几何一次算出（价格轴按最低/最高价上下扩展 5%）
             n = len(klines)
             kline_w = chart_w - 6
             bar_w = max(3, (kline_w - n) // n)
-            gap = 1
-            
-            for i, kline in enumerate(klines):
-                open_p = kline["open"]
-                high_p = kline["high"]
-                low_p = kline["low"]
-                close_p = kline["close"]
-                
-                bx = chart_x + i * (bar_w + gap)
-                center_x = bx + bar_w // 2
-                
-                # 计算Y坐标
-                high_y = chart_y + int((1 - (high_p - min_p) / p_range) * chart_h)
-                low_y = chart_y + int((1 - (low_p - min_p) / p_range) * chart_h)
-                open_y = chart_y + int((1 - (open_p - min_p) / p_range) * chart_h)
-                close_y = chart_y + int((1 - (close_p - min_p) / p_range) * chart_h)
-                
-                # 限制Y坐标范围
-                high_y = max(chart_y, min(chart_y + chart_h, high_y))
-                low_y = max(chart_y, min(chart_y + chart_h, low_y))
-                open_y = max(chart_y, min(chart_y + chart_h, open_y))
-                close_y = max(chart_y, min(chart_y + chart_h, close_y))
-                
-                is_up = close_p >= open_p
-                color = up_color if is_up else down_color
-                
-                # 影线
-                draw.line([center_x, high_y, center_x, low_y], fill=color, width=1)
-                
-                # 实体
-                body_top = min(open_y, close_y)
-                body_bottom = max(open_y, close_y)
-                if body_bottom - body_top < 2:
-                    body_bottom = body_top + 2
-                draw.rectangle([bx, body_top, bx + bar_w, body_bottom], fill=color)
+            min_p, p_range = price_scale(min(k["low"] for k in klines), max(k["high"] for k in klines), 0.05)
+            candles = candle_geometry([k["open"] for k in klines], [k["high"] for k in klines],
+                                      [k["low"] for k in klines], [k["close"] for k in klines],
+                                      chart_x, chart_y, chart_h, bar_w, scale=(min_p, p_range))
+            draw_candles(img, candles, up_color, down_color)
             
             # 右侧当前价格标签
             if coin_data:
@@ -3599,7 +3239,7 @@ def draw_crypto() -> Image.Image:
                 price_color = up_color if is_up else down_color
                 
                 # 计算当前价格的Y位置
-                price_y = chart_y + int((1 - (curr_price - min_p) / p_range) * chart_h)
+                price_y = int(to_y(curr_price, chart_y, chart_h, min_p, p_range, clip=False))
                 price_y = max(chart_y + 4, min(chart_y + chart_h - 10, price_y))
                 
                 # 价格横线（虚线效果）
@@ -3616,16 +3256,15 @@ def draw_crypto() -> Image.Image:
         if col_idx < 2:
             draw.line([cx + col_w - 1, content_y, cx + col_w - 1, H], fill=grid_color)
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
 
 def draw_calendar() -> Image.Image:
     """绘制日历页面 - 美化版"""
-    night = is_night_mode()
     now = datetime.now()
     
     # 使用动态背景
     img = create_dynamic_background()
-    draw = ImageDraw.Draw(img)
+    draw = CachedDraw(img)
     bg_top, _, accent = get_time_based_colors()
     
     # ===== 顶部标题区域 =====
@@ -3766,7 +3405,7 @@ def draw_calendar() -> Image.Image:
     else:
         draw.text((W - 80, countdown_y + 5), "已到期", (255, 100, 100), f_sm)
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
 
 
 def format_speed(bytes_per_sec: float) -> str:
@@ -3779,82 +3418,95 @@ def format_speed(bytes_per_sec: float) -> str:
         return f"{bytes_per_sec / (1024 * 1024):.1f}M"
 
 
-def draw_mini_bar(draw, x: int, y: int, width: int, height: int, value: float, 
-                   bar_color: tuple, bg_color: tuple = (40, 45, 55)) -> None:
-    """绘制迷你进度条"""
-    # 背景
-    draw.rounded_rectangle([x, y, x + width, y + height], 2, fill=bg_color)
-    # 进度
-    fill_width = max(2, int(width * min(value, 100) / 100))
-    if fill_width > 2:
-        draw.rounded_rectangle([x, y, x + fill_width, y + height], 2, fill=bar_color)
+# ===== Beszel 服务器监控页面（保留模式控件：只重绘数据变化的部分） =====
+BESZEL_HEADER_H = 30
+BESZEL_COLS, BESZEL_ROWS = 2, 3
 
 
-def draw_beszel() -> Image.Image:
-    """绘制Beszel服务器监控页面 - 美化版"""
-    night = is_night_mode()
-    
-    # 使用动态背景
-    img = create_dynamic_background()
-    draw = ImageDraw.Draw(img)
-    bg_top, _, accent = get_time_based_colors()
+def beszel_online(client: dict) -> bool:
+    """Beszel 客户端是否在线"""
+    status_val = client.get("status", "unknown")
+    return "on" in str(status_val).lower() or status_val == "up"
+
+
+class BeszelHeader(Widget):
+    """标题栏：在线统计 + 当前时间（时间每秒变化，只重绘标题栏）"""
     
-    # 顶部标题栏（渐变 + 底部发光线）
-    header_h = 30
-    for y in range(header_h):
-        alpha = y / header_h
-        r = int((bg_top[0] + 12) * (1 - alpha) + bg_top[0] * alpha)
-        g = int((bg_top[1] + 15) * (1 - alpha) + bg_top[1] * alpha)
-        b = int((bg_top[2] + 20) * (1 - alpha) + bg_top[2] * alpha)
-        draw.rectangle([0, y, W, y + 1], fill=(r, g, b))
+    def __init__(self):
+        # 底部两条发光线占到第 header_h + 1 行
+        super().__init__(0, 0, W, BESZEL_HEADER_H + 2, ("beszel_clients",), self._status)
+    
+    @staticmethod
+    def _status(clients):
+        clients = clients or []
+        online_count = sum(1 for c in clients if beszel_online(c))
+        return online_count, len(clients), datetime.now().strftime("%H:%M:%S")
+    
+    def paint(self, image, x, y, value, fonts):
+        online_count, total_clients, time_str = value
+        draw = CachedDraw(image)
+        bg_top, _, _ = get_time_based_colors()
+        header_h = BESZEL_HEADER_H
+        # 顶部标题栏（渐变 + 底部发光线）；标题栏位于页面原点，整体重绘时 x、y 为 0
+        paste_header_gradient(image, header_h, (bg_top[0] + 12, bg_top[1] + 15, bg_top[2] + 20), bg_top)
+        draw.rectangle([x, y + header_h - 1, x + W, y + header_h], fill=(60, 140, 200))
+        draw.rectangle([x, y + header_h, x + W, y + header_h + 1], fill=(30, 70, 100))
+        
+        # 标题图标 + 文字
+        draw.text((x + 8, y + 5), "[S]", (80, 180, 255), fonts["f_sm"])
+        draw.text((x + 28, y + 6), "SERVER MONITOR", (220, 230, 245), fonts["f_sm"])
+        
+        # 在线统计（标题栏中间）
+        status_color = (80, 200, 120) if online_count == total_clients else (255, 180, 80)
+        draw.text((x + W // 2 - 10, y + 8), f"{online_count}/{total_clients}", status_color, fonts["f_tiny"])
+        
+        # 当前时间（右侧）
+        time_bbox = draw.textbbox((0, 0), time_str, fonts["f_tiny"])
+        time_width = time_bbox[2] - time_bbox[0]
+        draw.text((x + W - time_width - 8, y + 9), time_str, (120, 160, 200), fonts["f_tiny"])
+
+
+class BeszelPlaceholder(Widget):
+    """无服务器数据时的加载状态"""
     
-    # 底部发光线
-    draw.rectangle([0, header_h - 1, W, header_h], fill=(60, 140, 200))
-    draw.rectangle([0, header_h, W, header_h + 1], fill=(30, 70, 100))
-    
-    # 标题图标 + 文字
-    draw.text((8, 5), "[S]", (80, 180, 255), f_sm)
-    draw.text((28, 6), "SERVER MONITOR", (220, 230, 245), f_sm)
-    
-    # 在线统计（标题栏中间）
-    clients = info.get("beszel_clients", [])
-    total_clients = len(clients)
-    online_count = sum(1 for c in clients if "on" in str(c.get("status", "")).lower() or c.get("status") == "up")
-    status_text = f"{online_count}/{total_clients}"
-    status_color = (80, 200, 120) if online_count == total_clients else (255, 180, 80)
-    draw.text((W // 2 - 10, 8), status_text, status_color, f_tiny)
-    
-    # 当前时间（右侧）
-    now = datetime.now()
-    time_str = now.strftime("%H:%M:%S")
-    time_bbox = draw.textbbox((0, 0), time_str, f_tiny)
-    time_width = time_bbox[2] - time_bbox[0]
-    draw.text((W - time_width - 8, 9), time_str, (120, 160, 200), f_tiny)
+    def __init__(self):
+        super().__init__(0, 95, W, 55, ("beszel_clients", "beszel_status"),
+                         lambda clients, status: None if clients else (status or "Loading..."))
     
-    if not clients:
-        status = info.get("beszel_status", "Loading...")
+    def paint(self, image, x, y, value, fonts):
+        draw = CachedDraw(image)
         # 加载动画效果
-        draw.text((W // 2 - 40, 100), "⟳", (80, 140, 200), f_mid)
-        draw_centered_text(draw, status, f_sm, 130, (100, 120, 150))
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
-    
-    # 网格配置 (2列 x 3行)
-    cols = 2
-    rows = 3
-    margin_x, margin_y = 5, 34
-    gap_x, gap_y = 5, 4
-    block_w = (W - 2 * margin_x - (cols - 1) * gap_x) // cols
-    block_h = (H - margin_y - 6 - (rows - 1) * gap_y) // rows
-    
-    for idx, client in enumerate(clients[:cols * rows]):
-        col_idx = idx % cols
-        row_idx = idx // cols
-        bx = margin_x + col_idx * (block_w + gap_x)
-        by = margin_y + row_idx * (block_h + gap_y)
+        draw.text((x + W // 2 - 40, y + 5), "⟳", (80, 140, 200), fonts["f_mid"])
+        bbox = draw.textbbox((0, 0), value, font=fonts["f_sm"])
+        draw.text((x + (W - (bbox[2] - bbox[0])) // 2, y + 35), value, (100, 120, 150), fonts["f_sm"])
+
+
+class BeszelCard(Widget):
+    """单台服务器卡片（2 列 x 3 行网格中的第 index 格）"""
+    
+    MARGIN_X, MARGIN_Y = 5, 34
+    GAP_X, GAP_Y = 5, 4
+    BLOCK_W = (W - 2 * MARGIN_X - (BESZEL_COLS - 1) * GAP_X) // BESZEL_COLS
+    BLOCK_H = (H - MARGIN_Y - 6 - (BESZEL_ROWS - 1) * GAP_Y) // BESZEL_ROWS
+    
+    def __init__(self, index: int):
+        bx = self.MARGIN_X + index % BESZEL_COLS * (self.BLOCK_W + self.GAP_X)
+        by = self.MARGIN_Y + index // BESZEL_COLS * (self.BLOCK_H + self.GAP_Y)
+        # 卡片底色随夜间模式变化，一并作为输入
+        super().__init__(bx, by, self.BLOCK_W + 1, self.BLOCK_H + 1, ("beszel_clients",),
+                         lambda clients: (clients[index], is_night_mode())
+                         if clients and index < len(clients) else None)
+    
+    def paint(self, image, x, y, value, fonts):
+        frozen, night = value
+        client = dict(frozen)
+        draw = CachedDraw(image)
+        f_sm, f_tiny = fonts["f_sm"], fonts["f_tiny"]
+        bx, by = x, y
+        block_w, block_h = self.BLOCK_W, self.BLOCK_H
         
         # 状态检测
-        status_val = client.get("status", "unknown")
-        is_online = "on" in str(status_val).lower() or status_val == "up"
+        is_online = beszel_online(client)
         
         # 卡片背景（渐变效果）
         card_top = (28, 34, 45) if night else (35, 42, 55)
@@ -3870,16 +3522,11 @@ def draw_beszel() -> Image.Image:
         
         # 卡片边框
         border_color = (60, 180, 120) if is_online else (180, 80, 80)
-        draw.rounded_rectangle(
-            [bx, by, bx + block_w, by + block_h],
-            5, fill=None, outline=(50, 58, 72), width=1
-        )
+        blit_decoration(image, (bx, by), "card", w=block_w, h=block_h, radius=5, outline=(50, 58, 72))
         
         # 顶部状态条（细线）
         draw.rectangle([bx + 4, by + 1, bx + block_w - 4, by + 2], fill=border_color)
         
-        # 设备名称 + 状态点
-        name = client.get("name", "Unknown")[:10]
         # 状态圆点
         dot_x = bx + 7
         dot_y = by + 10
@@ -3909,12 +3556,13 @@ def draw_beszel() -> Image.Image:
         label_x = bx + 5
         bar_x = bx + 26
         value_x = bx + 78
+        bars = []  # 三行进度条收集后一次绘制
         
         # 第1行: CPU
         cpu = client.get("cpu", 0)
         cpu_color = (255, 100, 100) if cpu > 80 else (255, 200, 100) if cpu > 50 else (100, 200, 255)
         draw.text((label_x, metrics_y), "CPU", (130, 140, 160), f_tiny)
-        draw_mini_bar(draw, bar_x, metrics_y + 3, bar_width, bar_height, cpu, cpu_color)
+        bars.append(((bar_x, metrics_y + 3, bar_width, bar_height), cpu, cpu_color))
         draw.text((value_x, metrics_y), f"{cpu:>5.1f}%", cpu_color, f_tiny)
         
         # 第2行: RAM
@@ -3922,7 +3570,7 @@ def draw_beszel() -> Image.Image:
         ram = client.get("memory", 0)
         ram_color = (255, 100, 100) if ram > 85 else (255, 200, 100) if ram > 60 else (100, 255, 180)
         draw.text((label_x, metrics_y), "RAM", (130, 140, 160), f_tiny)
-        draw_mini_bar(draw, bar_x, metrics_y + 3, bar_width, bar_height, ram, ram_color)
+        bars.append(((bar_x, metrics_y + 3, bar_width, bar_height), ram, ram_color))
         draw.text((value_x, metrics_y), f"{ram:>5.1f}%", ram_color, f_tiny)
         
         # 第3行: DSK
@@ -3930,38 +3578,75 @@ def draw_beszel() -> Image.Image:
         disk = client.get("disk", 0)
         disk_color = (255, 100, 100) if disk > 90 else (255, 200, 100) if disk > 70 else (150, 200, 255)
         draw.text((label_x, metrics_y), "DSK", (130, 140, 160), f_tiny)
-        draw_mini_bar(draw, bar_x, metrics_y + 3, bar_width, bar_height, disk, disk_color)
+        bars.append(((bar_x, metrics_y + 3, bar_width, bar_height), disk, disk_color))
         draw.text((value_x, metrics_y), f"{disk:>5.1f}%", disk_color, f_tiny)
         
-        # 第4行: LOAD（负载）
+        # 第4行: LOAD（负载）；输入快照中的列表已转为元组
         metrics_y += row_h
-        load = client.get("load", [0, 0, 0])
-        ld_val = load[0] if isinstance(load, list) and load else 0
+        load = client.get("load", (0, 0, 0))
+        ld_val = load[0] if isinstance(load, (list, tuple)) and load else 0
         ld_color = (255, 120, 120) if ld_val > 2 else (255, 200, 120) if ld_val > 1 else (150, 180, 220)
         draw.text((label_x, metrics_y), "LD", (130, 140, 160), f_tiny)
         # 负载用数字显示（不用进度条）
         draw.text((bar_x, metrics_y), f"{ld_val:.2f}", ld_color, f_tiny)
-    
-    # 底部更新时间
-    last_update = info.get("beszel_last_update", 0)
-    if last_update > 0:
-        update_ago = int(time.time() - last_update)
-        if update_ago < 60:
-            update_text = f"Updated {update_ago}s ago"
-        else:
-            update_text = f"Updated {update_ago // 60}m ago"
-        draw.text((W - 80, H - 14), update_text, (100, 110, 130), f_tiny)
-    
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        
+        boxes, values, colors = zip(*bars)
+        draw_bars(image, boxes, values, colors)
+
+
+def beszel_update_text(clients, last_update) -> Optional[str]:
+    """底部更新时间文字（无服务器数据时不显示）"""
+    if not clients or not last_update or last_update <= 0:
+        return None
+    update_ago = int(time.time() - last_update)
+    if update_ago < 60:
+        return f"Updated {update_ago}s ago"
+    return f"Updated {update_ago // 60}m ago"
+
+
+beszel_page = WidgetPage(
+    [BeszelHeader(), BeszelPlaceholder()]
+    + [BeszelCard(idx) for idx in range(BESZEL_COLS * BESZEL_ROWS)]
+    + [Label(W - 80, H - 14, 80, 14, ("beszel_clients", "beszel_last_update"), beszel_update_text,
+             font="f_tiny", color=(100, 110, 130))]
+)
+
+# 保留模式页面：画布在下次渲染时原地更新，变化矩形作为显示层的变化区域提示
+WIDGET_PAGES = [beszel_page]
+
+
+def page_regions(img) -> Optional[List[tuple]]:
+    """保留模式页面的画布返回本次渲染变化的矩形，其他页面返回 None（整帧比对）"""
+    for page in WIDGET_PAGES:
+        if page.canvas is img:
+            return page.dirty_regions
+    return None
+
+
+def draw_beszel() -> Image.Image:
+    """绘制Beszel服务器监控页面 - 美化版（只重绘数据变化的控件，变化矩形见 page_regions）"""
+    return beszel_page.render(info, {"f_mid": f_mid, "f_sm": f_sm, "f_tiny": f_tiny})
+
+
+def telegram_sub_pages() -> int:
+    """Telegram页分屏数"""
+    count = len(info.get("telegram_channel_data", []))
+    return max(1, -(-count // TELEGRAM_CHANNELS_PER_SCREEN))
+
+
+def telegram_thumb_size(channels_on_screen: int) -> Tuple[int, int]:
+    """Telegram页缩略图槽位尺寸 (宽, 高)（与 draw_telegram 的布局一致）"""
+    channel_h = (H - 18 - 4) // max(channels_on_screen, 1)  # 标题栏 18，上下留白 4
+    msg_h = channel_h - 14 - 6  # 频道标题栏 14
+    thumb_h = min(msg_h - 4, 55)
+    return int(thumb_h * 1.3), thumb_h
 
 
-def draw_telegram() -> Image.Image:
+def draw_telegram(sub_page: int = 0) -> Image.Image:
     """绘制Telegram频道消息页面 - 多频道独立显示"""
-    night = is_night_mode()
-    
     # 使用动态背景
     img = create_dynamic_background()
-    draw = ImageDraw.Draw(img)
+    draw = CachedDraw(img)
     bg_top, _, accent = get_time_based_colors()
     
     # ===== 顶部标题栏 =====
@@ -3980,22 +3665,28 @@ def draw_telegram() -> Image.Image:
     channels = info.get("telegram_channels", [])
     if channels:
         draw.text((W - 50, 3), f"{len(channels)}ch", (100, 120, 150), f_tiny)
+    if telegram_sub_pages() > 1:
+        draw.text((W - 84, 3), f"{sub_page % telegram_sub_pages() + 1}/{telegram_sub_pages()}", (100, 120, 150), f_tiny)
     
     draw.line([0, header_h, W, header_h], fill=(50, 65, 80))
     
     # ===== 频道消息区域 =====
     channel_data = info.get("telegram_channel_data", [])
-    thumbs = info.get("telegram_thumbs", {})
     
     if not channel_data:
         draw.text((W // 2 - 40, H // 2 - 10), "Loading...", (120, 130, 150), f_sm)
         draw.text((W // 2 - 55, H // 2 + 10), "等待消息加载", (100, 110, 130), f_tiny)
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        return img
+    
+    # 当前分屏的频道
+    start = (sub_page % telegram_sub_pages()) * TELEGRAM_CHANNELS_PER_SCREEN
+    channel_data = channel_data[start:start + TELEGRAM_CHANNELS_PER_SCREEN]
     
     # 计算每个频道的高度
     content_h = H - header_h - 4
     num_channels = len(channel_data)
     channel_h = content_h // max(num_channels, 1)
+    thumb_size = telegram_thumb_size(num_channels)
     
     for ch_idx, ch_data in enumerate(channel_data):
         ch_y = header_h + 2 + ch_idx * channel_h
@@ -4025,9 +3716,9 @@ def draw_telegram() -> Image.Image:
         
         msg = messages[0]  # 只显示最新一条
         
-        # 检查是否有缩略图
+        # 检查是否有缩略图（后台线程已按槽位尺寸缩放好）
         thumb_key = msg.get("thumb_key")
-        has_thumb = thumb_key and thumb_key in thumbs
+        thumb_img = get_thumbnail(thumb_key, thumb_size) if thumb_key else None
         
         # 左侧蓝色边条
         draw.rectangle([4, msg_y, 6, msg_y + msg_h - 2], fill=(80, 160, 230))
@@ -4036,25 +3727,17 @@ def draw_telegram() -> Image.Image:
         thumb_w = 0
         
         # 显示缩略图
-        if has_thumb:
-            thumb_img = thumbs.get(thumb_key)
-            if thumb_img:
-                # 根据可用高度调整缩略图大小
-                thumb_h = min(msg_h - 4, 55)
-                thumb_w_calc = int(thumb_h * 1.3)
-                try:
-                    resized_thumb = thumb_img.resize((thumb_w_calc, thumb_h), Image.Resampling.LANCZOS)
-                    img.paste(resized_thumb, (content_x, msg_y))
-                    thumb_w = thumb_w_calc + 4
-                    
-                    # 视频播放图标
-                    if msg.get("media_type") == "video":
-                        play_x = content_x + thumb_w_calc // 2 - 7
-                        play_y = msg_y + thumb_h // 2 - 8
-                        draw.polygon([(play_x, play_y), (play_x, play_y + 12), (play_x + 10, play_y + 6)], 
-                                   fill=(255, 255, 255))
-                except:
-                    thumb_w = 0
+        if thumb_img:
+            thumb_w_calc, thumb_h = thumb_img.size
+            img.paste(thumb_img, (content_x, msg_y))
+            thumb_w = thumb_w_calc + 4
+            
+            # 视频播放图标
+            if msg.get("media_type") == "video":
+                play_x = content_x + thumb_w_calc // 2 - 7
+                play_y = msg_y + thumb_h // 2 - 8
+                draw.polygon([(play_x, play_y), (play_x, play_y + 12), (play_x + 10, play_y + 6)], 
+                           fill=(255, 255, 255))
         
         # 消息文本
         text = msg.get("text", "")
@@ -4116,16 +3799,20 @@ def draw_telegram() -> Image.Image:
             sep_y = ch_y + channel_h - 1
             draw.line([4, sep_y, W - 4, sep_y], fill=(40, 50, 65))
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
+
 
+def tracking_sub_pages() -> int:
+    """物流页分屏数"""
+    count = len(info.get("tracking_packages", []))
+    return max(1, -(-count // TRACKING_PER_SCREEN))
 
-def draw_tracking() -> Image.Image:
+
+def draw_tracking(sub_page: int = 0) -> Image.Image:
     """绘制物流追踪页面 - 美化版"""
-    night = is_night_mode()
-    
     # 使用动态背景
     img = create_dynamic_background()
-    draw = ImageDraw.Draw(img)
+    draw = CachedDraw(img)
     bg_top, _, accent = get_time_based_colors()
     
     # 顶部标题栏
@@ -4145,24 +3832,28 @@ def draw_tracking() -> Image.Image:
     if not packages:
         draw_centered_text(draw, "暂无包裹", f_sm, 100, (100, 120, 150))
         draw_centered_text(draw, "访问 :8080 添加", f_tiny, 125, (80, 100, 130))
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        return img
     
     # 内容区域
     content_y = header_h + 4
     content_h = H - content_y - 4
     pkg_count = len(packages)
     
+    # 当前分屏的包裹
+    start = (sub_page % tracking_sub_pages()) * TRACKING_PER_SCREEN
+    screen_packages = packages[start:start + TRACKING_PER_SCREEN]
+    
     # 单包裹全屏，多包裹上下分割
     if pkg_count == 1:
         card_h = content_h
     else:
-        card_h = (content_h - 4) // min(pkg_count, 2)
+        card_h = (content_h - 4) // TRACKING_PER_SCREEN
     
-    for idx, pkg in enumerate(packages[:2]):  # 最多显示2个包裹
+    for idx, pkg in enumerate(screen_packages):
         cy = content_y + idx * (card_h + 4)
         
         # 卡片背景
-        draw.rounded_rectangle([4, cy, W - 4, cy + card_h], 6, fill=(bg_top[0] + 8, bg_top[1] + 10, bg_top[2] + 14))
+        blit_decoration(img, (4, cy), "card", w=W - 8, h=card_h, radius=6, fill=(bg_top[0] + 8, bg_top[1] + 10, bg_top[2] + 14))
         
         # 获取包裹信息
         alias = pkg.get("alias", "") or pkg.get("carrier_name", "包裹")
@@ -4244,21 +3935,25 @@ def draw_tracking() -> Image.Image:
         status_color = (80, 200, 140) if has_tracks else (200, 150, 80)
         draw.rounded_rectangle([4, cy, 7, cy + card_h], 3, fill=status_color)
     
-    # 如果有更多包裹
-    if pkg_count > 2:
-        draw.text((W - 55, H - 14), f"+{pkg_count - 2} 更多", (100, 120, 150), f_tiny)
+    # 分屏页码
+    if pkg_count > TRACKING_PER_SCREEN:
+        draw.text((W - 30, H - 14), f"{sub_page % tracking_sub_pages() + 1}/{tracking_sub_pages()}", (100, 120, 150), f_tiny)
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
+
+
+def bilibili_sub_pages() -> int:
+    """B站页分屏数"""
+    count = len(info.get("bilibili_streamers", []))
+    return max(1, -(-count // BILIBILI_PER_SCREEN))
 
 
-def draw_bilibili() -> Image.Image:
+def draw_bilibili(sub_page: int = 0) -> Image.Image:
     """绘制B站主播监控大看板"""
     try:
-        night = is_night_mode()
-        
         # 使用动态背景
         img = create_dynamic_background()
-        draw = ImageDraw.Draw(img)
+        draw = CachedDraw(img)
         
         # ========== 顶部状态栏 (高度14px) ==========
         header_h = 14
@@ -4295,7 +3990,7 @@ def draw_bilibili() -> Image.Image:
         if not streamers:
             draw.text((W // 2 - 40, H // 2 - 10), "暂无关注主播", (100, 105, 120), f_sm)
             draw.text((W // 2 - 50, H // 2 + 10), "请在Web端添加主播", (80, 85, 100), f_tiny)
-            return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+            return img
         
         # 按直播状态排序（直播中的排前面）
         sorted_streamers = sorted(streamers, key=lambda x: (x.get("live_status", 0) != 1, -x.get("online", 0)))
@@ -4303,9 +3998,9 @@ def draw_bilibili() -> Image.Image:
         # 计算布局: 2列显示，每列最多显示4个主播
         col_w = W // 2
         card_h = content_h // 4  # 每列4个卡片
-        max_show = 8
+        start = (sub_page % bilibili_sub_pages()) * BILIBILI_PER_SCREEN
         
-        for idx, s in enumerate(sorted_streamers[:max_show]):
+        for idx, s in enumerate(sorted_streamers[start:start + BILIBILI_PER_SCREEN]):
             col = idx % 2
             row = idx // 2
             
@@ -4361,16 +4056,16 @@ def draw_bilibili() -> Image.Image:
                     title_display = title_display[:11] + ".."
                 draw.text((cx + 5, cy + 26), title_display, (160, 165, 180), f_tiny)
         
-        # 如果主播数超过8个，显示提示
-        if len(streamers) > max_show:
-            draw.text((W - 40, H - 12), f"+{len(streamers) - max_show}更多", (100, 105, 120), f_tiny)
+        # 主播数超过一屏时显示分屏页码
+        if len(streamers) > BILIBILI_PER_SCREEN:
+            draw.text((W - 30, H - 12), f"{sub_page % bilibili_sub_pages() + 1}/{bilibili_sub_pages()}", (100, 105, 120), f_tiny)
         
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        return img
         
     except Exception as e:
         logger.error(f"绘制B站页面失败: {e}")
         img = Image.new("RGB", (W, H), (18, 20, 28))
-        draw = ImageDraw.Draw(img)
+        draw = CachedDraw(img)
         draw.text((10, 10), "B站页面错误", (200, 100, 100), f_sm)
         draw.text((10, 35), str(e)[:40], (150, 80, 80), f_tiny)
         return img
@@ -4387,6 +4082,17 @@ def main() -> None:
         logger.error("显示器初始化失败，退出")
         return
     
+    # 启动双缓冲异步刷新线程
+    if display_driver.async_flush:
+        display_driver.start_async()
+    
+    # 启动远程渲染接收端
+    if stream_receiver is not None:
+        try:
+            stream_receiver.start()
+        except OSError as e:
+            logger.error(f"远程显示接收端启动失败: {e}")
+    
     # 启动配置热加载
     config_reloader.start()
     
@@ -4444,35 +4150,104 @@ def main() -> None:
     # 主显示循环
     # 页面顺序: 时钟 -> 物流追踪 -> B站 -> 加密货币 -> 日历 -> Beszel -> Telegram
     page_functions = [draw_clock, draw_tracking, draw_bilibili, draw_crypto, draw_calendar, draw_beszel, draw_telegram]
+    # 支持分屏的列表页 -> 分屏数
+    sub_page_counters = {
+        draw_tracking: tracking_sub_pages,
+        draw_bilibili: bilibili_sub_pages,
+        draw_telegram: telegram_sub_pages,
+    }
     last_displayed_page = -1
+    last_power_state = display_driver.power_state
     cached_image = None
+    sub_page = 0
+    last_sub_page_switch = time.time()
     
     try:
         last_auto_switch = time.time()
         error_count = 0
         last_redraw_time = 0
         REDRAW_INTERVAL = 1.0  # 每秒重绘一次页面内容
+        last_stats_log = time.time()
+        STATS_LOG_INTERVAL = 600  # 每10分钟输出一次刷新统计
         
         while True:
             try:
                 current_page = button_state.get_page()
                 current_time = time.time()
                 
+                # 切换页面视为用户操作，临时恢复正常显示
+                if last_displayed_page != -1 and last_displayed_page != current_page:
+                    power_manager.wake()
+                power_state = power_manager.update()
+                redraw_interval = power_manager.redraw_interval(REDRAW_INTERVAL)
+                if redraw_interval is None:
+                    # 面板睡眠：不渲染也不传输
+                    last_power_state = power_state
+                    time.sleep(power_manager.sleep_poll)
+                    continue
+                
+                if stream_receiver is not None and stream_receiver.active:
+                    # 画面由远程主机渲染，流中断后自动恢复本地渲染
+                    cached_image = None
+                    time.sleep(0.1)
+                    continue
+                
                 if 0 <= current_page < len(page_functions):
-                    # 只在需要时重绘页面（每秒一次或页面变化时）
+                    # 只在需要时重绘页面（按电源状态的重绘间隔或页面/电源状态变化时）
                     need_redraw = (
                         cached_image is None or
                         last_displayed_page != current_page or
-                        current_time - last_redraw_time >= REDRAW_INTERVAL
+                        last_power_state != power_state or
+                        current_time - last_redraw_time >= redraw_interval
                     )
                     
+                    page_func = page_functions[current_page]
+                    sub_page_counter = sub_page_counters.get(page_func)
+                    if last_displayed_page != current_page:
+                        sub_page = 0
+                        last_sub_page_switch = current_time
+                    
+                    # 列表页轮播到下一屏：硬件滚动滑入，只传输新露出的列
+                    slide_to_next = (
+                        sub_page_counter is not None and
+                        last_displayed_page == current_page and
+                        power_state == "normal" and
+                        current_time - last_sub_page_switch >= LIST_SUB_PAGE_INTERVAL and
+                        sub_page_counter() > 1
+                    )
+                    if slide_to_next:
+                        sub_page = (sub_page + 1) % sub_page_counter()
+                        last_sub_page_switch = current_time
+                        need_redraw = True
+                    
                     if need_redraw:
                         try:
-                            img = page_functions[current_page]()
+                            # 夜间调暗在 RGB565 转换时查表完成，页面不再自行处理
+                            display_driver.set_brightness(NIGHT_DARKNESS_FACTOR if is_night_mode() else 1.0)
+                            # 切换传输格式后下一帧整帧发送（切换动画仍从当前画面开始），格式不变时无开销
+                            page_name = page_func.__name__[len("draw_"):]
+                            display_driver.set_pixel_format(PAGE_PIXEL_FORMATS.get(page_name, DEFAULT_PIXEL_FORMAT))
+                            display_driver.set_page(current_page)
+                            if power_state == "partial":
+                                # 局部显示只点亮时钟竖条；刚进入时屏幕上还是其他内容，整帧比对
+                                if last_power_state != power_state:
+                                    night_canvas.mark_all()
+                                img = draw_night_clock()
+                            else:
+                                img = page_func(sub_page) if sub_page_counter else page_func()
                             if img:
-                                display_image(img)
+                                if slide_to_next:
+                                    page_scroller.slide(page_image(img))
+                                elif last_displayed_page != -1 and last_displayed_page != current_page and power_state == "normal":
+                                    page_transition.run(page_image(img))
+                                elif isinstance(img, Compositor):
+                                    # 已是 RGB565 帧：不做整帧转换，改动过的矩形作为变化区域提示
+                                    display_driver.display_frame(img.frame, img.take_dirty())
+                                else:
+                                    display_image(img, page_regions(img))
                                 cached_image = img
                                 last_displayed_page = current_page
+                                last_power_state = power_state
                                 last_redraw_time = current_time
                                 error_count = 0
                         except Exception as page_error:
@@ -4499,6 +4274,27 @@ def main() -> None:
                         logger.info(f"自动页面切换: {old_page} -> {new_page}")
                         last_auto_switch = current_time
                 
+                if current_time - last_stats_log >= STATS_LOG_INTERVAL:
+                    stats = display_driver.get_stats()
+                    logger.info(f"刷新统计: 整帧 {stats['full_frames']}, 局部 {stats['partial_frames']}, "
+                                f"相同帧跳过 {stats['frames_skipped']}, 已发送 {stats['bytes_sent'] // 1024} KB")
+                    power_stats = power_manager.get_stats()
+                    logger.info(f"电源状态: {display_driver.power_state}, 切换 {power_stats['power_transitions']} 次, "
+                                f"睡眠 {power_stats['power_sleep_s'] / 3600:.1f} h, "
+                                f"局部显示 {power_stats['power_partial_s'] / 3600:.1f} h")
+                    text_stats = text_cache.get_stats()
+                    logger.info(f"文字缓存: {text_stats['text_cache_entries']} 条, "
+                                f"{text_stats['text_cache_bytes'] // 1024} KB, 命中率 {text_stats['text_cache_hit_rate']:.1%}")
+                    deco_stats = decoration_cache.get_stats()
+                    logger.info(f"装饰缓存: {deco_stats['decoration_cache_entries']} 条, "
+                                f"{deco_stats['decoration_cache_bytes'] // 1024} KB, 命中率 {deco_stats['decoration_cache_hit_rate']:.1%}")
+                    transition_stats = page_transition.get_stats()
+                    if transition_stats["transitions"]:
+                        logger.info(f"切换动画: {transition_stats['transitions']} 次, "
+                                    f"超预算硬切 {transition_stats['transitions_aborted']} 次, "
+                                    f"{transition_stats['transition_fps']:.1f} 帧/秒")
+                    last_stats_log = current_time
+                
                 time.sleep(0.02)  # 20ms检查间隔，快速响应按钮
                 
             except Exception as loop_error:
@@ -4521,6 +4317,9 @@ def main() -> None:
     except Exception as e:
         logger.error(f"主循环异常: {e}", exc_info=True)
     finally:
+        if frame_recorder is not None:
+            display_driver.remove_frame_listener(frame_recorder.write)
+            frame_recorder.close()
         logger.info("系统退出")
 
 
@@ -0,0 +1,87 @@
+"""RGB565 转换基准测试
+
+对比旧版逐帧分配的转换流程与预分配缓冲区的 RGB565Converter，
+输出每帧耗时以及单帧转换过程中的峰值临时内存（tracemalloc 统计，
+NumPy 数组分配会计入其中）。
+
+用法:
+    python -m screen.bench.convert [--frames N] [--width W] [--height H]
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from PIL import Image, ImageEnhance
+from typing import Callable
+
+from screen.core.rgb565 import RGB565Converter
+
+
+def legacy_image_to_rgb565_bytes(image: Image.Image) -> bytes:
+    """旧版转换流程（每帧约 6 次整帧分配）"""
+    img_array = np.array(image.convert("RGB"), dtype=np.uint16)
+    r = img_array[:, :, 0]
+    g = img_array[:, :, 1]
+    b = img_array[:, :, 2]
+    rgb565 = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    return rgb565.byteswap().tobytes()
+
+
+def measure_time(func: Callable[[], object], frames: int) -> float:
+    """测量平均每帧耗时（毫秒）"""
+    # 预热：让转换器完成首帧初始化
+    func()
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def measure_peak(func: Callable[[], object]) -> int:
+    """测量单帧转换过程中的峰值临时内存（字节）"""
+    func()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - base
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RGB565 转换基准测试")
+    parser.add_argument("--frames", type=int, default=200, help="每种实现转换的帧数")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    image = Image.fromarray(pixels, "RGB")
+    
+    converter = RGB565Converter(args.width, args.height)
+    dimmed = RGB565Converter(args.width, args.height)
+    dimmed.set_brightness(0.6)
+    # 结果一致性检查
+    assert legacy_image_to_rgb565_bytes(image) == converter.convert(image).tobytes()
+    
+    cases = [
+        ("legacy", lambda: legacy_image_to_rgb565_bytes(image)),
+        ("converter", lambda: converter.as_buffer(converter.convert(image))),
+        # 夜间模式：旧版先整帧调暗再转换，新版在转换时查表调暗
+        ("legacy+dim", lambda: legacy_image_to_rgb565_bytes(ImageEnhance.Brightness(image).enhance(0.6))),
+        ("lut+dim", lambda: converter.as_buffer(dimmed.convert(image))),
+    ]
+    
+    frame_bytes = args.width * args.height * 2
+    print(f"帧尺寸 {args.width}x{args.height}，RGB565 帧大小 {frame_bytes} 字节，{args.frames} 帧")
+    print(f"{'实现':<12}{'耗时/帧(ms)':>14}{'峰值临时内存(KB)':>20}{'峰值/帧大小':>14}")
+    for name, func in cases:
+        ms = measure_time(func, args.frames)
+        peak = measure_peak(func)
+        print(f"{name:<12}{ms:>14.3f}{peak / 1024:>20.1f}{peak / frame_bytes:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
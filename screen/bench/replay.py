@@ -0,0 +1,60 @@
+"""录制回放基准
+
+把 display.record 录下的帧按原速或最快速度推送给任意显示后端，
+统计帧率、发送字节数，以及局部刷新相对整帧刷新节省的带宽。
+
+用法:
+    python -m screen.bench.replay RECORDING [--backend null] [--speed 0] [--limit N]
+                                            [--full]
+"""
+import argparse
+
+from screen.core.backends import create_display_backend
+from screen.core.config import load_config
+from screen.core.recorder import FrameRecording, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制回放基准")
+    parser.add_argument("recording", help="录制文件路径")
+    parser.add_argument("--backend", default="null", help="显示后端（st7789 / null / image / shm / record，record 为模拟 SPI 上的 ST7789 驱动）")
+    parser.add_argument("--speed", type=float, default=0.0, help="回放倍速，1 为原速，0 为最快")
+    parser.add_argument("--limit", type=int, default=0, help="最多回放的帧数，0 为全部")
+    parser.add_argument("--full", action="store_true", help="关闭局部刷新，每帧整帧发送")
+    args = parser.parse_args()
+    
+    recording = FrameRecording(args.recording)
+    config = load_config()
+    config.set("display.backend", args.backend)
+    config.set("display.export.enabled", False)
+    config.set("hardware.display.width", recording.width)
+    config.set("hardware.display.height", recording.height)
+    if args.full:
+        config.set("display.partial_update.enabled", False)
+    
+    driver = create_display_backend(config)
+    if not driver.init_display():
+        print("显示后端初始化失败")
+        return
+    
+    try:
+        result = replay(recording, driver, args.speed, args.limit)
+        stats = driver.get_stats()
+    finally:
+        driver.close()
+    
+    frames = result["frames"]
+    saved = 1 - result["bytes_sent"] / result["full_frame_bytes"] if result["full_frame_bytes"] else 0.0
+    print(f"录制: {args.recording}（{recording.width}x{recording.height}，关键帧间隔 {recording.keyframe_interval}）")
+    print(f"后端: {args.backend}，倍速: {'最快' if args.speed <= 0 else args.speed}")
+    print(f"帧数 {frames}，耗时 {result['elapsed']:.2f} s，{result['fps']:.1f} 帧/秒")
+    print(f"整帧 {stats['full_frames']}，局部 {stats['partial_frames']}（{stats['regions']} 个窗口），"
+          f"相同帧跳过 {stats['frames_skipped']}")
+    print(f"发送 {result['bytes_sent'] / 1024:.0f} KB，整帧刷新需 {result['full_frame_bytes'] / 1024:.0f} KB，"
+          f"节省 {saved:.1%}")
+    if frames:
+        print(f"平均发送耗时 {stats['send_time'] / frames * 1000:.2f} ms/帧")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""SPI 吞吐量基准测试
+
+通过 DisplayDriver 向屏幕整帧写入像素数据，统计不同分块大小下的
+有效 MB/s 与帧率，并与配置的 SPI 时钟理论值对比。--format rgb444 时
+按 12 位格式打包发送（含打包耗时）。
+
+用法:
+    python -m screen.bench.spi [--mock] [--frames N] [--speed HZ] [--chunks 4096,65536]
+                               [--format rgb565|rgb444]
+"""
+import argparse
+import time
+import numpy as np
+
+from screen.core.config import load_config
+from screen.core.display import DisplayDriver
+from screen.core.spi import MockSpi
+
+
+def run(driver: DisplayDriver, frame: np.ndarray, frames: int) -> float:
+    """整帧写入 frames 次，返回总耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        driver.write_region(frame, 0, 0, driver.width - 1, driver.height - 1)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SPI 吞吐量基准测试")
+    parser.add_argument("--mock", action="store_true", help="使用模拟 SPI 设备与 GPIO")
+    parser.add_argument("--frames", type=int, default=30, help="每种分块大小发送的帧数")
+    parser.add_argument("--speed", type=int, default=0, help="SPI 时钟频率（Hz），默认读取配置")
+    parser.add_argument("--chunks", default="0", help="逗号分隔的分块大小列表，0 表示 spidev bufsiz")
+    parser.add_argument("--format", default="rgb565", choices=["rgb565", "rgb444"], help="传输像素格式")
+    args = parser.parse_args()
+    
+    config = load_config()
+    # 噪声帧不能写入正在运行的服务的共享内存帧
+    config.set("display.export.enabled", False)
+    if args.speed:
+        config.set("hardware.spi.max_speed", args.speed)
+    if args.mock:
+        config.set("hardware.gpio.backend", "mock")
+    config.set("display.pixel_format", args.format)
+    
+    driver = DisplayDriver(config, spi=MockSpi() if args.mock else None)
+    if not driver.init_display():
+        print("显示器初始化失败")
+        return
+    
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 0x10000, (driver.height, driver.width), dtype=np.uint16).astype(">u2")
+    # rgb444 每两像素 3 字节
+    frame_bytes = frame.size * 3 // 2 if args.format == "rgb444" else frame.nbytes
+    theoretical = driver.spi_speed / 8 / 1e6
+    
+    print(f"设备: {'模拟' if args.mock else f'/dev/spidev{driver.spi_bus}.{driver.spi_device}'}，"
+          f"时钟 {driver.spi_speed / 1e6:.1f} MHz（理论 {theoretical:.2f} MB/s），"
+          f"bufsiz {driver._spi.bufsiz}")
+    print(f"格式 {args.format}，帧大小 {frame_bytes} 字节，每组 {args.frames} 帧")
+    print(f"{'分块(字节)':<12}{'MB/s':>10}{'帧/秒':>10}{'效率':>10}{'单帧最长(ms)':>16}")
+    
+    try:
+        for chunk in (int(c) for c in args.chunks.split(",")):
+            driver._spi.set_chunk_size(chunk)
+            driver._spi.reset_stats()
+            elapsed = run(driver, frame, args.frames)
+            mbps = frame_bytes * args.frames / elapsed / 1e6
+            stats = driver._spi.get_stats()
+            print(f"{driver._spi.chunk_size:<12}{mbps:>10.2f}{args.frames / elapsed:>10.1f}"
+                  f"{mbps / theoretical:>10.0%}{stats['spi_max_transfer_ms']:>16.2f}")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""文字渲染基准测试
+
+在 320x240 画布上反复绘制一组典型状态文字（系统负载、价格、时间、中文标签），
+比较 ImageDraw.text、字形图集组字（draw_text 贴到 PIL 图像 / blit 混合到
+NumPy 帧缓冲）与 CachedDraw（缓存命中）的单帧耗时，并报告图集输出与
+ImageDraw.text 的像素差异。
+
+用法:
+    python -m screen.bench.text [--frames N] [--font PATH]
+"""
+import argparse
+import os
+import time
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from screen.ui.glyph_atlas import GlyphAtlas
+from screen.ui.text_cache import CachedDraw, text_cache
+
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    os.path.join(os.path.dirname(__file__), "..", "..", "fonts", "wqy-zenhei.ttc"),
+    "/usr/share/fonts/truetype/wqy-zenhei/wqy-zenhei.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+STATUS_LINES = [
+    "CPU 23.5%  RAM 61%  42.3°C",
+    "BTC $67,123.45  +2.31%",
+    "ETH $3,456.78  -0.84%",
+    "12:34:56  周三  晴 18°C",
+    "上行 1.2 MB/s  下行 356 KB/s",
+    "磁盘 45.2/119.2 GB",
+    "Uptime 3d 04:12",
+    "湿度 65%  东南风 3级",
+]
+
+
+def find_font(path: str = "") -> str:
+    """返回第一个存在的字体路径，都不存在时返回空字符串"""
+    for candidate in ([path] if path else FONT_CANDIDATES):
+        if os.path.exists(candidate):
+            return candidate
+    return ""
+
+
+def layout(font) -> list:
+    """状态文字在画布上的位置"""
+    step = font.size + 4
+    return [((8 + (i % 2) * 4, 8 + i * step), line) for i, line in enumerate(STATUS_LINES)]
+
+
+def run(label: str, frames: int, draw_frame, base: float = 0.0) -> float:
+    """绘制 frames 帧，打印并返回单帧耗时（毫秒）；base 为对照耗时，用于计算加速比"""
+    draw_frame()  # 预热（图集追加中文字形、文字缓存首次栅格化）
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw_frame()
+    ms = (time.perf_counter() - start) / frames * 1000
+    speedup = f"{base / ms:>9.1f}x" if base else f"{'-':>10}"
+    print(f"  {label:<24}{ms:>10.3f}{speedup}")
+    return ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文字渲染基准测试")
+    parser.add_argument("--frames", type=int, default=200, help="每种方式绘制的帧数")
+    parser.add_argument("--font", default="", help="字体路径，默认优先使用文泉驿正黑")
+    args = parser.parse_args()
+    
+    path = find_font(args.font)
+    if not path:
+        print("未找到 TrueType 字体")
+        return
+    print(f"字体: {path}，每种方式 {args.frames} 帧，每帧 {len(STATUS_LINES)} 行")
+    fill = (200, 210, 225)
+    
+    for size in (11, 15):
+        font = ImageFont.truetype(path, size)
+        items = layout(font)
+        atlas = GlyphAtlas(font)
+        image = Image.new("RGB", (320, 240), (20, 24, 32))
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        draw = ImageDraw.Draw(image)
+        cached = CachedDraw(image)
+        
+        def draw_pil():
+            for xy, text in items:
+                draw.text(xy, text, fill, font)
+        
+        def draw_atlas():
+            for xy, text in items:
+                atlas.draw_text(image, xy, text, fill)
+        
+        def blit_atlas():
+            for xy, text in items:
+                atlas.blit(frame, xy, text, fill)
+        
+        def draw_cached():
+            for xy, text in items:
+                cached.text(xy, text, fill, font)
+        
+        print(f"{size}px  {'方式':<22}{'单帧(ms)':>10}{'加速比':>10}")
+        base = run("ImageDraw.text", args.frames, draw_pil)
+        run("atlas.draw_text", args.frames, draw_atlas, base)
+        run("atlas.blit", args.frames, blit_atlas, base)
+        run("CachedDraw (hit)", args.frames, draw_cached, base)
+        
+        # 像素差异：同一背景上各画一次
+        ref = Image.new("RGB", (320, 240), (20, 24, 32))
+        out = ref.copy()
+        ref_draw = ImageDraw.Draw(ref)
+        for xy, text in items:
+            ref_draw.text(xy, text, fill, font)
+            atlas.draw_text(out, xy, text, fill)
+        diff = np.abs(np.asarray(ref, dtype=np.int16) - np.asarray(out, dtype=np.int16))
+        stats = atlas.get_stats()
+        print(f"  与 ImageDraw.text 不同的像素 {int(diff.any(axis=2).sum())}，最大差值 {int(diff.max())}；"
+              f"图集 {stats['glyphs']} 字形 {stats['atlas_bytes']} 字节")
+    print(f"文字缓存: {text_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""显示后端模块
+
+除 ST7789 (DisplayDriver) 外的无屏输出后端：
+- NullSink: 丢弃像素，只统计字节数与耗时（可按 SPI 速率模拟传输时间）
+- ImageSink: 每 N 帧把当前画面保存为 PNG/PPM 文件
+- SharedMemorySink: 画面写入 /dev/shm 下的 mmap 帧缓冲文件（大端序 RGB565）
+- CommandRecorder: 走完整的 ST7789 驱动逻辑，只记录命令序列，用于验证时序
+- StreamSink: 把脏矩形推送到远端 Pi 的接收器（见 stream.py）
+
+通过 display.backend 配置选择，create_display_backend 创建实例。
+"""
+import os
+import mmap
+import time
+import numpy as np
+from PIL import Image
+from typing import List, Optional
+
+from .display import DisplayBackend, DisplayDriver
+from .gpio import MockGPIO
+from .rgb565 import rgb565_to_rgb888
+from .spi import MockSpi
+from .stream import StreamSink
+
+
+class NullSink(DisplayBackend):
+    """空输出后端，用于在无屏主机上测量渲染流水线"""
+    
+    name = "null"
+    # 只统计字节数，两种格式都可用于估算传输量
+    pixel_formats = ("rgb565", "rgb444")
+    
+    def __init__(self, config=None, logger=None):
+        super().__init__(config, logger)
+        # 模拟的 SPI 时钟频率，0 表示不模拟传输耗时
+        self.spi_hz = config.get("display.null.spi_hz", 0) if config else 0
+        self._started: Optional[float] = None
+    
+    def _init_display(self) -> bool:
+        self._started = time.perf_counter()
+        self._log('info', "空输出后端已就绪")
+        return True
+    
+    def set_window(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        pass
+    
+    def write_pixels(self, pixels) -> None:
+        if self.spi_hz:
+            time.sleep(memoryview(pixels).nbytes * 8 / self.spi_hz)
+    
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        frames = stats["frames"]
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        stats["fps"] = frames / elapsed if elapsed > 0 else 0.0
+        stats["avg_send_ms"] = stats["send_time"] / frames * 1000 if frames else 0.0
+        return stats
+
+
+class FramebufferSink(DisplayBackend):
+    """在内存帧缓冲上模拟显存窗口写入的后端基类"""
+    
+    name = "framebuffer"
+    
+    def __init__(self, config=None, logger=None):
+        super().__init__(config, logger)
+        self._fb: Optional[np.ndarray] = None
+        self._window = (0, 0, self.width - 1, self.height - 1)
+    
+    def _allocate(self) -> np.ndarray:
+        """分配 (H, W) 大端序 RGB565 帧缓冲"""
+        return np.zeros((self.height, self.width), dtype=">u2")
+    
+    def _init_display(self) -> bool:
+        try:
+            if self._fb is None:
+                self._fb = self._allocate()
+            return True
+        except Exception as e:
+            self._log('error', f"{self.name} 输出后端初始化失败: {e}")
+            return False
+    
+    def set_window(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        self._window = (x0, y0, x1, y1)
+    
+    def write_pixels(self, pixels) -> None:
+        x0, y0, x1, y1 = self._window
+        region = np.frombuffer(pixels, dtype=">u2").reshape(y1 - y0 + 1, x1 - x0 + 1)
+        self._fb[y0:y1 + 1, x0:x1 + 1] = region
+    
+    def snapshot(self) -> Image.Image:
+        """将当前帧缓冲还原为 RGB 图像"""
+        return Image.fromarray(rgb565_to_rgb888(self._fb), "RGB")
+
+
+class ImageSink(FramebufferSink):
+    """每 N 帧保存一次画面的图片输出后端"""
+    
+    name = "image"
+    
+    def __init__(self, config=None, logger=None):
+        super().__init__(config, logger)
+        if config:
+            # 路径中的 {n} 替换为帧序号，扩展名决定格式（.png / .ppm）
+            self.path = config.get("display.image_sink.path", "/tmp/tftscreen/frame_{n:06d}.png")
+            self.every = max(1, config.get("display.image_sink.every", 30))
+        else:
+            self.path = "/tmp/tftscreen/frame_{n:06d}.png"
+            self.every = 30
+        self._frame_index = 0
+        self.files_written = 0
+    
+    def _init_display(self) -> bool:
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        except Exception as e:
+            self._log('error', f"创建图片输出目录失败 {directory}: {e}")
+            return False
+        return super()._init_display()
+    
+    def _end_frame(self) -> None:
+        if self._frame_index % self.every == 0:
+            path = self.path.format(n=self._frame_index)
+            try:
+                self.snapshot().save(path)
+                self.files_written += 1
+            except Exception as e:
+                self._log('warning', f"保存画面失败 {path}: {e}")
+        self._frame_index += 1
+    
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats["files_written"] = self.files_written
+        return stats
+
+
+class SharedMemorySink(FramebufferSink):
+    """共享内存帧缓冲后端，其他进程可 mmap 同一文件读取画面"""
+    
+    name = "shm"
+    
+    def __init__(self, config=None, logger=None):
+        super().__init__(config, logger)
+        self.path = config.get("display.shm.path", "/dev/shm/tftscreen.fb") if config else "/dev/shm/tftscreen.fb"
+        self._mmap: Optional[mmap.mmap] = None
+    
+    def _allocate(self) -> np.ndarray:
+        size = self.width * self.height * 2
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._log('info', f"共享内存帧缓冲: {self.path} ({self.width}x{self.height} RGB565)")
+        return np.ndarray((self.height, self.width), dtype=">u2", buffer=self._mmap)
+    
+    def close(self) -> None:
+        super().close()
+        self._fb = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class CommandRecorder(DisplayDriver):
+    """记录 ST7789 命令序列的模拟后端（模拟 SPI 与 GPIO）"""
+    
+    name = "record"
+    
+    def __init__(self, config=None, logger=None):
+        super().__init__(config, logger, spi=MockSpi(simulate=False))
+        self._gpio.close()
+        self._gpio = MockGPIO(logger)
+        # 每项为 [命令, 参数字节, 像素字节数]
+        self.commands: List[list] = []
+    
+    def write_cmd(self, cmd: int) -> None:
+        if self._spi is None:
+            return
+        self.commands.append([cmd, bytearray(), 0])
+        super().write_cmd(cmd)
+    
+    def write_data(self, data) -> None:
+        if self._spi is None:
+            return
+        if self.commands:
+            self.commands[-1][1].extend([data] if isinstance(data, int) else data)
+        super().write_data(data)
+    
+    def write_pixels(self, pixels) -> None:
+        if self.commands:
+            self.commands[-1][2] += memoryview(pixels).nbytes
+        super().write_pixels(pixels)
+    
+    def command_codes(self) -> List[int]:
+        """已记录的命令码序列"""
+        return [cmd for cmd, _, _ in self.commands]
+    
+    def clear(self) -> None:
+        """清空记录"""
+        self.commands = []
+
+
+_BACKENDS = {
+    DisplayDriver.name: DisplayDriver,
+    NullSink.name: NullSink,
+    ImageSink.name: ImageSink,
+    SharedMemorySink.name: SharedMemorySink,
+    CommandRecorder.name: CommandRecorder,
+    StreamSink.name: StreamSink,
+}
+
+
+def create_display_backend(config=None, logger=None) -> DisplayBackend:
+    """
+    根据配置创建显示后端
+    
+    Args:
+        config: 配置对象（读取 display.backend）
+        logger: 日志记录器
+    
+    Returns:
+        DisplayBackend 实例
+    """
+    name = config.get("display.backend", "st7789") if config else "st7789"
+    backend_class = _BACKENDS.get(name)
+    if backend_class is None:
+        if logger:
+            logger.warning(f"未知的显示后端 {name}，使用 st7789")
+        backend_class = DisplayDriver
+    return backend_class(config, logger)
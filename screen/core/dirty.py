@@ -0,0 +1,73 @@
+"""脏矩形检测模块
+
+对比前后两帧，找出需要重新发送到屏幕的矩形窗口
+"""
+import numpy as np
+from typing import List, Optional, Tuple
+
+# (x0, y0, x1, y1) 闭区间，单位为帧数组的行/列
+Region = Tuple[int, int, int, int]
+
+
+def _split_runs(indices: np.ndarray, merge_gap: int) -> List[Tuple[int, int]]:
+    """将有序索引切分为连续段，间隔不超过 merge_gap 的段合并"""
+    if indices.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > merge_gap + 1)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], [indices[-1]]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def changed_mask(prev: np.ndarray, curr: np.ndarray) -> np.ndarray:
+    """
+    计算逐像素变化掩码
+    
+    Args:
+        prev: 上一帧数组，形状 (H, W) 或 (H, W, C)
+        curr: 当前帧数组，形状与 prev 相同
+    
+    Returns:
+        形状 (H, W) 的布尔数组
+    """
+    mask = prev != curr
+    if mask.ndim > 2:
+        mask = mask.any(axis=tuple(range(2, mask.ndim)))
+    return mask
+
+
+def find_dirty_regions(prev: Optional[np.ndarray], curr: np.ndarray,
+                       merge_gap: int = 8) -> List[Region]:
+    """
+    找出两帧之间的变化区域
+    
+    先按行找出变化的行带，再在每个行带内按列找出变化的列段。
+    相距不超过 merge_gap 的行带/列段会被合并成一个窗口，
+    以减少窗口设置命令的开销。
+    
+    Args:
+        prev: 上一帧数组，None 表示整帧都需要发送
+        curr: 当前帧数组
+        merge_gap: 合并间距（行/列数）
+    
+    Returns:
+        脏矩形列表，无变化时返回空列表
+    """
+    height, width = curr.shape[:2]
+    if prev is None or prev.shape != curr.shape:
+        return [(0, 0, width - 1, height - 1)]
+    
+    mask = changed_mask(prev, curr)
+    rows = np.flatnonzero(mask.any(axis=1))
+    
+    regions: List[Region] = []
+    for y0, y1 in _split_runs(rows, merge_gap):
+        cols = np.flatnonzero(mask[y0:y1 + 1].any(axis=0))
+        for x0, x1 in _split_runs(cols, merge_gap):
+            regions.append((x0, y0, x1, y1))
+    return regions
+
+
+def regions_area(regions: List[Region]) -> int:
+    """计算脏矩形总面积（像素数）"""
+    return sum((x1 - x0 + 1) * (y1 - y0 + 1) for x0, y0, x1, y1 in regions)
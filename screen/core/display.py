@@ -1,47 +1,125 @@
 """显示器硬件驱动模块"""
-import os
 import time
+import zlib
+import threading
 import numpy as np
 from PIL import Image
-from typing import Optional
+from typing import Callable, List, Optional, Set
 
+from .dirty import Region, find_dirty_regions, regions_area
+from .flush import FrameFlusher
+from .frame_export import FrameExport
+from .gpio import create_gpio_backend
+from .power import POWER_STATES
+from .rgb565 import RGB444Packer, RGB565Converter
+from .spi import SpiTransport
 
-class DisplayDriver:
-    """ST7789 显示器驱动类"""
+
+class DisplayBackend:
+    """
+    显示后端基类
+    
+    负责与具体输出设备无关的刷新流水线：RGB565 转换、相同帧跳过、
+    脏矩形规划、异步刷新与统计。子类只需实现设备初始化和窗口写入。
+    """
+    
+    name = "base"
+    # 是否支持硬件滚动（VSCRDEF/VSCSAD）
+    supports_hardware_scroll = False
+    # 支持的传输像素格式，rgb444 为 12 位（每两像素 3 字节）
+    pixel_formats = ("rgb565",)
     
     def __init__(self, config=None, logger=None):
         """
-        初始化显示驱动
+        初始化显示后端
         
         Args:
             config: 配置对象
             logger: 日志记录器
         """
         self._logger = logger
-        self._spi = None
+        self._ready = False
+        
+        # 上一次发送到屏幕的帧（用于局部刷新比对），None 表示屏幕内容未知
+        self._last_frame: Optional[np.ndarray] = None
+        # 上一次发送帧的 CRC32 指纹
+        self._last_fingerprint: Optional[int] = None
+        # 屏幕内容已知（_last_frame 可作动画起点），但像素精度与当前格式不一致，下一帧需整帧发送
+        self._full_pending = False
+        self._stats = {"frames": 0, "full_frames": 0, "partial_frames": 0, "regions": 0,
+                       "bytes_sent": 0, "frames_skipped": 0, "hinted_frames": 0, "send_time": 0.0}
+        # 变化区域提示是否可用：屏幕内容来自 _hint_page 页面经 send_frame 的上一次提交
+        self._hint_valid = False
+        self._hint_page = -1
+        
+        # 设备访问锁（刷新线程与主循环的重新初始化互斥）
+        self._io_lock = threading.RLock()
+        self._flusher: Optional[FrameFlusher] = None
         
         # 从配置读取参数，或使用默认值
         if config:
             self.width = config.get("hardware.display.width", 320)
             self.height = config.get("hardware.display.height", 240)
-            self.dc_pin = config.get("hardware.display.dc_pin", "75")
-            self.rst_pin = config.get("hardware.display.rst_pin", "79")
-            self.cs_pin = config.get("hardware.display.cs_pin", "233")
             self.button_pin = config.get("hardware.button.pin", "70")
-            self.spi_bus = config.get("hardware.spi.bus", 1)
-            self.spi_device = config.get("hardware.spi.device", 0)
-            self.spi_speed = config.get("hardware.spi.max_speed", 62500000)
+            self.partial_update = config.get("display.partial_update.enabled", True)
+            self.merge_gap = config.get("display.partial_update.merge_gap", 8)
+            self.full_threshold = config.get("display.partial_update.full_threshold", 0.5)
+            self.max_regions = config.get("display.partial_update.max_regions", 8)
+            self.async_flush = config.get("display.async_flush", True)
+            self.skip_identical = config.get("display.skip_identical", True)
+            pixel_format = config.get("display.pixel_format", "rgb565")
+            export_enabled = config.get("display.export.enabled", False)
+            export_path = config.get("display.export.path", "/dev/shm/tftscreen.frame")
         else:
             # 默认值
             self.width = 320
             self.height = 240
-            self.dc_pin = "75"
-            self.rst_pin = "79"
-            self.cs_pin = "233"
             self.button_pin = "70"
-            self.spi_bus = 1
-            self.spi_device = 0
-            self.spi_speed = 62500000
+            self.partial_update = True
+            self.merge_gap = 8
+            self.full_threshold = 0.5
+            self.max_regions = 8
+            self.async_flush = True
+            self.skip_identical = True
+            pixel_format = "rgb565"
+            export_enabled = False
+            export_path = "/dev/shm/tftscreen.frame"
+        
+        # GPIO 后端（sysfs 常驻 fd / 字符设备 / 模拟）
+        self._gpio = create_gpio_backend(config, logger)
+        
+        # RGB565 转换器（复用缓冲区，每帧无整帧临时分配）
+        self._converter = RGB565Converter(self.width, self.height)
+        
+        # 传输像素格式：流水线内部始终是 RGB565，rgb444 在写窗口时打包
+        # 设备在 init_display 时按 self.pixel_format 设置
+        self.pixel_format = "rgb565"
+        self._packer: Optional[RGB444Packer] = None
+        
+        # 共享内存帧导出：屏幕当前内容直接保存在共享内存中，发布不额外复制
+        self.page_index = -1
+        self._export: Optional[FrameExport] = None
+        if export_enabled:
+            try:
+                self._export = FrameExport(export_path, self.width, self.height, logger)
+            except Exception as e:
+                self._log('warning', f"共享内存帧导出不可用 {export_path}: {e}")
+        
+        # 帧监听器（如录制器），在设备锁内以 (帧, 页面序号) 调用
+        self._frame_listeners: List[Callable[[np.ndarray, int], None]] = []
+        
+        # 面板电源状态（见 power.py），partial 状态下点亮的列范围
+        self.power_state = "normal"
+        self.partial_columns = (0, self.width - 1)
+        # 已警告过的不支持格式
+        self._warned_formats: Set[str] = set()
+        if pixel_format != self.pixel_format:
+            if pixel_format in self.pixel_formats:
+                self.pixel_format = pixel_format
+                self._packer = RGB444Packer(self.width * self.height)
+            else:
+                self._warned_formats.add(pixel_format)
+                self._log('warning', f"{self.name} 后端不支持像素格式 {pixel_format}，使用 rgb565")
     
     def _log(self, level: str, message: str):
         """内部日志方法"""
@@ -55,47 +133,498 @@ class DisplayDriver:
     def gpio_set(self, pin: str, value: int) -> None:
         """设置GPIO引脚值"""
         try:
-            os.system(f"echo {value} > /sys/class/gpio/gpio{pin}/value 2>/dev/null")
+            self._gpio.write(pin, value)
         except Exception as e:
             self._log('warning', f"GPIO设置失败 pin={pin}, value={value}: {e}")
     
     def init_gpio(self, pin: str, direction: str = "out") -> bool:
         """初始化GPIO引脚"""
-        try:
-            gpio_path = f"/sys/class/gpio/gpio{pin}"
-            if not os.path.exists(gpio_path):
-                os.system(f"echo {pin} > /sys/class/gpio/export 2>/dev/null")
-            time.sleep(0.1)
-            os.system(f"echo {direction} > {gpio_path}/direction 2>/dev/null")
-            return True
-        except Exception as e:
-            self._log('error', f"GPIO初始化失败 pin={pin}: {e}")
-            return False
+        return self._gpio.setup(pin, direction)
     
     def init_button_gpio(self) -> bool:
         """初始化按键GPIO"""
         return self.init_gpio(self.button_pin, "in")
     
     def read_button_raw(self) -> bool:
-        """读取按键原始状态"""
+        """读取按键原始状态（低电平为按下）"""
         try:
-            with open(f"/sys/class/gpio/gpio{self.button_pin}/value", "r") as f:
-                return f.read().strip() == "0"
+            return self._gpio.read(self.button_pin) == 0
         except Exception as e:
             self._log('debug', f"读取按键失败: {e}")
             return False
     
+    # ========== 设备接口（子类实现） ==========
+    
+    def is_ready(self) -> bool:
+        """设备是否已初始化，可以接收帧"""
+        return self._ready
+    
+    def init_display(self) -> bool:
+        """初始化显示设备"""
+        with self._io_lock:
+            self._ready = self._init_display()
+            if self._ready:
+                # 设备内容未知，下一帧整帧发送
+                self.invalidate()
+            return self._ready
+    
+    def _init_display(self) -> bool:
+        """设备初始化流程（调用方持有设备锁）"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement _init_display()")
+    
+    def set_window(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """设置写入窗口（闭区间）"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement set_window()")
+    
+    def write_pixels(self, pixels) -> None:
+        """向当前窗口写入像素数据（大端序 RGB565，或 rgb444 格式下的打包数据）"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement write_pixels()")
+    
+    def set_power_state(self, state: str, partial_columns: Optional[tuple] = None) -> bool:
+        """
+        切换面板电源状态
+        
+        Args:
+            state: normal / idle / partial / sleep
+            partial_columns: partial 状态下点亮的列范围 (起, 止)，闭区间
+        
+        Returns:
+            是否切换成功
+        """
+        if state not in POWER_STATES:
+            self._log('warning', f"未知的电源状态 {state}")
+            return False
+        columns = tuple(partial_columns) if partial_columns else self.partial_columns
+        if state == self.power_state and columns == self.partial_columns:
+            return True
+        
+        with self._io_lock:
+            previous = self.power_state
+            previous_columns = self.partial_columns
+            self.power_state = state
+            self.partial_columns = columns
+            if self.is_ready():
+                try:
+                    self._apply_power_state(previous)
+                except Exception as e:
+                    self._log('error', f"切换电源状态失败 {previous} -> {state}: {e}")
+                    self.power_state = previous
+                    self.partial_columns = previous_columns
+                    # 命令序列可能只执行了一部分，屏幕内容未知，下一帧整帧发送
+                    self.invalidate()
+                    return False
+        return True
+    
+    def _apply_power_state(self, previous: str) -> None:
+        """将 power_state 下发到设备（调用方持有设备锁）"""
+        pass
+    
+    def _end_frame(self) -> None:
+        """一帧的全部窗口写入完成（调用方持有设备锁）"""
+        pass
+    
+    def _recover(self) -> None:
+        """发送失败后尝试恢复设备"""
+        try:
+            time.sleep(0.1)
+            self.init_display()
+        except:
+            pass
+    
+    # ========== 图像处理 ==========
+    
+    @staticmethod
+    def rgb_to_rgb565(r: int, g: int, b: int) -> int:
+        """将RGB888转换为RGB565格式"""
+        return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    
+    def image_to_rgb565_array(self, image: Image.Image, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        将 PIL 图像转换为大端序 RGB565 数组 (H, W)
+        
+        Args:
+            image: PIL 图像
+            out: 可选的预分配输出数组；省略时返回驱动内部缓冲区，下一帧会被覆盖
+        
+        Returns:
+            RGB565 数组
+        """
+        return self._converter.convert(image, out)
+    
+    def set_brightness(self, factor: float) -> None:
+        """设置输出亮度系数（夜间调暗），在 RGB565 转换时查表完成"""
+        if factor != self._converter.brightness:
+            # 亮度变化影响整屏像素，变化区域提示不再完整
+            self._hint_valid = False
+        self._converter.set_brightness(factor)
+    
+    def set_pixel_format(self, pixel_format: str) -> bool:
+        """
+        切换传输像素格式
+        
+        Args:
+            pixel_format: "rgb565" 或 "rgb444"
+        
+        Returns:
+            当前后端是否支持该格式（不支持时保持原格式）
+        """
+        if pixel_format == self.pixel_format:
+            return True
+        if pixel_format not in self.pixel_formats:
+            # 主循环每次重绘都会按页面设置格式，同一格式只警告一次
+            if pixel_format not in self._warned_formats:
+                self._warned_formats.add(pixel_format)
+                self._log('warning', f"{self.name} 后端不支持像素格式 {pixel_format}，保持 {self.pixel_format}")
+            return False
+        
+        with self._io_lock:
+            if pixel_format == "rgb444" and self._packer is None:
+                self._packer = RGB444Packer(self.width * self.height)
+            self.pixel_format = pixel_format
+            if self.is_ready():
+                self._apply_pixel_format()
+            # 屏幕上已有像素的精度与新格式不一致，下一帧整帧发送；
+            # 屏幕内容仍然已知，页面切换动画可以从当前画面开始
+            self._full_pending = True
+            self._last_fingerprint = None
+            self._hint_valid = False
+        return True
+    
+    def _apply_pixel_format(self) -> None:
+        """将 pixel_format 下发到设备（调用方持有设备锁）"""
+        pass
+    
+    def image_to_rgb565_bytes(self, image: Image.Image) -> bytes:
+        """将 PIL 图像转换为 RGB565 字节数组"""
+        return self.image_to_rgb565_array(image).tobytes()
+    
+    # ========== 刷新流水线 ==========
+    
+    def plan_regions(self, frame: np.ndarray, hint: Optional[List[Region]] = None) -> Optional[List[Region]]:
+        """
+        规划本帧需要发送的窗口
+        
+        Args:
+            frame: 当前帧 RGB565 数组
+            hint: 调用方报告的可能变化区域（见 display_image），只在其中比对
+        
+        Returns:
+            脏矩形列表（空列表表示无需发送），None 表示整帧发送
+        """
+        if not self.partial_update or self._last_frame is None or self._full_pending:
+            return None
+        
+        if hint is not None and self._hint_valid and self._hint_page == self.page_index:
+            regions = []
+            for x0, y0, x1, y1 in hint:
+                for rx0, ry0, rx1, ry1 in find_dirty_regions(self._last_frame[y0:y1 + 1, x0:x1 + 1],
+                                                             frame[y0:y1 + 1, x0:x1 + 1], self.merge_gap):
+                    regions.append((rx0 + x0, ry0 + y0, rx1 + x0, ry1 + y0))
+            self._stats["hinted_frames"] += 1
+        else:
+            regions = find_dirty_regions(self._last_frame, frame, self.merge_gap)
+        if len(regions) > self.max_regions:
+            return None
+        if regions_area(regions) >= self.full_threshold * self.width * self.height:
+            return None
+        return regions
+    
+    def send_frame(self, frame: np.ndarray, hint: Optional[List[Region]] = None) -> None:
+        """发送一帧 RGB565 数据，仅变化区域走局部刷新"""
+        with self._io_lock:
+            start = time.perf_counter()
+            self._send_frame(frame, hint)
+            self._stats["send_time"] += time.perf_counter() - start
+    
+    @staticmethod
+    def frame_fingerprint(frame: np.ndarray) -> int:
+        """计算帧的 CRC32 指纹"""
+        return zlib.crc32(RGB565Converter.as_buffer(frame))
+    
+    def write_region(self, frame: np.ndarray, x0: int, y0: int, x1: int, y1: int) -> None:
+        """发送帧中的一个矩形区域（调用方持有设备锁）"""
+        if self.pixel_format == "rgb444":
+            # 每两像素 3 字节，窗口按偶数列对齐，保证每行像素成对
+            x0 &= ~1
+            x1 = min(x1 | 1, self.width - 1)
+            pixels = self._packer.pack(frame[y0:y1 + 1, x0:x1 + 1])
+        else:
+            pixels = RGB565Converter.as_buffer(frame[y0:y1 + 1, x0:x1 + 1])
+        self.set_window(x0, y0, x1, y1)
+        self.write_pixels(pixels)
+        self._stats["bytes_sent"] += pixels.nbytes
+    
+    def blit(self, frame: np.ndarray, regions: List[Region]) -> None:
+        """
+        直接发送帧中的若干窗口（动画快速路径）
+        
+        不做指纹与脏区比对，也不更新屏幕当前内容；调用方结束后需用
+        adopt_frame() 记录最终画面。
+        """
+        with self._io_lock:
+            start = time.perf_counter()
+            for x0, y0, x1, y1 in regions:
+                self.write_region(frame, x0, y0, x1, y1)
+            self._end_frame()
+            self._stats["regions"] += len(regions)
+            self._stats["send_time"] += time.perf_counter() - start
+    
+    def _send_frame(self, frame: np.ndarray, hint: Optional[List[Region]] = None) -> None:
+        """发送流程（调用方持有设备锁）"""
+        self._stats["frames"] += 1
+        self._notify_listeners(frame)
+        
+        # 与上一帧完全相同则跳过（比逐像素比对更省 CPU）
+        fingerprint = self.frame_fingerprint(frame) if self.skip_identical else None
+        if fingerprint is not None and fingerprint == self._last_fingerprint:
+            self._stats["frames_skipped"] += 1
+            return
+        
+        regions = self.plan_regions(frame, hint)
+        
+        if regions is None:
+            self.write_region(frame, 0, 0, self.width - 1, self.height - 1)
+            self._stats["full_frames"] += 1
+            self._full_pending = False
+        elif regions:
+            for x0, y0, x1, y1 in regions:
+                self.write_region(frame, x0, y0, x1, y1)
+            self._stats["partial_frames"] += 1
+            self._stats["regions"] += len(regions)
+        self._end_frame()
+        
+        # 保存副本：异步刷新时 frame 所在缓冲区会被渲染线程复用
+        self._remember_frame(frame)
+        self._last_fingerprint = fingerprint
+        # 屏幕内容来自本页面的上一次提交，下一帧的变化区域提示可信
+        self._hint_valid = True
+        self._hint_page = self.page_index
+    
+    def _remember_frame(self, frame: np.ndarray) -> None:
+        """记录屏幕当前内容并发布到共享内存（调用方持有设备锁）"""
+        if self._export is not None:
+            self._export.publish(frame, self.page_index)
+            self._last_frame = self._export.frame
+        elif self._last_frame is None:
+            self._last_frame = frame.copy()
+        else:
+            np.copyto(self._last_frame, frame)
+    
+    @property
+    def io_lock(self) -> threading.RLock:
+        """设备访问锁，直接写显存的调用方需持有"""
+        return self._io_lock
+    
+    def current_frame(self) -> Optional[np.ndarray]:
+        """屏幕当前内容（RGB565），未知时返回 None"""
+        return self._last_frame
+    
+    def end_frame(self) -> None:
+        """外部经 write_region 直接写完一帧的全部窗口后调用（同 blit 结束时的通知）"""
+        with self._io_lock:
+            self._end_frame()
+    
+    def adopt_frame(self, frame: np.ndarray) -> None:
+        """外部直接写入显存后，将 frame 记为屏幕当前内容"""
+        with self._io_lock:
+            self._notify_listeners(frame)
+            self._remember_frame(frame)
+            # 待整帧发送时不记录指纹，之后提交的相同帧不会被跳过
+            self._last_fingerprint = (self.frame_fingerprint(frame)
+                                      if self.skip_identical and not self._full_pending else None)
+            self._hint_valid = False
+    
+    @property
+    def full_frame_pending(self) -> bool:
+        """屏幕内容已知但下一帧需整帧发送（如切换像素格式后）"""
+        return self._full_pending
+    
+    def add_frame_listener(self, callback: Callable[[np.ndarray, int], None]) -> None:
+        """注册帧监听器，每个送往屏幕的帧（含被跳过的相同帧）都会通知"""
+        self._frame_listeners.append(callback)
+    
+    def remove_frame_listener(self, callback: Callable[[np.ndarray, int], None]) -> None:
+        """移除帧监听器"""
+        if callback in self._frame_listeners:
+            self._frame_listeners.remove(callback)
+    
+    def _notify_listeners(self, frame: np.ndarray) -> None:
+        """通知帧监听器，监听器异常不影响刷新"""
+        for callback in self._frame_listeners:
+            try:
+                callback(frame, self.page_index)
+            except Exception as e:
+                self._log('warning', f"帧监听器异常: {e}")
+    
+    def set_page(self, page: int) -> None:
+        """设置当前页面序号，随之后发送的帧一起发布"""
+        self.page_index = page
+    
+    def invalidate(self) -> None:
+        """标记屏幕内容未知，下一帧整帧发送"""
+        self._last_frame = None
+        self._last_fingerprint = None
+        self._hint_valid = False
+    
+    def get_stats(self) -> dict:
+        """获取刷新统计"""
+        stats = dict(self._stats)
+        if self._flusher:
+            stats.update(self._flusher.get_stats())
+        return stats
+    
+    # ========== 异步刷新 ==========
+    
+    def start_async(self) -> None:
+        """启动双缓冲异步刷新线程，此后 display_image 不再等待设备传输"""
+        if self._flusher is None:
+            self._flusher = FrameFlusher(self, self._logger)
+            self._flusher.start()
+    
+    def stop_async(self) -> None:
+        """停止异步刷新线程"""
+        if self._flusher:
+            self._flusher.stop()
+            self._flusher = None
+    
+    def wait_flush(self, timeout: float = 2.0) -> bool:
+        """等待异步刷新线程发送完已提交的帧"""
+        if self._flusher:
+            return self._flusher.wait_idle(timeout)
+        return True
+    
+    def display_image(self, image: Image.Image, regions: Optional[List[Region]] = None) -> None:
+        """
+        在显示器上显示图像
+        
+        Args:
+            image: 页面图像
+            regions: 可选的变化区域（闭区间矩形），须覆盖与同一页面上一次提交的图像
+                     之间所有不同的像素（如 WidgetPage.dirty_regions）；提供时只在其中比对。
+                     屏幕被其他途径改写（滑动、动画、清屏、亮度变化）后自动退回整帧比对
+        """
+        if not self.is_ready():
+            return
+        
+        if self._flusher:
+            self._flusher.submit(image, regions)
+        else:
+            self.flush_frame(self.image_to_rgb565_array(image), regions)
+    
+    def display_frame(self, frame: np.ndarray, regions: Optional[List[Region]] = None) -> None:
+        """
+        显示页面直接合成的大端序 RGB565 帧（见 screen.ui.compositor），不经过 RGB888 转换
+        
+        Args:
+            frame: RGB565 帧 (H, W)，提交后调用方可以继续修改
+            regions: 同 display_image
+        """
+        if not self.is_ready():
+            return
+        
+        if self._flusher:
+            self._flusher.submit_frame(frame, regions)
+        else:
+            # 亮度为 1.0 时直接发送；屏幕当前内容保存的是副本，不受调用方后续修改影响
+            self.flush_frame(self.prepare_frame(frame), regions)
+    
+    def prepare_frame(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """对 RGB565 帧应用亮度系数（省略 out 且亮度为 1.0 时原样返回）"""
+        return self._converter.scale_frame(frame, out)
+    
+    def flush_frame(self, frame: np.ndarray, hint: Optional[List[Region]] = None) -> None:
+        """发送一帧，失败时尝试重新初始化显示器"""
+        try:
+            self.send_frame(frame, hint)
+        except Exception as e:
+            self._log('error', f"显示图像失败: {e}")
+            self.invalidate()
+            self._recover()
+    
+    def clear_display(self) -> None:
+        """清空显示器"""
+        if not self.is_ready():
+            return
+        with self._io_lock:
+            self._clear_display()
+    
+    def _clear_display(self) -> None:
+        """清屏流程（调用方持有设备锁）"""
+        try:
+            # 发送全黑数据
+            black = np.zeros((self.height, self.width), dtype=">u2")
+            self.write_region(black, 0, 0, self.width - 1, self.height - 1)
+            self._end_frame()
+            self._remember_frame(black)
+            self._last_fingerprint = None
+            self._hint_valid = False
+        except Exception as e:
+            self._log('error', f"清空显示器失败: {e}")
+    
+    def close(self) -> None:
+        """停止刷新并释放GPIO与共享内存帧导出"""
+        self.stop_async()
+        self._ready = False
+        self._gpio.close()
+        if self._export is not None:
+            # 先释放对共享内存的引用，否则无法解除映射
+            self.invalidate()
+            self._export.close()
+            self._export = None
+
+
+# ST7789 COLMOD 参数：65K 色 16 位 / 4K 色 12 位
+COLMOD = {"rgb565": 0x55, "rgb444": 0x53}
+
+
+class DisplayDriver(DisplayBackend):
+    """ST7789 显示器驱动类"""
+    
+    name = "st7789"
+    supports_hardware_scroll = True
+    pixel_formats = tuple(COLMOD)
+    
+    def __init__(self, config=None, logger=None, spi=None):
+        """
+        初始化显示驱动
+        
+        Args:
+            config: 配置对象
+            logger: 日志记录器
+            spi: 可选的 SpiDev 兼容对象（如 MockSpi），省略时打开真实设备
+        """
+        super().__init__(config, logger)
+        self._spi: Optional[SpiTransport] = None
+        self._spi_device = spi
+        
+        # 从配置读取参数，或使用默认值
+        if config:
+            self.dc_pin = config.get("hardware.display.dc_pin", "75")
+            self.rst_pin = config.get("hardware.display.rst_pin", "79")
+            self.cs_pin = config.get("hardware.display.cs_pin", "233")
+            self.spi_bus = config.get("hardware.spi.bus", 1)
+            self.spi_device = config.get("hardware.spi.device", 0)
+            self.spi_speed = config.get("hardware.spi.max_speed", 62500000)
+            self.spi_chunk_size = config.get("hardware.spi.chunk_size", 0)
+        else:
+            # 默认值
+            self.dc_pin = "75"
+            self.rst_pin = "79"
+            self.cs_pin = "233"
+            self.spi_bus = 1
+            self.spi_device = 0
+            self.spi_speed = 62500000
+            self.spi_chunk_size = 0
+    
     # ========== SPI 操作 ==========
     
     def init_spi(self) -> bool:
         """初始化SPI"""
         try:
-            import spidev
-            self._spi = spidev.SpiDev()
-            self._spi.open(self.spi_bus, self.spi_device)
-            self._spi.max_speed_hz = self.spi_speed
-            self._spi.mode = 0
-            self._log('info', "SPI初始化成功")
+            self._spi = SpiTransport(self.spi_bus, self.spi_device, self.spi_speed,
+                                     self.spi_chunk_size, self._spi_device, self._logger)
+            self._spi.open()
+            self._log('info', f"SPI初始化成功 (bufsiz={self._spi.bufsiz}, 分块={self._spi.chunk_size})")
             return True
         except Exception as e:
             self._log('error', f"SPI初始化失败: {e}")
@@ -131,8 +660,12 @@ class DisplayDriver:
     
     # ========== 显示器初始化 ==========
     
-    def init_display(self) -> bool:
-        """初始化显示器"""
+    def is_ready(self) -> bool:
+        """SPI 已打开即可发送"""
+        return self._spi is not None
+    
+    def _init_display(self) -> bool:
+        """显示器初始化流程"""
         try:
             # 初始化按键GPIO
             self.init_button_gpio()
@@ -160,10 +693,17 @@ class DisplayDriver:
             time.sleep(0.1)
             self.write_cmd(0x36)  # Memory access control
             self.write_data(0x28)
-            self.write_cmd(0x3A)  # Pixel format
-            self.write_data(0x55)  # 16-bit RGB565
+            self._apply_pixel_format()
             self.write_cmd(0x29)  # Display on
             
+            # 复位后面板处于正常显示状态，重新初始化时恢复之前的电源状态
+            if self.power_state != "normal":
+                self._apply_power_state("normal")
+            
+            # 恢复整屏滚动区域与零偏移（滑动过程中重新初始化时需要）
+            self.set_scroll_area(0, self.width, 0)
+            self.set_scroll_start(0)
+            
             self._log('info', "显示器初始化成功")
             import sys
             sys.stdout.flush()
@@ -173,96 +713,112 @@ class DisplayDriver:
             self._log('error', f"显示器初始化失败: {e}")
             return False
     
-    # ========== 图像处理 ==========
+    def _recover(self) -> None:
+        """关闭 SPI 后重新初始化显示器"""
+        try:
+            if self._spi:
+                self._spi.close()
+            time.sleep(0.1)
+            self.init_display()
+        except:
+            pass
     
-    @staticmethod
-    def rgb_to_rgb565(r: int, g: int, b: int) -> int:
-        """将RGB888转换为RGB565格式"""
-        return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    def _apply_pixel_format(self) -> None:
+        """设置接口像素格式 (COLMOD)"""
+        self.write_cmd(0x3A)  # Interface pixel format
+        self.write_data(COLMOD[self.pixel_format])
     
-    def image_to_rgb565_bytes(self, image: Image.Image) -> bytes:
-        """使用 NumPy 向量化操作将 PIL 图像转换为 RGB565 字节数组"""
-        # 确保图像为 RGB 模式并转换为 numpy 数组
-        img_array = np.array(image.convert("RGB"), dtype=np.uint16)
-        
-        # 提取 R, G, B 通道
-        r = img_array[:, :, 0]
-        g = img_array[:, :, 1]
-        b = img_array[:, :, 2]
+    def _apply_power_state(self, previous: str) -> None:
+        """
+        切换电源状态：先退出原状态，再进入新状态
         
-        # 转换为 RGB565
-        rgb565 = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+        SLPOUT 后需等待 120ms 才能再次 SLPIN，SLPIN 后需等待 5ms 才能发送下一条命令。
+        """
+        state = self.power_state
+        if previous == "sleep":
+            self.write_cmd(0x11)  # Sleep out
+            time.sleep(0.12)
+        elif previous == "idle":
+            self.write_cmd(0x38)  # Idle mode off
+        elif previous == "partial" and state != "partial":
+            self.write_cmd(0x13)  # Normal display mode on
         
-        # 将 16 位整数数组转换为大端序字节
-        return rgb565.byteswap().tobytes()
+        if state == "sleep":
+            self.write_cmd(0x10)  # Sleep in
+            time.sleep(0.005)
+        elif state == "idle":
+            self.write_cmd(0x39)  # Idle mode on（8 色）
+        elif state == "partial":
+            # 横屏时 PTLAR 的行地址即屏幕列
+            start, end = self.partial_columns
+            self.write_cmd(0x30)  # Partial area
+            self.write_data([start >> 8, start & 0xFF, end >> 8, end & 0xFF])
+            self.write_cmd(0x12)  # Partial display mode on
     
-    def display_image(self, image: Image.Image) -> None:
-        """在显示器上显示图像"""
-        if self._spi is None:
-            return
+    # ========== 显存窗口 ==========
+    
+    def set_window(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """设置显存写入窗口（闭区间）并进入写显存状态"""
+        self.write_cmd(0x2A)  # Column address set
+        self.write_data([x0 >> 8, x0 & 0xFF, x1 >> 8, x1 & 0xFF])
+        self.write_cmd(0x2B)  # Row address set
+        self.write_data([y0 >> 8, y0 & 0xFF, y1 >> 8, y1 & 0xFF])
+        self.write_cmd(0x2C)  # Memory write
+    
+    def set_scroll_area(self, top_fixed: int, scroll: int, bottom_fixed: int) -> None:
+        """
+        定义滚动区域 (VSCRDEF)
         
-        try:
-            # 设置显示窗口
-            self.write_cmd(0x2A)  # Column address set
-            self.write_data([0x00, 0x00, 0x01, 0x3F])
-            self.write_cmd(0x2B)  # Row address set
-            self.write_data([0x00, 0x00, 0x00, 0xEF])
-            self.write_cmd(0x2C)  # Memory write
-            
-            self.gpio_set(self.cs_pin, 0)
-            self.gpio_set(self.dc_pin, 1)
-            
-            # 转换并发送像素数据
-            pixels = self.image_to_rgb565_bytes(image)
-            self._spi.writebytes2(pixels)
-            
-            self.gpio_set(self.cs_pin, 1)
-        except Exception as e:
-            self._log('error', f"显示图像失败: {e}")
-            # 尝试重新初始化SPI
-            try:
-                if self._spi:
-                    self._spi.close()
-                time.sleep(0.1)
-                self.init_display()
-            except:
-                pass
+        ST7789 的滚动沿显存行（栅极）方向，横屏 (MADCTL MV=1) 时对应屏幕的 x 方向，
+        三段之和须为 320。
+        """
+        self.write_cmd(0x33)  # Vertical scrolling definition
+        self.write_data([top_fixed >> 8, top_fixed & 0xFF, scroll >> 8, scroll & 0xFF,
+                         bottom_fixed >> 8, bottom_fixed & 0xFF])
     
-    def clear_display(self) -> None:
-        """清空显示器"""
-        if self._spi is None:
-            return
-        try:
-            self.write_cmd(0x2C)  # Memory write
-            self.gpio_set(self.cs_pin, 0)
-            self.gpio_set(self.dc_pin, 1)
-            # 发送全黑数据
-            self._spi.writebytes2(bytearray(self.width * self.height * 2))
-            self.gpio_set(self.cs_pin, 1)
-        except Exception as e:
-            self._log('error', f"清空显示器失败: {e}")
+    def set_scroll_start(self, line: int) -> None:
+        """设置滚动起始行 (VSCSAD)：屏幕第 0 列显示显存第 line 列"""
+        self.write_cmd(0x37)  # Vertical scroll start address
+        self.write_data([line >> 8, line & 0xFF])
+    
+    def write_pixels(self, pixels) -> None:
+        """向当前窗口写入像素数据"""
+        self.gpio_set(self.cs_pin, 0)
+        self.gpio_set(self.dc_pin, 1)
+        self._spi.writebytes2(pixels)
+        self.gpio_set(self.cs_pin, 1)
+    
+    def get_stats(self) -> dict:
+        """获取刷新统计（含 SPI 传输统计）"""
+        stats = super().get_stats()
+        if isinstance(self._spi, SpiTransport):
+            stats.update(self._spi.get_stats())
+        return stats
     
     def close(self) -> None:
-        """关闭SPI连接"""
+        """关闭SPI连接并释放GPIO"""
+        self.stop_async()
         if self._spi:
             try:
                 self._spi.close()
                 self._log('info', "SPI连接已关闭")
             except:
                 pass
+        super().close()
 
 
 # 向后兼容的全局函数（供 main.py 过渡使用）
-_global_driver: Optional[DisplayDriver] = None
+_global_driver: Optional[DisplayBackend] = None
 
 
-def init_global_driver(config=None, logger=None) -> DisplayDriver:
-    """初始化全局驱动实例"""
+def init_global_driver(config=None, logger=None) -> DisplayBackend:
+    """初始化全局驱动实例（按 display.backend 选择输出后端）"""
     global _global_driver
-    _global_driver = DisplayDriver(config, logger)
+    from .backends import create_display_backend
+    _global_driver = create_display_backend(config, logger)
     return _global_driver
 
 
-def get_global_driver() -> Optional[DisplayDriver]:
+def get_global_driver() -> Optional[DisplayBackend]:
     """获取全局驱动实例"""
     return _global_driver
@@ -0,0 +1,138 @@
+"""异步刷新线程模块
+
+渲染线程把帧转换到后缓冲区，刷新线程把前缓冲区通过 SPI 发出，
+两者通过交换缓冲区下标交接，使页面渲染与 SPI 传输重叠进行。
+"""
+import threading
+import numpy as np
+from typing import Any, Callable, List, Optional
+from PIL import Image
+
+
+class FrameFlusher:
+    """双缓冲异步刷新线程"""
+    
+    def __init__(self, driver: Any, logger=None):
+        """
+        初始化刷新线程
+        
+        Args:
+            driver: 显示驱动（需提供 width/height/image_to_rgb565_array/prepare_frame/flush_frame）
+            logger: 日志记录器
+        """
+        self._driver = driver
+        self._logger = logger
+        
+        # 两块预分配的 RGB565 缓冲区
+        shape = (driver.height, driver.width)
+        self._buffers = [np.zeros(shape, dtype=">u2"), np.zeros(shape, dtype=">u2")]
+        self._back = 0  # 渲染线程写入的缓冲区下标
+        self._pending = False  # 后缓冲区是否有待发送的完整帧
+        self._pending_regions = None  # 待发送帧的变化区域提示（None 为整帧比对）
+        self._busy = False  # 刷新线程是否正在发送
+        
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self.frames_submitted = 0
+        self.frames_flushed = 0
+        self.frames_dropped = 0
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    def start(self) -> None:
+        """启动刷新线程"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="FrameFlusher")
+        self._thread.start()
+        self._log('info', "异步刷新线程已启动")
+    
+    def stop(self) -> None:
+        """停止刷新线程"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._log('info', "异步刷新线程已停止")
+    
+    def submit(self, image: Image.Image, regions: Optional[List[tuple]] = None) -> None:
+        """
+        提交一帧（渲染线程调用，不等待 SPI 传输）
+        
+        若上一帧尚未被刷新线程取走，则丢弃上一帧（drop-oldest），
+        被丢弃帧的变化区域并入本帧，保证提示仍覆盖屏幕上的全部差异。
+        """
+        self._submit(lambda back: self._driver.image_to_rgb565_array(image, out=back), regions)
+    
+    def submit_frame(self, frame: np.ndarray, regions: Optional[List[tuple]] = None) -> None:
+        """提交一帧已合成的 RGB565 数据（复制到后缓冲区，同时应用亮度），其余同 submit"""
+        self._submit(lambda back: self._driver.prepare_frame(frame, out=back), regions)
+    
+    def _submit(self, fill: Callable[[np.ndarray], Any], regions: Optional[List[tuple]]) -> None:
+        """取得后缓冲区，由 fill 写入像素后标记为待发送"""
+        with self._cond:
+            if self._pending:
+                self._pending = False
+                self.frames_dropped += 1
+                if regions is not None and self._pending_regions is not None:
+                    regions = self._pending_regions + list(regions)
+                else:
+                    regions = None
+            back = self._buffers[self._back]
+        
+        # 未置 pending 前刷新线程不会交换缓冲区，可以无锁写入后缓冲区
+        fill(back)
+        
+        with self._cond:
+            self._pending = True
+            self._pending_regions = list(regions) if regions is not None else None
+            self.frames_submitted += 1
+            self._cond.notify()
+    
+    def _run(self) -> None:
+        """刷新线程主循环"""
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                # 交换前后缓冲区
+                front = self._buffers[self._back]
+                regions = self._pending_regions
+                self._back ^= 1
+                self._pending = False
+                self._busy = True
+            
+            try:
+                self._driver.flush_frame(front, regions)
+                self.frames_flushed += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+    
+    def wait_idle(self, timeout: float = 2.0) -> bool:
+        """
+        等待已提交的帧全部发送完毕
+        
+        Returns:
+            超时前是否已空闲
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+    
+    def get_stats(self) -> dict:
+        """获取刷新统计"""
+        return {
+            "frames_submitted": self.frames_submitted,
+            "frames_flushed": self.frames_flushed,
+            "frames_dropped": self.frames_dropped,
+        }
@@ -0,0 +1,157 @@
+"""共享内存帧导出模块
+
+把最近一次发送到屏幕的帧发布到 /dev/shm 下的 mmap 文件，其他线程或进程
+（Web 截图、录制器、外部工具）直接映射读取，不需要重新渲染页面，也不会
+阻塞渲染线程。
+
+文件布局（小端序头部 + 大端序 RGB565 像素）：
+
+    偏移  类型     字段
+    0     4s       魔数 b"TFTF"
+    4     uint16   版本
+    6     uint16   头部长度（像素数据起始偏移）
+    8     uint64   序号（顺序锁：奇数表示正在写入）
+    16    float64  时间戳（time.time()）
+    24    int32    页面序号（-1 表示未知）
+    28    uint16   宽度
+    30    uint16   高度
+    64    ...      像素数据，宽 x 高 x 2 字节
+
+写入方不加锁：先把序号加一变为奇数，写完像素和元数据后再加一变为偶数。
+读取方在复制前后各读一次序号，两次相同且为偶数即得到一致的画面。
+"""
+import os
+import mmap
+import time
+import struct
+import numpy as np
+from typing import Optional, Tuple
+
+MAGIC = b"TFTF"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sHHQdiHH")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+_META = struct.Struct("<di")
+_META_OFFSET = 16
+
+
+class FrameExport:
+    """帧发布端：帧缓冲直接位于共享内存中"""
+    
+    def __init__(self, path: str, width: int, height: int, logger=None):
+        """
+        创建（或截断重建）共享内存帧文件
+        
+        Args:
+            path: 文件路径，通常位于 /dev/shm
+            width: 帧宽度
+            height: 帧高度
+            logger: 日志记录器
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self._logger = logger
+        
+        size = HEADER_SIZE + width * height * 2
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        
+        self.seq = 0
+        _HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, HEADER_SIZE, self.seq, 0.0, -1, width, height)
+        # 共享内存中的帧缓冲，显示后端把它当作“屏幕当前内容”直接使用
+        self.frame = np.ndarray((height, width), dtype=">u2", buffer=self._mmap, offset=HEADER_SIZE)
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    def publish(self, frame: Optional[np.ndarray], page: int = -1) -> None:
+        """
+        发布一帧
+        
+        Args:
+            frame: RGB565 帧；为 None 或就是 self.frame 时只更新元数据
+            page: 页面序号
+        """
+        self.seq += 1
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self.seq)
+        if frame is not None and frame is not self.frame:
+            np.copyto(self.frame, frame)
+        _META.pack_into(self._mmap, _META_OFFSET, time.time(), page)
+        self.seq += 1
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self.seq)
+    
+    def close(self) -> None:
+        """解除映射（文件保留，读取方仍可看到最后一帧）"""
+        self.frame = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class FrameReader:
+    """帧读取端（只读映射，不影响写入方）"""
+    
+    def __init__(self, path: str):
+        """
+        打开共享内存帧文件
+        
+        Raises:
+            ValueError: 文件不是帧导出格式
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size, _, _, _, width, height = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} 不是帧导出文件")
+        self.width = width
+        self.height = height
+        # 零拷贝视图：内容随写入方变化，需配合 seq 判断一致性
+        self.view = np.ndarray((height, width), dtype=">u2", buffer=self._mmap, offset=header_size)
+        self._out = np.empty((height, width), dtype=">u2")
+    
+    @property
+    def seq(self) -> int:
+        """当前序号（偶数为稳定状态）"""
+        return _SEQ.unpack_from(self._mmap, _SEQ_OFFSET)[0]
+    
+    def read(self, out: Optional[np.ndarray] = None, retries: int = 100) -> Optional[Tuple[np.ndarray, int, float, int]]:
+        """
+        读取一致的一帧
+        
+        Args:
+            out: 可选的输出数组；省略时写入读取器自带的缓冲区，下次调用会被覆盖
+            retries: 与写入冲突时的重试次数
+        
+        Returns:
+            (帧, 序号, 时间戳, 页面序号)；尚无帧或多次重试仍冲突时返回 None
+        """
+        if out is None:
+            out = self._out
+        for _ in range(retries):
+            before = self.seq
+            if before & 1:
+                time.sleep(0.0005)
+                continue
+            np.copyto(out, self.view)
+            timestamp, page = _META.unpack_from(self._mmap, _META_OFFSET)
+            if self.seq == before:
+                return (out, before, timestamp, page) if before else None
+        return None
+    
+    def close(self) -> None:
+        """解除映射"""
+        self.view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
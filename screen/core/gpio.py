@@ -0,0 +1,310 @@
+"""GPIO 后端模块
+
+提供可替换的 GPIO 实现：
+- SysfsGPIO: 常驻打开 /sys/class/gpio/gpioN/value，翻转引脚只需一次 pwrite
+- CdevGPIO: GPIO 字符设备 (/dev/gpiochipN) 行请求
+- MockGPIO: 纯内存实现，用于开发机和测试
+"""
+import os
+import time
+import ctypes
+from typing import Dict, Optional, Tuple
+
+
+class GPIOBackend:
+    """GPIO 后端基类"""
+    
+    name = "base"
+    
+    def __init__(self, logger=None):
+        """
+        初始化 GPIO 后端
+        
+        Args:
+            logger: 日志记录器
+        """
+        self._logger = logger
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+    
+    def setup(self, pin: str, direction: str = "out") -> bool:
+        """配置引脚方向（"in" / "out"）"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement setup()")
+    
+    def write(self, pin: str, value: int) -> None:
+        """设置输出引脚电平"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement write()")
+    
+    def read(self, pin: str) -> int:
+        """读取引脚电平"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement read()")
+    
+    def close(self) -> None:
+        """释放所有引脚"""
+        pass
+
+
+class SysfsGPIO(GPIOBackend):
+    """sysfs GPIO 后端（常驻文件描述符）"""
+    
+    name = "sysfs"
+    
+    def __init__(self, root: str = "/sys/class/gpio", logger=None):
+        super().__init__(logger)
+        self._root = root
+        self._fds: Dict[str, int] = {}
+    
+    def setup(self, pin: str, direction: str = "out") -> bool:
+        try:
+            gpio_path = f"{self._root}/gpio{pin}"
+            if not os.path.exists(gpio_path):
+                with open(f"{self._root}/export", "w") as f:
+                    f.write(str(pin))
+                # 等待 udev 设置权限
+                time.sleep(0.1)
+            with open(f"{gpio_path}/direction", "w") as f:
+                f.write(direction)
+            
+            if pin in self._fds:
+                os.close(self._fds.pop(pin))
+            self._fds[pin] = os.open(f"{gpio_path}/value", os.O_RDWR)
+            return True
+        except Exception as e:
+            self._log('error', f"GPIO初始化失败 pin={pin}: {e}")
+            return False
+    
+    def write(self, pin: str, value: int) -> None:
+        fd = self._fds.get(pin)
+        if fd is not None:
+            os.pwrite(fd, b"1" if value else b"0", 0)
+    
+    def read(self, pin: str) -> int:
+        fd = self._fds.get(pin)
+        if fd is None:
+            return 1
+        return 1 if os.pread(fd, 1, 0) == b"1" else 0
+    
+    def close(self) -> None:
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+
+
+# GPIO 字符设备 v1 ABI (linux/gpio.h)
+_GPIOHANDLES_MAX = 64
+_GPIOHANDLE_REQUEST_INPUT = 1 << 0
+_GPIOHANDLE_REQUEST_OUTPUT = 1 << 1
+
+
+class _GPIOHandleRequest(ctypes.Structure):
+    _fields_ = [
+        ("lineoffsets", ctypes.c_uint32 * _GPIOHANDLES_MAX),
+        ("flags", ctypes.c_uint32),
+        ("default_values", ctypes.c_uint8 * _GPIOHANDLES_MAX),
+        ("consumer_label", ctypes.c_char * 32),
+        ("lines", ctypes.c_uint32),
+        ("fd", ctypes.c_int),
+    ]
+
+
+class _GPIOChipInfo(ctypes.Structure):
+    _fields_ = [
+        ("name", ctypes.c_char * 32),
+        ("label", ctypes.c_char * 32),
+        ("lines", ctypes.c_uint32),
+    ]
+
+
+def _iowr(nr: int, size: int) -> int:
+    """计算 _IOWR(0xB4, nr, size) 请求码"""
+    return (3 << 30) | (size << 16) | (0xB4 << 8) | nr
+
+
+def _ior(nr: int, size: int) -> int:
+    """计算 _IOR(0xB4, nr, size) 请求码"""
+    return (2 << 30) | (size << 16) | (0xB4 << 8) | nr
+
+
+_GPIO_GET_CHIPINFO_IOCTL = _ior(0x01, ctypes.sizeof(_GPIOChipInfo))
+_GPIO_GET_LINEHANDLE_IOCTL = _iowr(0x03, ctypes.sizeof(_GPIOHandleRequest))
+_GPIOHANDLE_GET_LINE_VALUES_IOCTL = _iowr(0x08, _GPIOHANDLES_MAX)
+_GPIOHANDLE_SET_LINE_VALUES_IOCTL = _iowr(0x09, _GPIOHANDLES_MAX)
+
+
+class CdevGPIO(GPIOBackend):
+    """GPIO 字符设备后端，每个引脚持有一个行句柄"""
+    
+    name = "cdev"
+    
+    _HIGH = bytes([1]) + bytes(_GPIOHANDLES_MAX - 1)
+    _LOW = bytes(_GPIOHANDLES_MAX)
+    
+    def __init__(self, chip: str = "/dev/gpiochip0", consumer: str = "tftscreen",
+                 sysfs_root: str = "/sys/class/gpio", logger=None):
+        super().__init__(logger)
+        self._chip = chip
+        self._consumer = consumer.encode()[:31]
+        self._sysfs_root = sysfs_root
+        self._base: Optional[int] = None
+        self._handles: Dict[str, int] = {}
+    
+    def _chip_info(self) -> Tuple[str, int]:
+        """读取芯片标签与行数"""
+        import fcntl
+        
+        info = _GPIOChipInfo()
+        chip_fd = os.open(self._chip, os.O_RDWR)
+        try:
+            fcntl.ioctl(chip_fd, _GPIO_GET_CHIPINFO_IOCTL, info)
+        finally:
+            os.close(chip_fd)
+        return info.label.decode(errors="replace"), info.lines
+    
+    def chip_base(self) -> int:
+        """
+        芯片在 sysfs 全局编号中的起始编号
+        
+        在 sysfs 的 gpiochip<base> 目录中查找 label 与行数都与本芯片一致的一项；
+        内核未启用 sysfs GPIO 或找不到时为 0。
+        """
+        if self._base is None:
+            label, lines = self._chip_info()
+            self._base = 0
+            try:
+                entries = sorted(os.listdir(self._sysfs_root))
+            except OSError:
+                entries = []
+            for entry in entries:
+                if not entry.startswith("gpiochip"):
+                    continue
+                path = os.path.join(self._sysfs_root, entry)
+                try:
+                    with open(os.path.join(path, "label")) as f:
+                        entry_label = f.read().strip()
+                    with open(os.path.join(path, "ngpio")) as f:
+                        entry_lines = int(f.read())
+                    if entry_label == label and entry_lines == lines:
+                        with open(os.path.join(path, "base")) as f:
+                            self._base = int(f.read())
+                        break
+                except (OSError, ValueError):
+                    continue
+        return self._base
+    
+    def line_offset(self, pin: str) -> int:
+        """
+        引脚编号转换为芯片上的行偏移
+        
+        配置中的引脚沿用 sysfs 全局编号（起始编号 + 行偏移）。较新的内核上起始编号
+        不为 0（如树莓派上的 512），需要减去；小于起始编号的值视为已经是行偏移。
+        """
+        number = int(pin)
+        base = self.chip_base()
+        return number - base if number >= base else number
+    
+    def setup(self, pin: str, direction: str = "out") -> bool:
+        try:
+            import fcntl
+            
+            if pin in self._handles:
+                os.close(self._handles.pop(pin))
+            
+            req = _GPIOHandleRequest()
+            req.lineoffsets[0] = self.line_offset(pin)
+            req.flags = _GPIOHANDLE_REQUEST_OUTPUT if direction == "out" else _GPIOHANDLE_REQUEST_INPUT
+            req.consumer_label = self._consumer
+            req.lines = 1
+            
+            chip_fd = os.open(self._chip, os.O_RDWR)
+            try:
+                fcntl.ioctl(chip_fd, _GPIO_GET_LINEHANDLE_IOCTL, req)
+            finally:
+                os.close(chip_fd)
+            
+            self._handles[pin] = req.fd
+            return True
+        except Exception as e:
+            self._log('error', f"GPIO初始化失败 pin={pin} chip={self._chip}: {e}")
+            return False
+    
+    def write(self, pin: str, value: int) -> None:
+        fd = self._handles.get(pin)
+        if fd is not None:
+            import fcntl
+            fcntl.ioctl(fd, _GPIOHANDLE_SET_LINE_VALUES_IOCTL, self._HIGH if value else self._LOW)
+    
+    def read(self, pin: str) -> int:
+        fd = self._handles.get(pin)
+        if fd is None:
+            return 1
+        import fcntl
+        data = fcntl.ioctl(fd, _GPIOHANDLE_GET_LINE_VALUES_IOCTL, self._LOW)
+        return data[0]
+    
+    def close(self) -> None:
+        for fd in self._handles.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._handles.clear()
+
+
+class MockGPIO(GPIOBackend):
+    """内存模拟 GPIO 后端"""
+    
+    name = "mock"
+    
+    def __init__(self, logger=None):
+        super().__init__(logger)
+        self.directions: Dict[str, str] = {}
+        self.values: Dict[str, int] = {}
+        self.write_count = 0
+    
+    def setup(self, pin: str, direction: str = "out") -> bool:
+        self.directions[pin] = direction
+        # 输入默认上拉（按键未按下）
+        self.values.setdefault(pin, 1 if direction == "in" else 0)
+        return True
+    
+    def write(self, pin: str, value: int) -> None:
+        self.values[pin] = 1 if value else 0
+        self.write_count += 1
+    
+    def read(self, pin: str) -> int:
+        return self.values.get(pin, 1)
+    
+    def set_input(self, pin: str, value: int) -> None:
+        """模拟外部输入电平"""
+        self.values[pin] = 1 if value else 0
+
+
+def create_gpio_backend(config=None, logger=None) -> GPIOBackend:
+    """
+    根据配置创建 GPIO 后端
+    
+    Args:
+        config: 配置对象（读取 hardware.gpio.*）
+        logger: 日志记录器
+    
+    Returns:
+        GPIOBackend 实例
+    """
+    name = config.get("hardware.gpio.backend", "sysfs") if config else "sysfs"
+    
+    if name == "cdev":
+        chip = config.get("hardware.gpio.chip", "/dev/gpiochip0")
+        return CdevGPIO(chip, logger=logger)
+    if name == "mock":
+        return MockGPIO(logger)
+    if name != "sysfs" and logger:
+        logger.warning(f"未知的 GPIO 后端 {name}，使用 sysfs")
+    return SysfsGPIO(logger=logger)
@@ -0,0 +1,140 @@
+"""面板电源状态模块
+
+按时间表切换 ST7789 的电源状态，并告知主循环该状态下的重绘节奏：
+- normal: 正常显示 (NORON)
+- idle: 8 色空闲模式 (IDMON)，降低面板功耗
+- partial: 局部显示 (PTLAR + PTLON)，只点亮一段，其余区域不驱动
+- sleep: 睡眠 (SLPIN)，停止扫描，主循环不再渲染
+
+横屏 (MADCTL MV=1) 时 PTLAR 的行地址对应屏幕的列，因此局部显示区域是
+一个竖条 (partial_columns)，而不是横带。
+"""
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+POWER_STATES = ("normal", "idle", "partial", "sleep")
+
+
+def _parse_minutes(value: str) -> int:
+    """将 "HH:MM" 转换为当天的分钟数"""
+    hour, minute = str(value).split(":")
+    return int(hour) * 60 + int(minute)
+
+
+class PowerManager:
+    """按时间表驱动显示后端的电源状态"""
+    
+    def __init__(self, driver, config=None, logger=None):
+        """
+        初始化电源管理器
+        
+        Args:
+            driver: 显示后端（DisplayBackend）
+            config: 配置对象（读取 display.power.*）
+            logger: 日志记录器
+        """
+        self._driver = driver
+        self._logger = logger
+        
+        if config:
+            self.enabled = config.get("display.power.enabled", False)
+            schedule = config.get("display.power.schedule", []) or []
+            columns = config.get("display.power.partial_columns", [100, 219])
+            self.wake_seconds = config.get("display.power.wake_seconds", 30)
+            self.sleep_poll = config.get("display.power.sleep_poll", 1.0)
+            self.redraw_intervals = config.get("display.power.redraw_interval", {}) or {}
+        else:
+            self.enabled = False
+            schedule = []
+            columns = [100, 219]
+            self.wake_seconds = 30
+            self.sleep_poll = 1.0
+            self.redraw_intervals = {}
+        
+        self.partial_columns: Tuple[int, int] = (int(columns[0]), int(columns[1]))
+        self.schedule: List[Tuple[int, int, str]] = []
+        for entry in schedule:
+            try:
+                state = entry.get("state", "normal")
+                if state not in POWER_STATES:
+                    raise ValueError(f"未知的电源状态 {state}")
+                self.schedule.append((_parse_minutes(entry["start"]), _parse_minutes(entry["end"]), state))
+            except Exception as e:
+                self._log('warning', f"忽略无效的电源时间表项 {entry}: {e}")
+        
+        self._wake_until = 0.0
+        self._state_since = time.time()
+        self.transitions = 0
+        self.state_time: Dict[str, float] = {state: 0.0 for state in POWER_STATES}
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    @property
+    def state(self) -> str:
+        """当前电源状态"""
+        return self._driver.power_state
+    
+    def scheduled_state(self, now: Optional[datetime] = None) -> str:
+        """
+        时间表在 now 时刻要求的状态
+        
+        时间段为左闭右开，结束早于开始时表示跨越午夜；多段重叠时取第一段。
+        """
+        if not self.enabled:
+            return "normal"
+        now = now or datetime.now()
+        minutes = now.hour * 60 + now.minute
+        for start, end, state in self.schedule:
+            if start <= end:
+                active = start <= minutes < end
+            else:
+                active = minutes >= start or minutes < end
+            if active:
+                return state
+        return "normal"
+    
+    def wake(self) -> None:
+        """用户操作（切页等）后临时恢复正常显示 wake_seconds 秒"""
+        self._wake_until = time.time() + self.wake_seconds
+    
+    def update(self, now: Optional[datetime] = None) -> str:
+        """
+        按时间表切换电源状态
+        
+        Returns:
+            切换后的状态
+        """
+        target = "normal" if time.time() < self._wake_until else self.scheduled_state(now)
+        current = self._driver.power_state
+        if target != current:
+            if self._driver.set_power_state(target, self.partial_columns):
+                switched_at = time.time()
+                self.state_time[current] += switched_at - self._state_since
+                self._state_since = switched_at
+                self.transitions += 1
+                self._log('info', f"面板电源状态: {current} -> {target}")
+        return self._driver.power_state
+    
+    def redraw_interval(self, default: float) -> Optional[float]:
+        """
+        当前状态下的页面重绘间隔
+        
+        Returns:
+            重绘间隔（秒），睡眠时返回 None 表示不重绘
+        """
+        state = self._driver.power_state
+        if state == "sleep":
+            return None
+        return self.redraw_intervals.get(state, default)
+    
+    def get_stats(self) -> dict:
+        """获取各状态累计时长（秒）与切换次数"""
+        state_time = dict(self.state_time)
+        state_time[self._driver.power_state] += time.time() - self._state_since
+        stats = {f"power_{state}_s": seconds for state, seconds in state_time.items()}
+        stats["power_transitions"] = self.transitions
+        return stats
@@ -0,0 +1,239 @@
+"""帧录制与回放模块
+
+把屏幕实际显示过的帧写入紧凑的录制文件，用于长时间的性能分析与回归比对，
+并可把录制内容按原速或最快速度推送给任意显示后端。
+
+文件格式（小端序）：
+- 文件头 <4sHHHH>: 魔数 b"TFTR"、版本、宽度、高度、关键帧间隔
+- 每帧记录头 <BdiI>: 类型（0 关键帧 / 1 增量帧）、时间戳、页面序号、负载长度
+- 关键帧负载为像素的游程编码；增量帧负载为与上一帧异或后的游程编码，
+  未变化的像素异或为 0，整段只占一个游程
+- 游程为 <u4 长度 + <u2 取值，共 6 字节；像素按原始字节（大端序 RGB565）参与运算
+"""
+import time
+import struct
+import numpy as np
+from typing import Iterator, Optional, Tuple
+
+MAGIC = b"TFTR"
+VERSION = 1
+KEYFRAME = 0
+DELTA = 1
+_FILE_HEADER = struct.Struct("<4sHHHH")
+_RECORD = struct.Struct("<BdiI")
+RUN_DTYPE = np.dtype([("count", "<u4"), ("value", "<u2")])
+
+
+def rle_encode(words: np.ndarray) -> bytes:
+    """
+    游程编码（向量化）
+    
+    Args:
+        words: 一维 uint16 数组
+    
+    Returns:
+        游程序列的字节
+    """
+    if words.size == 0:
+        return b""
+    starts = np.flatnonzero(words[1:] != words[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    runs = np.empty(starts.size, dtype=RUN_DTYPE)
+    runs["count"] = np.diff(np.append(starts, words.size))
+    runs["value"] = words[starts]
+    return runs.tobytes()
+
+
+def rle_decode(data: bytes, out: np.ndarray) -> np.ndarray:
+    """
+    游程解码到 out（一维 uint16 数组）
+    
+    Raises:
+        ValueError: 解码长度与 out 不一致
+    """
+    runs = np.frombuffer(data, dtype=RUN_DTYPE)
+    if int(runs["count"].sum()) != out.size:
+        raise ValueError("游程总长度与帧大小不一致")
+    out[:] = np.repeat(runs["value"], runs["count"])
+    return out
+
+
+class FrameRecorder:
+    """帧录制器：关键帧 + 异或增量帧"""
+    
+    def __init__(self, path: str, width: int, height: int, keyframe_interval: int = 300, logger=None):
+        """
+        创建录制文件
+        
+        Args:
+            path: 录制文件路径
+            width: 帧宽度
+            height: 帧高度
+            keyframe_interval: 每 N 帧写一个关键帧（回放时可从关键帧开始定位）
+            logger: 日志记录器
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._logger = logger
+        
+        self._file = open(path, "wb")
+        self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, width, height, self.keyframe_interval))
+        self._prev = np.zeros(width * height, dtype=np.uint16)
+        self._xor = np.empty(width * height, dtype=np.uint16)
+        self._since_keyframe = self.keyframe_interval
+        
+        self.frames = 0
+        self.keyframes = 0
+        self.bytes_written = _FILE_HEADER.size
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    def write(self, frame: np.ndarray, page: int = -1, timestamp: Optional[float] = None) -> None:
+        """
+        录制一帧
+        
+        Args:
+            frame: (H, W) 大端序 RGB565 数组
+            page: 页面序号
+            timestamp: 时间戳，省略时取当前时间
+        """
+        if self._file is None:
+            return
+        words = np.ascontiguousarray(frame).reshape(-1).view(np.uint16)
+        if self._since_keyframe >= self.keyframe_interval:
+            kind = KEYFRAME
+            payload = rle_encode(words)
+            self._since_keyframe = 0
+            self.keyframes += 1
+        else:
+            kind = DELTA
+            np.bitwise_xor(words, self._prev, out=self._xor)
+            payload = rle_encode(self._xor)
+        self._since_keyframe += 1
+        np.copyto(self._prev, words)
+        
+        header = _RECORD.pack(kind, time.time() if timestamp is None else timestamp, page, len(payload))
+        self._file.write(header)
+        self._file.write(payload)
+        if kind == KEYFRAME:
+            # 关键帧落盘，异常退出时最多丢失一个关键帧间隔
+            self._file.flush()
+        self.frames += 1
+        self.bytes_written += len(header) + len(payload)
+    
+    def get_stats(self) -> dict:
+        """获取录制统计（compression 为原始 RGB565 大小与文件大小之比）"""
+        raw = self.frames * self.width * self.height * 2
+        return {
+            "recorded_frames": self.frames,
+            "recorded_keyframes": self.keyframes,
+            "recorded_bytes": self.bytes_written,
+            "compression": raw / self.bytes_written if self.bytes_written else 0.0,
+        }
+    
+    def close(self) -> None:
+        """关闭录制文件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._log('info', f"录制完成: {self.path}，{self.frames} 帧，{self.bytes_written // 1024} KB")
+
+
+class FrameRecording:
+    """录制文件读取器"""
+    
+    def __init__(self, path: str):
+        """
+        打开录制文件
+        
+        Raises:
+            ValueError: 文件不是录制格式
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_FILE_HEADER.size)
+        if len(header) != _FILE_HEADER.size:
+            raise ValueError(f"{path} 不是录制文件")
+        magic, version, width, height, keyframe_interval = _FILE_HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} 不是录制文件")
+        self.width = width
+        self.height = height
+        self.keyframe_interval = keyframe_interval
+    
+    def __iter__(self) -> Iterator[Tuple[float, int, np.ndarray]]:
+        """
+        逐帧解码
+        
+        Yields:
+            (时间戳, 页面序号, 帧)；帧为复用的缓冲区，下一帧会被覆盖
+        """
+        size = self.width * self.height
+        words = np.zeros(size, dtype=np.uint16)
+        delta = np.empty(size, dtype=np.uint16)
+        frame = words.view(">u2").reshape(self.height, self.width)
+        synced = False
+        with open(self.path, "rb") as f:
+            f.seek(_FILE_HEADER.size)
+            while True:
+                header = f.read(_RECORD.size)
+                if len(header) < _RECORD.size:
+                    return
+                kind, timestamp, page, length = _RECORD.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    # 录制中途退出，末尾记录不完整
+                    return
+                if kind == KEYFRAME:
+                    rle_decode(payload, words)
+                    synced = True
+                elif synced:
+                    rle_decode(payload, delta)
+                    np.bitwise_xor(words, delta, out=words)
+                else:
+                    continue
+                yield timestamp, page, frame
+
+
+def replay(recording: FrameRecording, driver, speed: float = 1.0, limit: int = 0) -> dict:
+    """
+    把录制内容推送给显示后端
+    
+    Args:
+        recording: 录制文件
+        driver: 显示后端（DisplayBackend），需已初始化
+        speed: 回放倍速，1.0 为原速，0 表示不等待、尽快发送
+        limit: 最多回放的帧数，0 表示全部
+    
+    Returns:
+        回放统计：帧数、耗时、实际帧率、发送字节数与整帧刷新时的字节数
+    """
+    start = time.perf_counter()
+    first_timestamp = None
+    frames = 0
+    before = driver.get_stats()["bytes_sent"]
+    for timestamp, page, frame in recording:
+        if speed > 0:
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            delay = (timestamp - first_timestamp) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        driver.set_page(page)
+        driver.send_frame(frame)
+        frames += 1
+        if limit and frames >= limit:
+            break
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": frames,
+        "elapsed": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "bytes_sent": driver.get_stats()["bytes_sent"] - before,
+        "full_frame_bytes": frames * recording.width * recording.height * 2,
+    }
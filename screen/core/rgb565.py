@@ -0,0 +1,268 @@
+"""RGB565 转换模块
+
+预分配全部中间缓冲区，每帧转换不再产生整帧大小的临时数组：
+- 源图像像素通过 Pillow 内核 paste 直接复制进与 NumPy 共享内存的 RGBX 暂存图
+- 高/低字节用带 out= 的原地 ufunc 计算，直接写入大端序输出缓冲区
+- 夜间调暗时改用预先计算的查找表，亮度缩放与 RGB565 打包在同一步完成
+- 12 位传输模式下，RGB444Packer 在发送前把 RGB565 区域打包为每两像素 3 字节
+"""
+import numpy as np
+from PIL import Image
+from typing import Optional
+
+
+class RGB565Converter:
+    """复用缓冲区的 RGB888 -> RGB565（大端序）转换器"""
+    
+    def __init__(self, width: int, height: int):
+        """
+        初始化转换器
+        
+        Args:
+            width: 帧宽度
+            height: 帧高度
+        """
+        self.width = width
+        self.height = height
+        
+        # RGBX 暂存图与 NumPy 数组共享同一块内存（Pillow 内部 RGB 也是每像素 4 字节）
+        self._rgbx = np.zeros((height, width, 4), dtype=np.uint8)
+        self._staging = Image.frombuffer("RGBX", (width, height), self._rgbx, "raw", "RGBX", 0, 1)
+        self._r = self._rgbx[:, :, 0]
+        self._g = self._rgbx[:, :, 1]
+        self._b = self._rgbx[:, :, 2]
+        
+        # 位运算临时缓冲区与默认输出缓冲区
+        self._tmp = np.empty((height, width), dtype=np.uint8)
+        self._out = np.empty((height, width), dtype=">u2")
+        
+        # 亮度查找表：以 (R<<8)|G 查高字节、(G<<8)|B 查低字节，亮度为 1.0 时不使用
+        self.brightness = 1.0
+        self._hi_lut: Optional[np.ndarray] = None
+        self._lo_lut: Optional[np.ndarray] = None
+        self._index: Optional[np.ndarray] = None
+        self._lut565: Optional[np.ndarray] = None
+        self._lut565_brightness = 1.0
+    
+    def set_brightness(self, factor: float) -> None:
+        """
+        设置亮度系数（与 ImageEnhance.Brightness 相同：各通道乘以系数）
+        
+        Args:
+            factor: 亮度系数，1.0 为原始亮度
+        """
+        factor = max(0.0, float(factor))
+        if factor == self.brightness:
+            return
+        self.brightness = factor
+        if factor == 1.0:
+            self._hi_lut = self._lo_lut = self._index = None
+            return
+        
+        scaled = np.minimum(np.arange(256) * factor, 255).astype(np.uint16)
+        first = scaled[:, None]
+        second = scaled[None, :]
+        self._hi_lut = ((first & 0xF8) | (second >> 5)).astype(np.uint8).ravel()
+        self._lo_lut = (((first << 3) & 0xE0) | (second >> 3)).astype(np.uint8).ravel()
+        if self._index is None:
+            self._index = np.empty((self.height, self.width), dtype=np.intp)
+    
+    def _rgb565_lut(self) -> np.ndarray:
+        """RGB565 -> RGB565 亮度查找表，下标与结果均为大端序帧在内存中的原始 uint16"""
+        if self._lut565 is None or self._lut565_brightness != self.brightness:
+            values = np.arange(65536, dtype=np.uint32).astype(">u2")
+            rgb = rgb565_to_rgb888(values).astype(np.float64) * self.brightness
+            scaled = rgb888_to_rgb565(np.minimum(rgb, 255).astype(np.uint8))
+            self._lut565 = np.empty(65536, dtype=np.uint16)
+            self._lut565[values.view(np.uint16)] = scaled.view(np.uint16)
+            self._lut565_brightness = self.brightness
+        return self._lut565
+    
+    def scale_frame(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        对已是大端序 RGB565 的帧应用亮度系数（页面直接在 RGB565 帧缓冲上合成时使用）
+        
+        亮度为 1.0 时 out 省略则原样返回 frame；否则按 65536 项查找表逐像素映射，
+        结果写入 out（省略时写入转换器自带的缓冲区）。
+        """
+        if self.brightness == 1.0:
+            if out is None:
+                return frame
+            np.copyto(out, frame)
+            return out
+        if out is None:
+            out = self._out
+        np.take(self._rgb565_lut(), frame.view(np.uint16), out=out.view(np.uint16))
+        return out
+    
+    def _load(self, image: Image.Image) -> None:
+        """将图像像素复制到暂存缓冲区"""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if image.size != (self.width, self.height):
+            raise ValueError(f"图像尺寸 {image.size} 与转换器 {(self.width, self.height)} 不一致")
+        
+        image.load()
+        # 直接调用内核 paste：Python 层的 paste 会因暂存图只读而复制一份
+        self._staging.im.paste(image.im, (0, 0, self.width, self.height))
+    
+    def convert(self, image: Image.Image, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        将 PIL 图像转换为大端序 RGB565 数组 (H, W)
+        
+        Args:
+            image: PIL 图像
+            out: 可选的输出数组（dtype 为 >u2）；省略时写入转换器自带的缓冲区，
+                 下次调用会被覆盖
+        
+        Returns:
+            RGB565 数组
+        """
+        if out is None:
+            out = self._out
+        self._load(image)
+        
+        # 大端序：第 0 字节为 RRRRRGGG，第 1 字节为 GGGBBBBB
+        planes = out.view(np.uint8).reshape(self.height, self.width, 2)
+        hi = planes[:, :, 0]
+        lo = planes[:, :, 1]
+        tmp = self._tmp
+        
+        if self._hi_lut is not None:
+            self._pack_lut(hi, lo)
+            return out
+        
+        np.bitwise_and(self._r, 0xF8, out=hi)
+        np.right_shift(self._g, 5, out=tmp)
+        np.bitwise_or(hi, tmp, out=hi)
+        
+        np.left_shift(self._g, 3, out=lo)
+        np.bitwise_and(lo, 0xE0, out=lo)
+        np.right_shift(self._b, 3, out=tmp)
+        np.bitwise_or(lo, tmp, out=lo)
+        return out
+    
+    def _pack_lut(self, hi: np.ndarray, lo: np.ndarray) -> None:
+        """查表打包（含亮度缩放）"""
+        index = self._index
+        tmp = self._tmp
+        
+        np.left_shift(self._r, 8, out=index, dtype=np.intp)
+        np.bitwise_or(index, self._g, out=index)
+        np.take(self._hi_lut, index, out=tmp, mode="clip")
+        np.copyto(hi, tmp)
+        
+        np.left_shift(self._g, 8, out=index, dtype=np.intp)
+        np.bitwise_or(index, self._b, out=index)
+        np.take(self._lo_lut, index, out=tmp, mode="clip")
+        np.copyto(lo, tmp)
+    
+    @staticmethod
+    def as_buffer(frame: np.ndarray) -> memoryview:
+        """
+        获取帧数据的字节视图，连续数组不复制
+        
+        spidev.writebytes2 支持缓冲区协议，可直接传入该视图
+        """
+        if not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+        return memoryview(frame.reshape(-1).view(np.uint8))
+
+
+def rgb888_to_rgb565(pixels: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将 RGB888 数组 (H, W, 3) 打包为 RGB565 数组 (H, W)（与 RGB565Converter 一致，低位截断）
+    
+    Args:
+        pixels: uint8 像素
+        out: 可选的输出数组（任意字节序的 uint16，可以是帧缓冲的切片）
+    """
+    r = pixels[..., 0].astype(np.uint16)
+    g = pixels[..., 1].astype(np.uint16)
+    b = pixels[..., 2].astype(np.uint16)
+    packed = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    if out is None:
+        return packed.astype(">u2")
+    out[...] = packed
+    return out
+
+
+def rgb565_to_rgb888(frame: np.ndarray) -> np.ndarray:
+    """
+    将 RGB565 数组还原为 RGB888 数组 (H, W, 3)
+    
+    低位按高位复制填充，使 0x1F/0x3F 还原为 255
+    """
+    pixels = frame.astype(np.uint16)
+    rgb = np.empty(frame.shape + (3,), dtype=np.uint8)
+    r = (pixels >> 11) & 0x1F
+    g = (pixels >> 5) & 0x3F
+    b = pixels & 0x1F
+    rgb[..., 0] = (r << 3) | (r >> 2)
+    rgb[..., 1] = (g << 2) | (g >> 4)
+    rgb[..., 2] = (b << 3) | (b >> 2)
+    return rgb
+
+
+class RGB444Packer:
+    """
+    RGB565 -> 12 位 RGB444 打包器（COLMOD 0x53）
+    
+    每两个像素打包为 3 字节：R0G0 B0R1 G1B1，比 RGB565 少 25% 数据量。
+    取 RGB565 各分量的高 4 位，与直接截取 RGB888 高 4 位结果相同。
+    """
+    
+    def __init__(self, max_pixels: int):
+        """
+        初始化打包器
+        
+        Args:
+            max_pixels: 单次打包的最大像素数（通常为整帧像素数，须为偶数）
+        """
+        pairs = max_pixels // 2
+        self._tmp = np.empty(pairs, dtype=np.uint16)
+        self._acc = np.empty(pairs, dtype=np.uint16)
+        self._out = np.empty((pairs, 3), dtype=np.uint8)
+    
+    def pack(self, frame: np.ndarray) -> memoryview:
+        """
+        打包 RGB565 区域
+        
+        Args:
+            frame: (H, W) 大端序 RGB565 数组，像素总数须为偶数
+        
+        Returns:
+            打包后字节的视图（指向内部缓冲区，下次调用会被覆盖）
+        """
+        pixels = np.ascontiguousarray(frame).reshape(-1, 2)
+        n = pixels.shape[0]
+        v0 = pixels[:, 0]
+        v1 = pixels[:, 1]
+        tmp = self._tmp[:n]
+        acc = self._acc[:n]
+        out = self._out[:n]
+        
+        # 字节 0: R0 G0
+        np.right_shift(v0, 8, out=acc)
+        np.bitwise_and(acc, 0xF0, out=acc)
+        np.right_shift(v0, 7, out=tmp)
+        np.bitwise_and(tmp, 0x0F, out=tmp)
+        np.bitwise_or(acc, tmp, out=acc)
+        np.copyto(out[:, 0], acc, casting="unsafe")
+        
+        # 字节 1: B0 R1
+        np.left_shift(v0, 3, out=acc)
+        np.bitwise_and(acc, 0xF0, out=acc)
+        np.right_shift(v1, 12, out=tmp)
+        np.bitwise_or(acc, tmp, out=acc)
+        np.copyto(out[:, 1], acc, casting="unsafe")
+        
+        # 字节 2: G1 B1
+        np.right_shift(v1, 3, out=acc)
+        np.bitwise_and(acc, 0xF0, out=acc)
+        np.right_shift(v1, 1, out=tmp)
+        np.bitwise_and(tmp, 0x0F, out=tmp)
+        np.bitwise_or(acc, tmp, out=acc)
+        np.copyto(out[:, 2], acc, casting="unsafe")
+        
+        return memoryview(out.reshape(-1))
@@ -0,0 +1,160 @@
+"""硬件滚动模块
+
+利用 ST7789 的 VSCRDEF (0x33) / VSCSAD (0x37) 在两屏内容之间平滑滑动。
+
+横屏 (MADCTL MV=1) 时，芯片的滚动方向（显存行 / 栅极方向）对应屏幕的 x 方向，
+因此滑动是水平的：显存 320 列构成一个环形缓冲区，屏幕第 x 列显示显存第
+(VSCSAD + x) mod 320 列。每一步只需把新露出的几列写入刚移出屏幕的显存列，
+再修改起始地址，其余像素由面板自己平移。
+
+新一屏的第 j 列始终写在显存第 j 列，滑动结束时起始地址恰好回到 0，
+显存与屏幕坐标重新一致，之后可以继续走普通的局部刷新流程。
+"""
+import time
+import numpy as np
+from PIL import Image
+from typing import Iterator, Optional, Tuple
+
+
+class HardwareScroller:
+    """两屏之间的水平滑动，不支持硬件滚动的后端退化为逐帧软件合成"""
+    
+    def __init__(self, driver, config=None, logger=None):
+        """
+        初始化滑动器
+        
+        Args:
+            driver: 显示后端（DisplayBackend）
+            config: 配置对象（读取 display.scroll.*）
+            logger: 日志记录器
+        """
+        self._driver = driver
+        self._logger = logger
+        
+        if config:
+            self.enabled = config.get("display.scroll.enabled", True)
+            self.step = config.get("display.scroll.step", 8)
+            self.interval = config.get("display.scroll.interval", 0.01)
+        else:
+            self.enabled = True
+            self.step = 8
+            self.interval = 0.01
+        
+        self._next = np.zeros((driver.height, driver.width), dtype=">u2")
+        self._compose: Optional[np.ndarray] = None
+        
+        self.slides = 0
+        self.bytes_sent = 0
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    @property
+    def hardware(self) -> bool:
+        """当前后端是否走硬件滚动"""
+        return self.enabled and self._driver.supports_hardware_scroll
+    
+    def _positions(self, direction: int) -> Iterator[Tuple[int, int]]:
+        """
+        生成每一步的 (起, 止) 位置
+        
+        位置 p 表示拼接带（向左滑为 当前屏+新屏，向右滑为 新屏+当前屏）中
+        屏幕左边缘所在的列。
+        """
+        width = self._driver.width
+        step = max(1, self.step)
+        if self._driver.pixel_format == "rgb444":
+            # 12 位格式的窗口按偶数列对齐，奇数步长会多写一列仍在屏上的旧内容
+            step += step & 1
+        if direction > 0:
+            p = 0
+            while p < width:
+                q = min(p + step, width)
+                yield p, q
+                p = q
+        else:
+            p = width
+            while p > 0:
+                q = max(p - step, 0)
+                yield p, q
+                p = q
+    
+    def slide(self, image: Image.Image, direction: int = 1) -> None:
+        """
+        从当前屏滑动到新的一屏
+        
+        Args:
+            image: 新一屏的图像
+            direction: 1 为向左滑（新屏从右侧进入），-1 为向右滑
+        """
+        driver = self._driver
+        if not driver.is_ready():
+            return
+        
+        # 先让异步刷新线程发完已提交的帧，避免滑动结束后被旧帧覆盖
+        driver.wait_flush()
+        next_frame = driver.image_to_rgb565_array(image, out=self._next)
+        current = driver.current_frame()
+        
+        if current is None:
+            # 屏幕内容未知，无法滑动，直接整帧显示
+            driver.flush_frame(next_frame)
+            return
+        
+        before = driver.get_stats()["bytes_sent"]
+        try:
+            if self.hardware:
+                self._slide_hardware(next_frame, direction)
+            else:
+                self._slide_software(current.copy(), next_frame, direction)
+        except Exception as e:
+            self._log('error', f"滑动失败: {e}")
+            driver.invalidate()
+            driver.flush_frame(next_frame)
+            return
+        
+        driver.adopt_frame(next_frame)
+        self.slides += 1
+        self.bytes_sent += driver.get_stats()["bytes_sent"] - before
+    
+    def _slide_hardware(self, next_frame: np.ndarray, direction: int) -> None:
+        """硬件滚动：每步只写新露出的列"""
+        driver = self._driver
+        width = driver.width
+        height = driver.height
+        
+        with driver.io_lock:
+            try:
+                driver.set_scroll_area(0, width, 0)
+                for p, q in self._positions(direction):
+                    x0, x1 = (p, q) if direction > 0 else (q, p)
+                    # 先移动起始地址，再把刚移出屏幕的显存列改写为新屏内容
+                    driver.set_scroll_start(q % width)
+                    driver.write_region(next_frame, x0, 0, x1 - 1, height - 1)
+                    if self.interval:
+                        time.sleep(self.interval)
+            finally:
+                driver.set_scroll_start(0)
+    
+    def _slide_software(self, current: np.ndarray, next_frame: np.ndarray, direction: int) -> None:
+        """软件合成：逐步拼接两屏并走普通刷新流程"""
+        driver = self._driver
+        width = driver.width
+        if self._compose is None:
+            self._compose = np.empty_like(self._next)
+        frame = self._compose
+        
+        left, right = (current, next_frame) if direction > 0 else (next_frame, current)
+        for _, q in self._positions(direction):
+            # 拼接带 left+right 中从第 q 列开始的一屏
+            frame[:, :width - q] = left[:, q:]
+            frame[:, width - q:] = right[:, :q]
+            driver.send_frame(frame)
+            if self.interval:
+                time.sleep(self.interval)
+    
+    def get_stats(self) -> dict:
+        """获取滑动统计"""
+        return {"slides": self.slides, "slide_bytes": self.bytes_sent}
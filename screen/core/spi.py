@@ -0,0 +1,170 @@
+"""SPI 传输层模块
+
+封装 spidev：按可配置的块大小分块发送、探测内核 spidev bufsiz、
+记录每次传输耗时，并提供模拟设备用于开发机和基准测试。
+"""
+import time
+
+# 内核 spidev 单次传输上限（模块参数 bufsiz，默认 4096）
+BUFSIZ_PATH = "/sys/module/spidev/parameters/bufsiz"
+DEFAULT_BUFSIZ = 4096
+
+
+def detect_bufsiz(path: str = BUFSIZ_PATH) -> int:
+    """
+    读取 spidev 的 bufsiz 模块参数
+    
+    Returns:
+        单次传输最大字节数，读取失败时返回内核默认值 4096
+    """
+    try:
+        with open(path, "r") as f:
+            value = int(f.read().strip())
+        return value if value > 0 else DEFAULT_BUFSIZ
+    except (OSError, ValueError):
+        return DEFAULT_BUFSIZ
+
+
+class MockSpi:
+    """模拟 spidev.SpiDev，按时钟频率与单次调用开销模拟传输耗时"""
+    
+    def __init__(self, call_overhead: float = 20e-6, simulate: bool = True):
+        """
+        初始化模拟设备
+        
+        Args:
+            call_overhead: 每次 ioctl 调用的固定开销（秒）
+            simulate: 是否 sleep 模拟传输耗时
+        """
+        self.max_speed_hz = 62500000
+        self.mode = 0
+        self.call_overhead = call_overhead
+        self.simulate = simulate
+        self.bytes_written = 0
+        self.calls = 0
+    
+    def open(self, bus: int, device: int) -> None:
+        pass
+    
+    def _transfer(self, size: int) -> None:
+        self.bytes_written += size
+        self.calls += 1
+        if self.simulate:
+            time.sleep(self.call_overhead + size * 8 / self.max_speed_hz)
+    
+    def writebytes(self, data) -> None:
+        self._transfer(len(data))
+    
+    def writebytes2(self, data) -> None:
+        self._transfer(memoryview(data).nbytes)
+    
+    def close(self) -> None:
+        pass
+
+
+class SpiTransport:
+    """SPI 传输层，接口与 spidev.SpiDev 的写方法兼容"""
+    
+    def __init__(self, bus: int = 1, device: int = 0, speed_hz: int = 62500000,
+                 chunk_size: int = 0, spi=None, logger=None):
+        """
+        初始化传输层
+        
+        Args:
+            bus: SPI 总线号
+            device: SPI 片选号
+            speed_hz: SPI 时钟频率
+            chunk_size: 分块大小，0 表示使用探测到的 bufsiz
+            spi: 可选的 SpiDev 兼容对象（如 MockSpi），省略时打开真实设备
+            logger: 日志记录器
+        """
+        self.bus = bus
+        self.device = device
+        self.speed_hz = speed_hz
+        self._logger = logger
+        self._spi = spi
+        self.bufsiz = detect_bufsiz()
+        self.chunk_size = self._effective_chunk(chunk_size)
+        
+        self.transfers = 0
+        self.bytes_sent = 0
+        self.busy_time = 0.0
+        self.last_transfer_time = 0.0
+        self.max_transfer_time = 0.0
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+    
+    def _effective_chunk(self, chunk_size: int) -> int:
+        """分块不能超过内核 bufsiz，否则 ioctl 返回 EMSGSIZE"""
+        if chunk_size <= 0:
+            return self.bufsiz
+        if chunk_size > self.bufsiz:
+            self._log('warning', f"SPI 分块 {chunk_size} 超过 spidev bufsiz {self.bufsiz}，已截断")
+            return self.bufsiz
+        return chunk_size
+    
+    def set_chunk_size(self, chunk_size: int) -> None:
+        """调整分块大小（0 表示 bufsiz）"""
+        self.chunk_size = self._effective_chunk(chunk_size)
+    
+    def open(self) -> None:
+        """打开 SPI 设备"""
+        if self._spi is None:
+            import spidev
+            self._spi = spidev.SpiDev()
+        self._spi.open(self.bus, self.device)
+        self._spi.max_speed_hz = self.speed_hz
+        self._spi.mode = 0
+    
+    def _record(self, size: int, elapsed: float) -> None:
+        """记录一次传输"""
+        self.transfers += 1
+        self.bytes_sent += size
+        self.busy_time += elapsed
+        self.last_transfer_time = elapsed
+        if elapsed > self.max_transfer_time:
+            self.max_transfer_time = elapsed
+    
+    def writebytes(self, data) -> None:
+        """发送少量字节（命令/参数）"""
+        start = time.perf_counter()
+        self._spi.writebytes(data)
+        self._record(len(data), time.perf_counter() - start)
+    
+    def writebytes2(self, data) -> None:
+        """按块大小分块发送缓冲区（像素数据），不复制数据"""
+        view = memoryview(data).cast("B")
+        chunk = self.chunk_size
+        start = time.perf_counter()
+        for offset in range(0, view.nbytes, chunk):
+            self._spi.writebytes2(view[offset:offset + chunk])
+        self._record(view.nbytes, time.perf_counter() - start)
+    
+    def get_stats(self) -> dict:
+        """获取传输统计"""
+        return {
+            "transfers": self.transfers,
+            "spi_bytes": self.bytes_sent,
+            "spi_busy_time": self.busy_time,
+            "spi_last_transfer_ms": self.last_transfer_time * 1000,
+            "spi_max_transfer_ms": self.max_transfer_time * 1000,
+            "spi_bytes_per_sec": self.bytes_sent / self.busy_time if self.busy_time > 0 else 0.0,
+        }
+    
+    def reset_stats(self) -> None:
+        """清零传输统计"""
+        self.transfers = 0
+        self.bytes_sent = 0
+        self.busy_time = 0.0
+        self.last_transfer_time = 0.0
+        self.max_transfer_time = 0.0
+    
+    def close(self) -> None:
+        """关闭 SPI 设备"""
+        if self._spi is not None:
+            self._spi.close()
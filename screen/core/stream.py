@@ -0,0 +1,398 @@
+"""远程渲染（瘦客户端）模块
+
+性能更强的主机运行页面渲染，把 RGB565 脏矩形压缩后经 TCP 推送到 Orange Pi，
+Pi 端接收后直接写入屏幕，不再运行 Pillow 绘制：
+- StreamSink: 主机端显示后端（display.backend: stream），复用刷新流水线的
+  脏矩形规划，每个窗口作为一个 zlib 压缩的图块发送
+- StreamReceiver: Pi 端接收线程，把图块直接写入显示后端；流中断超过
+  timeout 秒后 active 变为 False，主循环恢复本地渲染
+
+消息格式（小端序）：头部 <4sBBIhH>（魔数、类型、保留、序号、页面、图块数），
+随后每个图块为 <HHHHI>（x, y, w, h, 压缩长度）加 zlib 压缩的大端序 RGB565 数据。
+整帧（关键帧）之后的增量帧序号必须连续；接收端状态未知（刚连接、序号不连续、
+本地渲染过）时只接受关键帧，并向发送端回写一个字节 b"K" 请求关键帧。
+"""
+import time
+import zlib
+import select
+import socket
+import struct
+import threading
+import numpy as np
+from typing import List, Optional, Tuple
+
+from .display import DisplayBackend
+
+MAGIC = b"TFS1"
+KEYFRAME = 0
+DELTA = 1
+KEYFRAME_REQUEST = b"K"
+_HEADER = struct.Struct("<4sBBIhH")
+_TILE = struct.Struct("<HHHHI")
+
+
+def _compress_bound(size: int) -> int:
+    """zlib 压缩 size 字节数据的最大输出长度（同 zlib compressBound）"""
+    return size + (size >> 12) + (size >> 14) + (size >> 25) + 13
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """从 TCP 流读取恰好 size 字节，连接关闭时抛出 ConnectionError"""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("连接已关闭")
+        received += n
+    return bytes(buf)
+
+
+class StreamSink(DisplayBackend):
+    """主机端后端：把每帧的脏矩形压缩后推送给 Pi 端接收器"""
+    
+    name = "stream"
+    
+    def __init__(self, config=None, logger=None):
+        super().__init__(config, logger)
+        if config:
+            self.host = config.get("display.stream.host", "127.0.0.1")
+            self.port = config.get("display.stream.port", 9997)
+            self.keyframe_interval = config.get("display.stream.keyframe_interval", 300)
+            self.compress_level = config.get("display.stream.compress_level", 1)
+            self.retry_interval = config.get("display.stream.retry_interval", 5.0)
+        else:
+            self.host = "127.0.0.1"
+            self.port = 9997
+            self.keyframe_interval = 300
+            self.compress_level = 1
+            self.retry_interval = 5.0
+        
+        self._sock: Optional[socket.socket] = None
+        self._last_attempt = 0.0
+        self._tiles: List[bytes] = []
+        self._window = (0, 0, self.width - 1, self.height - 1)
+        self._keyframe = False
+        self.seq = 0
+        self._since_keyframe = 0
+        self.keyframes = 0
+        self.wire_bytes = 0
+    
+    def is_ready(self) -> bool:
+        """未连接时按 retry_interval 重连"""
+        if self._sock is None and time.time() - self._last_attempt >= self.retry_interval:
+            self.init_display()
+        return self._sock is not None
+    
+    def _init_display(self) -> bool:
+        """
+        连接接收端
+        
+        连接失败也视为初始化成功：接收端可能晚于主机启动，之后由 is_ready
+        按 retry_interval 重连，未连接期间的帧直接丢弃。
+        """
+        self._last_attempt = time.time()
+        self._disconnect()
+        try:
+            self._sock = socket.create_connection((self.host, self.port), timeout=2.0)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._log('info', f"已连接远程显示接收端 {self.host}:{self.port}")
+        except OSError as e:
+            self._log('warning', f"连接远程显示接收端失败 {self.host}:{self.port}: {e}，"
+                                 f"{self.retry_interval} 秒后重试")
+            self._sock = None
+        return True
+    
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+    
+    def _recover(self) -> None:
+        """连接断开后由 is_ready 按间隔重连"""
+        self._disconnect()
+    
+    def _keyframe_requested(self) -> bool:
+        """接收端是否回写了关键帧请求"""
+        readable, _, _ = select.select([self._sock], [], [], 0)
+        if not readable:
+            return False
+        data = self._sock.recv(64)
+        if not data:
+            raise ConnectionError("接收端已断开")
+        return KEYFRAME_REQUEST in data
+    
+    def plan_regions(self, frame: np.ndarray, hint=None):
+        """到达关键帧间隔时整帧发送"""
+        if self._since_keyframe >= self.keyframe_interval:
+            return None
+        return super().plan_regions(frame, hint)
+    
+    def _send_frame(self, frame: np.ndarray, hint=None) -> None:
+        if self._keyframe_requested():
+            # 接收端状态未知：清空上一帧记录，本帧不会被跳过且整帧发送
+            self.invalidate()
+        skipped = self._stats["frames_skipped"]
+        super()._send_frame(frame, hint)
+        if self._stats["frames_skipped"] != skipped:
+            # 相同帧不发图块，但发送空增量帧作为心跳，避免接收端超时回退
+            self._tiles = []
+            self._end_frame()
+    
+    def set_window(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        self._window = (x0, y0, x1, y1)
+        self._keyframe = (x0, y0, x1, y1) == (0, 0, self.width - 1, self.height - 1)
+    
+    def write_pixels(self, pixels) -> None:
+        x0, y0, x1, y1 = self._window
+        data = zlib.compress(pixels, self.compress_level)
+        self._tiles.append(_TILE.pack(x0, y0, x1 - x0 + 1, y1 - y0 + 1, len(data)) + data)
+    
+    def _end_frame(self) -> None:
+        kind = KEYFRAME if self._keyframe else DELTA
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        header = _HEADER.pack(MAGIC, kind, 0, self.seq, self.page_index, len(self._tiles))
+        message = b"".join([header] + self._tiles)
+        self._tiles = []
+        self._keyframe = False
+        self._sock.sendall(message)
+        self.wire_bytes += len(message)
+        if kind == KEYFRAME:
+            self.keyframes += 1
+            self._since_keyframe = 0
+        else:
+            self._since_keyframe += 1
+    
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats["keyframes"] = self.keyframes
+        stats["wire_bytes"] = self.wire_bytes
+        return stats
+    
+    def close(self) -> None:
+        super().close()
+        self._disconnect()
+
+
+class StreamReceiver:
+    """Pi 端接收器：把远程渲染的图块直接写入显示后端"""
+    
+    def __init__(self, driver, config=None, logger=None):
+        """
+        初始化接收器
+        
+        Args:
+            driver: 显示后端（DisplayBackend）
+            config: 配置对象（读取 display.stream.receiver.*）
+            logger: 日志记录器
+        """
+        self._driver = driver
+        self._logger = logger
+        if config:
+            self.bind = config.get("display.stream.receiver.bind", "0.0.0.0")
+            self.port = config.get("display.stream.receiver.port", 9997)
+            self.timeout = config.get("display.stream.receiver.timeout", 3.0)
+        else:
+            self.bind = "0.0.0.0"
+            self.port = 9997
+            self.timeout = 3.0
+        
+        self._canvas = np.zeros((driver.height, driver.width), dtype=">u2")
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._synced = False
+        self._requested = False
+        # 睡眠期间收到的图块未写入显存
+        self._stale = False
+        self._last_seq = 0
+        self._last_message = 0.0
+        
+        self.frames = 0
+        self.keyframes = 0
+        self.dropped = 0
+        self.wire_bytes = 0
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    @property
+    def active(self) -> bool:
+        """最近 timeout 秒内收到过有效帧（此时主循环不在本地渲染）"""
+        return self._synced and time.time() - self._last_message < self.timeout
+    
+    def start(self) -> int:
+        """
+        开始监听
+        
+        Returns:
+            实际监听的端口（port 为 0 时由系统分配）
+        """
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.bind, self.port))
+        self._server.listen(1)
+        self.port = self._server.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="StreamReceiver")
+        self._thread.start()
+        self._log('info', f"远程显示接收端监听 {self.bind}:{self.port}")
+        return self.port
+    
+    def stop(self) -> None:
+        """停止监听"""
+        self._running = False
+        if self._server is not None:
+            try:
+                # shutdown 才能唤醒阻塞在 accept 上的线程
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            try:
+                self._server.close()
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2.0)
+    
+    def _run(self) -> None:
+        """接收线程：一次服务一个发送端"""
+        while self._running:
+            try:
+                conn, addr = self._server.accept()
+            except OSError:
+                break
+            self._log('info', f"远程渲染端已连接: {addr[0]}")
+            self._synced = False
+            self._requested = False
+            try:
+                self._serve(conn)
+            except (ConnectionError, OSError, zlib.error, ValueError) as e:
+                self._log('warning', f"远程显示流中断: {e}")
+            finally:
+                self._synced = False
+                conn.close()
+    
+    def _serve(self, conn: socket.socket) -> None:
+        """处理一个连接上的消息"""
+        conn.settimeout(self.timeout)
+        while self._running:
+            readable, _, _ = select.select([conn], [], [], self.timeout)
+            if not readable:
+                # 流暂停：主循环会回退本地渲染，恢复后需要关键帧重新同步
+                if self._synced:
+                    self._log('warning', "远程显示流超时，回退本地渲染")
+                self._synced = False
+                self._request_keyframe(conn)
+                continue
+            # 消息读到一半超时说明连接异常，由 _run 断开重连
+            header = _recv_exact(conn, _HEADER.size)
+            magic, kind, _, seq, page, count = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("无效的流消息")
+            # 发送端超过 full_threshold 即整帧发送，一条消息的图块总面积不会超过一帧
+            budget = self._driver.width * self._driver.height
+            tiles = []
+            for _ in range(count):
+                tile = self._read_tile(conn, budget)
+                budget -= tile[2] * tile[3]
+                tiles.append(tile)
+            
+            if kind != KEYFRAME and (not self._synced or seq != (self._last_seq + 1) & 0xFFFFFFFF):
+                # 屏幕状态与发送端不一致，丢弃增量帧并请求关键帧
+                self._synced = False
+                self._request_keyframe(conn)
+                self.dropped += 1
+                continue
+            
+            if not self._apply(tiles, page, kind):
+                self._synced = False
+                self._request_keyframe(conn)
+                self.dropped += 1
+                continue
+            self._last_seq = seq
+            self._last_message = time.time()
+            self._synced = True
+            self.frames += 1
+            if kind == KEYFRAME:
+                self._requested = False
+                self.keyframes += 1
+    
+    def _request_keyframe(self, conn: socket.socket) -> None:
+        """请求关键帧（收到关键帧之前只请求一次）"""
+        if not self._requested:
+            conn.sendall(KEYFRAME_REQUEST)
+            self._requested = True
+    
+    def _read_tile(self, conn: socket.socket, budget: int) -> Tuple[int, int, int, int, bytes]:
+        """
+        读取一个图块并解压
+        
+        接收端监听在局域网上且没有认证，读取负载之前先按图块尺寸校验压缩长度，
+        解压输出也限制为图块尺寸，避免单个消息让 Pi 分配大块内存（或 zlib 炸弹）。
+        
+        Args:
+            budget: 本消息剩余可接收的像素数
+        """
+        x, y, w, h, size = _TILE.unpack(_recv_exact(conn, _TILE.size))
+        if not w or not h or x + w > self._driver.width or y + h > self._driver.height or w * h > budget:
+            raise ValueError(f"图块越界: {(x, y, w, h)}")
+        raw = w * h * 2
+        if size > _compress_bound(raw):
+            raise ValueError(f"图块压缩长度异常: {size} > {_compress_bound(raw)}")
+        inflater = zlib.decompressobj()
+        data = inflater.decompress(_recv_exact(conn, size), raw)
+        self.wire_bytes += _TILE.size + size
+        if len(data) != raw or not inflater.eof or inflater.unconsumed_tail or inflater.unused_data:
+            raise ValueError(f"图块长度不符: {(x, y, w, h)}")
+        return x, y, w, h, data
+    
+    def _apply(self, tiles: List[Tuple[int, int, int, int, bytes]], page: int, kind: int) -> bool:
+        """
+        把图块写入画布并直接发送到屏幕
+        
+        面板睡眠时只更新画布，不写显存；唤醒后的第一帧整帧发送，补上睡眠期间的变化。
+        
+        Returns:
+            增量帧的基准与屏幕当前内容不一致（期间有本地渲染）时返回 False
+        """
+        driver = self._driver
+        if not driver.is_ready():
+            return True
+        # 本地渲染可能还有未发送的帧，先等它发完，避免覆盖远程画面
+        driver.wait_flush()
+        canvas = self._canvas
+        with driver.io_lock:
+            if kind != KEYFRAME:
+                current = driver.current_frame()
+                if current is None or not np.array_equal(current, canvas):
+                    return False
+            for x, y, w, h, data in tiles:
+                canvas[y:y + h, x:x + w] = np.frombuffer(data, dtype=">u2").reshape(h, w)
+            if driver.power_state == "sleep":
+                self._stale = True
+            else:
+                if self._stale:
+                    tiles = [(0, 0, driver.width, driver.height, b"")]
+                    self._stale = False
+                for x, y, w, h, _ in tiles:
+                    driver.write_region(canvas, x, y, x + w - 1, y + h - 1)
+                driver.end_frame()
+            driver.set_page(page)
+            driver.adopt_frame(canvas)
+        return True
+    
+    def get_stats(self) -> dict:
+        """获取接收统计"""
+        return {
+            "stream_frames": self.frames,
+            "stream_keyframes": self.keyframes,
+            "stream_dropped": self.dropped,
+            "stream_wire_bytes": self.wire_bytes,
+        }
@@ -1,11 +1,18 @@
 """UI 公共组件模块"""
-from typing import List, Tuple
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 from PIL import ImageDraw, ImageFont, ImageEnhance, Image
 from .themes import (
     W, H, UI_HEADER_HEIGHT, UI_FOOTER_HEIGHT, UI_PADDING, 
     UI_CARD_RADIUS, UI_CHAR_WIDTH_CN, UI_CHAR_WIDTH_EN,
     get_time_based_colors
 )
+from ..utils.cache import ByteLRUCache
+
+# 装饰图层缓存（卡片底、光晕、背景纹理），默认 1 MB，整屏背景约 240 KB
+decoration_cache = ByteLRUCache(1024 * 1024, name="decoration_cache")
+
+# 缓存的装饰：(RGB 图像, 1 位掩码（完全不透明时为 None）, 相对锚点的偏移)
+Decoration = Tuple[Image.Image, Optional[Image.Image], Tuple[int, int]]
 
 
 def calc_text_width(text: str) -> int:
@@ -98,3 +105,110 @@ def draw_card(draw: ImageDraw.Draw, x: int, y: int, w: int, h: int,
 def adjust_brightness(img: Image.Image, factor: float) -> Image.Image:
     """调整图像亮度"""
     return ImageEnhance.Brightness(img).enhance(factor)
+
+
+def configure_decoration_cache(max_bytes: int) -> None:
+    """调整装饰缓存容量"""
+    decoration_cache.resize(max_bytes)
+
+
+def _render_card(w: int, h: int, radius: int = UI_CARD_RADIUS, fill: Tuple[int, int, int] = None,
+                 outline: Tuple[int, int, int] = None, width: int = 1) -> Tuple[Image.Image, Tuple[int, int]]:
+    """圆角卡片，锚点为左上角（与 rounded_rectangle([x, y, x + w, y + h]) 相同）"""
+    sprite = Image.new("RGBA", (w + 1, h + 1), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).rounded_rectangle([0, 0, w, h], radius, fill=fill, outline=outline, width=width)
+    return sprite, (0, 0)
+
+
+def _render_glow(radius: int, color: Tuple[int, int, int], intensity: int = 5) -> Tuple[Image.Image, Tuple[int, int]]:
+    """同心圆光晕，锚点为圆心"""
+    r, g, b = color
+    extent = radius + intensity * 2
+    sprite = Image.new("RGBA", (extent * 2 + 1, extent * 2 + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    for i in range(intensity, 0, -1):
+        alpha_factor = i / intensity * 0.3
+        glow_color = (int(r * alpha_factor), int(g * alpha_factor), int(b * alpha_factor))
+        glow_radius = radius + i * 2
+        draw.ellipse([extent - glow_radius, extent - glow_radius, extent + glow_radius, extent + glow_radius],
+                     fill=glow_color)
+    return sprite, (-extent, -extent)
+
+
+def _render_premium_bg(tube_centers: Tuple[Tuple[int, int], ...] = ()) -> Tuple[Image.Image, Tuple[int, int]]:
+    """辉光管时钟的整屏背景（分段底色、点阵纹理、管后光晕、底座），锚点为左上角"""
+    sprite = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    # 深色分段背景：顶部较暗，中间（辉光管区域），底部较亮
+    draw.rectangle([0, 0, W, H // 3], fill=(8, 8, 10))
+    draw.rectangle([0, H // 3, W, 2 * H // 3], fill=(12, 12, 15))
+    draw.rectangle([0, 2 * H // 3, W, H], fill=(18, 18, 22))
+    
+    # 细节点阵纹理（棋盘模式），一次画出所有点
+    draw.point([(x, y) for x in range(0, W, 8) for y in range(0, H, 8) if (x + y) % 16 < 8], fill=(20, 20, 24))
+    
+    # 辉光管环境光晕（两层轻微光晕，颜色太暗的层跳过）
+    for center_x, center_y in tube_centers:
+        for radius, alpha in [(30, 0.12), (20, 0.08)]:
+            glow_color = tuple(int(c * alpha) for c in (255, 140, 50))
+            for i in range(2, 0, -1):
+                glow = tuple(int(c * (i / 2 * alpha)) for c in glow_color)
+                glow_r = radius + i * 2
+                if min(glow) < 5:
+                    continue
+                draw.ellipse([center_x - glow_r, center_y - glow_r, center_x + glow_r, center_y + glow_r], fill=glow)
+    
+    # 底座：阴影、主体、高光
+    base_x, base_y, base_w, base_h = 25, 138, 270, 12
+    draw.rounded_rectangle([base_x + 2, base_y + 2, base_x + base_w + 2, base_y + base_h + 2], radius=6, fill=(5, 5, 8))
+    draw.rounded_rectangle([base_x, base_y, base_x + base_w, base_y + base_h], radius=6,
+                           fill=(25, 25, 32), outline=(45, 45, 55), width=2)
+    draw.line([base_x + 5, base_y + 2, base_x + base_w - 5, base_y + 2], fill=(50, 50, 60), width=1)
+    
+    # 顶部装饰线条
+    draw.line([10, 25, W - 10, 25], fill=(30, 30, 38), width=1)
+    draw.line([10, 27, W - 10, 27], fill=(20, 20, 28), width=1)
+    return sprite, (0, 0)
+
+
+# 装饰类型 -> 渲染函数（返回 RGBA 图像与相对锚点的偏移）
+DECORATIONS: Dict[str, Callable[..., Tuple[Image.Image, Tuple[int, int]]]] = {
+    "card": _render_card,
+    "glow": _render_glow,
+    "premium_bg": _render_premium_bg,
+}
+
+
+def _hashable(value: Any) -> Hashable:
+    """参数转换为可作缓存键的值（列表转元组）"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _build_decoration(kind: str, params: Dict[str, Any]) -> Tuple[Decoration, int]:
+    """渲染装饰并拆分为 RGB 图像与 1 位掩码，返回 (装饰, 字节数)"""
+    sprite, offset = DECORATIONS[kind](**params)
+    alpha = sprite.getchannel("A")
+    # 绘图调用不做抗锯齿，不透明度只有 0 / 255，1 位掩码贴图与直接绘制一致
+    mask = None if alpha.getextrema() == (255, 255) else alpha.convert("1")
+    size = sprite.width * sprite.height * 3 + (0 if mask is None else (sprite.width + 7) // 8 * sprite.height) + 64
+    return (sprite.convert("RGB"), mask, offset), size
+
+
+def blit_decoration(image: Image.Image, xy: Tuple[int, int], kind: str, **params) -> None:
+    """
+    绘制装饰（首次按参数渲染并缓存，之后每次只贴图一次）
+    
+    Args:
+        image: 目标图像
+        xy: 锚点（卡片、背景为左上角，光晕为圆心）
+        kind: 装饰类型，见 DECORATIONS
+        **params: 渲染参数（尺寸、圆角、颜色、强度等），同时作为缓存键
+    
+    例如 blit_decoration(img, (x, y), "card", w=140, h=50, radius=6, fill=(18, 22, 30))
+    与 draw.rounded_rectangle([x, y, x + 140, y + 50], 6, fill=(18, 22, 30)) 逐像素一致。
+    """
+    key = (kind, tuple(sorted((name, _hashable(value)) for name, value in params.items())))
+    rgb, mask, (dx, dy) = decoration_cache.get_or_create(key, lambda: _build_decoration(kind, params))
+    image.paste(rgb, (xy[0] + dx, xy[1] + dy), mask)
@@ -0,0 +1,223 @@
+"""RGB565 帧缓冲合成器
+
+页面原本先画一张 RGB888 的 PIL 图像，再由显示驱动整帧转换为 RGB565。
+Compositor 直接持有一块常驻的大端序 RGB565 帧缓冲（与显示驱动、共享内存
+导出的格式相同），贴图、填充、预乘透明度贴图与文字掩码都用 NumPy 切片
+运算完成，只处理被改动的矩形；提交时不再需要整帧转换，改动过的矩形同时
+作为变化区域提示交给显示驱动，局部刷新只比对这些区域。
+
+复杂图形（圆角矩形、多边形等）仍可用 PIL 绘制：draw_region() 把帧缓冲的
+一个子区域还原为 RGB 图像交给 ImageDraw，退出时再打包写回。
+
+混合在 RGB565 各通道的 5/6 位精度下进行：
+    dst = 预乘颜色 + dst * (255 - a) / 255
+与先在 RGB888 下混合再转换相比，每个通道最多差最低一位。
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+from ..core.rgb565 import rgb565_to_rgb888, rgb888_to_rgb565
+from .text_cache import get_text_raster
+from .themes import W, H
+
+Color = Tuple[int, int, int]
+Region = Tuple[int, int, int, int]
+
+
+def rgb565(color: Color) -> int:
+    """RGB888 颜色转换为 RGB565 值（低位截断，与帧转换一致）"""
+    r, g, b = color[:3]
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def _unpack(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """RGB565 拆分为 5/6/5 位通道（uint16）"""
+    pixels = pixels.astype(np.uint16)
+    return pixels >> 11, (pixels >> 5) & 0x3F, pixels & 0x1F
+
+
+class Compositor:
+    """常驻 RGB565 帧缓冲，记录自上次提交以来改动过的矩形"""
+    
+    def __init__(self, width: int = W, height: int = H, background: Color = (0, 0, 0)):
+        """
+        Args:
+            width: 帧宽度
+            height: 帧高度
+            background: 初始背景色
+        """
+        self.width = width
+        self.height = height
+        self.frame = np.empty((height, width), dtype=">u2")
+        self.frame.fill(rgb565(background))
+        # 改动过的矩形（闭区间）；None 表示整帧都可能变化
+        self._dirty: Optional[List[Region]] = None
+        self.blits = 0
+    
+    # ========== 改动区域 ==========
+    
+    def _clip(self, x: int, y: int, w: int, h: int) -> Optional[Tuple[int, int, int, int]]:
+        """把 (x, y, 宽, 高) 裁剪到帧内，返回半开区间 (x0, y0, x1, y1)，完全在外时返回 None"""
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
+    
+    def _touch(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """记录改动（半开区间）"""
+        if self._dirty is not None:
+            self._dirty.append((x0, y0, x1 - 1, y1 - 1))
+        self.blits += 1
+    
+    def mark_all(self) -> None:
+        """整帧标记为可能变化（下次提交整帧比对）"""
+        self._dirty = None
+    
+    def take_dirty(self) -> Optional[List[Region]]:
+        """
+        取出自上次调用以来改动过的矩形，并开始新一轮记录
+        
+        Returns:
+            闭区间矩形列表，可直接作为 display_frame 的变化区域提示；
+            创建后或 mark_all() 后第一次调用返回 None（整帧比对）
+        """
+        dirty = self._dirty
+        self._dirty = []
+        return dirty
+    
+    # ========== 绘制 ==========
+    
+    def fill(self, color: Color) -> None:
+        """整帧填充"""
+        self.frame.fill(rgb565(color))
+        self._touch(0, 0, self.width, self.height)
+    
+    def fill_rect(self, box: Region, color: Color) -> None:
+        """填充矩形（box 为闭区间，同 ImageDraw.rectangle）"""
+        x0, y0, x1, y1 = box
+        clip = self._clip(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+        if clip is None:
+            return
+        cx0, cy0, cx1, cy1 = clip
+        self.frame[cy0:cy1, cx0:cx1] = rgb565(color)
+        self._touch(*clip)
+    
+    def blit(self, pixels: np.ndarray, xy: Tuple[int, int]) -> None:
+        """不透明贴图（pixels 为任意字节序的 RGB565 数组 (高, 宽)）"""
+        x, y = xy
+        clip = self._clip(x, y, pixels.shape[1], pixels.shape[0])
+        if clip is None:
+            return
+        cx0, cy0, cx1, cy1 = clip
+        self.frame[cy0:cy1, cx0:cx1] = pixels[cy0 - y:cy1 - y, cx0 - x:cx1 - x]
+        self._touch(*clip)
+    
+    def blit_premultiplied(self, pixels: np.ndarray, alpha: np.ndarray, xy: Tuple[int, int]) -> None:
+        """
+        按透明度混合预乘颜色的贴图（如 NixieSprite.premul / alpha）
+        
+        Args:
+            pixels: 预乘透明度的 RGB565 数组 (高, 宽)，任意字节序
+            alpha: uint8 透明度 (高, 宽)
+        """
+        x, y = xy
+        clip = self._clip(x, y, pixels.shape[1], pixels.shape[0])
+        if clip is None:
+            return
+        cx0, cy0, cx1, cy1 = clip
+        src = (slice(cy0 - y, cy1 - y), slice(cx0 - x, cx1 - x))
+        region = self.frame[cy0:cy1, cx0:cx1]
+        inverse = 255 - alpha[src].astype(np.uint16)
+        sr, sg, sb = _unpack(pixels[src])
+        dr, dg, db = _unpack(region)
+        r = np.minimum(sr + (dr * inverse + 127) // 255, 0x1F)
+        g = np.minimum(sg + (dg * inverse + 127) // 255, 0x3F)
+        b = np.minimum(sb + (db * inverse + 127) // 255, 0x1F)
+        region[...] = (r << 11) | (g << 5) | b
+        self._touch(*clip)
+    
+    def blit_mask(self, mask: np.ndarray, xy: Tuple[int, int], color: Color) -> None:
+        """
+        按覆盖率掩码混合纯色（文字掩码、抗锯齿形状）
+        
+        Args:
+            mask: uint8 覆盖率 (高, 宽)
+            color: RGB888 颜色
+        """
+        x, y = xy
+        clip = self._clip(x, y, mask.shape[1], mask.shape[0])
+        if clip is None:
+            return
+        cx0, cy0, cx1, cy1 = clip
+        region = self.frame[cy0:cy1, cx0:cx1]
+        alpha = mask[cy0 - y:cy1 - y, cx0 - x:cx1 - x].astype(np.uint16)
+        inverse = 255 - alpha
+        dr, dg, db = _unpack(region)
+        r = (color[0] >> 3) * alpha + dr * inverse
+        g = (color[1] >> 2) * alpha + dg * inverse
+        b = (color[2] >> 3) * alpha + db * inverse
+        region[...] = (((r + 127) // 255) << 11) | (((g + 127) // 255) << 5) | ((b + 127) // 255)
+        self._touch(*clip)
+    
+    def text(self, xy: Tuple[int, int], text: str, fill: Color, font) -> None:
+        """绘制单行文字（与 ImageDraw.text 相同的坐标约定，掩码来自文字缓存）"""
+        mask, (x0, y0, _, _) = get_text_raster(text, font)
+        if mask is not None:
+            self.blit_mask(np.asarray(mask), (xy[0] + x0, xy[1] + y0), fill)
+    
+    def textbbox(self, xy: Tuple[int, int], text: str, font) -> Region:
+        """同 ImageDraw.textbbox(xy, text, font=font)"""
+        x0, y0, x1, y1 = get_text_raster(text, font)[1]
+        return x0 + xy[0], y0 + xy[1], x1 + xy[0], y1 + xy[1]
+    
+    def paste_image(self, image: Image.Image, xy: Tuple[int, int] = (0, 0)) -> None:
+        """把 PIL 图像（不透明）打包为 RGB565 写入帧缓冲"""
+        x, y = xy
+        clip = self._clip(x, y, image.width, image.height)
+        if clip is None:
+            return
+        cx0, cy0, cx1, cy1 = clip
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        pixels = np.asarray(image.crop((cx0 - x, cy0 - y, cx1 - x, cy1 - y)))
+        rgb888_to_rgb565(pixels, out=self.frame[cy0:cy1, cx0:cx1])
+        self._touch(*clip)
+    
+    @contextmanager
+    def draw_region(self, box: Region) -> Iterator[Image.Image]:
+        """
+        在子区域上使用 PIL 绘制
+        
+        产出该区域当前内容的 RGB 图像（坐标原点为 box 左上角），退出时写回帧缓冲：
+        
+            with compositor.draw_region((10, 10, 109, 59)) as region:
+                ImageDraw.Draw(region).rounded_rectangle([0, 0, 99, 49], 6, fill=color)
+        
+        Args:
+            box: 闭区间矩形
+        """
+        x0, y0, x1, y1 = box
+        clip = self._clip(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+        if clip is None:
+            yield Image.new("RGB", (max(1, x1 - x0 + 1), max(1, y1 - y0 + 1)))
+            return
+        cx0, cy0, cx1, cy1 = clip
+        image = Image.fromarray(rgb565_to_rgb888(self.frame[cy0:cy1, cx0:cx1]), "RGB")
+        if (cx0, cy0, cx1, cy1) != (x0, y0, x1 + 1, y1 + 1):
+            # 部分超出帧：按完整尺寸交给调用方，写回时再裁剪
+            full = Image.new("RGB", (x1 - x0 + 1, y1 - y0 + 1))
+            full.paste(image, (cx0 - x0, cy0 - y0))
+            image = full
+        yield image
+        self.paste_image(image, (x0, y0))
+    
+    def to_image(self) -> Image.Image:
+        """当前帧还原为 RGB 图像（页面切换动画、硬件滚动等仍以图像为输入的路径使用）"""
+        return Image.fromarray(rgb565_to_rgb888(self.frame), "RGB")
+    
+    def get_stats(self) -> dict:
+        """获取合成统计"""
+        return {"compositor_blits": self.blits}
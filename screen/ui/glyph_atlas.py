@@ -0,0 +1,200 @@
+"""字形图集模块
+
+把小字号字体（f_tiny / f_sm）的常用字形预先栅格化到一张 NumPy 图集中：
+ASCII 在创建时一次性栅格化，中文等其他字符在第一次出现时追加。之后组字
+不再调用 FreeType，而是按字符查表得到每个字形在图集中的列范围与落笔位置，
+用一次花式索引把整串文字的覆盖率掩码取出，再一次性混合到帧缓冲。
+
+图集每列高度为字体行高（ascent + descent），字形按 "la" 锚点（左上为原点）
+排布，因此组字只有水平方向的偏移。落笔位置为各字形前进宽度累加后四舍五入，
+与 Pillow 基本排版一致；相邻字形墨迹重叠处取较大的覆盖率。
+"""
+import threading
+import numpy as np
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+ASCII = "".join(chr(c) for c in range(32, 127))
+
+
+class GlyphAtlas:
+    """单个字体的字形图集"""
+    
+    def __init__(self, font: ImageFont.FreeTypeFont, charset: str = ASCII):
+        """
+        Args:
+            font: TrueType 字体
+            charset: 预先栅格化的字符
+        """
+        self.font = font
+        ascent, descent = font.getmetrics()
+        self.ascent = ascent
+        self.height = ascent + descent
+        # 第 0 列保持全 0，组字时字形之间的空隙都指向这一列
+        self._atlas = np.zeros((self.height, 256), dtype=np.uint8)
+        self._used = 1
+        # 字符 -> (图集起始列, 宽度, 左侧偏移, 前进宽度)
+        self._glyphs: Dict[str, Tuple[int, int, int, float]] = {}
+        self._lock = threading.Lock()
+        self.rasterized = 0
+        self.add(charset)
+    
+    def add(self, chars: Iterable[str]) -> None:
+        """把尚未收录的字符栅格化并追加到图集"""
+        with self._lock:
+            for ch in chars:
+                if ch not in self._glyphs:
+                    self._add_glyph(ch)
+    
+    def _add_glyph(self, ch: str) -> None:
+        """栅格化单个字形（调用方持有锁）"""
+        x0, _, x1, _ = self.font.getbbox(ch)
+        width = max(0, x1 - x0)
+        col = self._used
+        if width:
+            if col + width > self._atlas.shape[1]:
+                grown = np.zeros((self.height, max(self._atlas.shape[1] * 2, col + width)), dtype=np.uint8)
+                grown[:, :col] = self._atlas[:, :col]
+                self._atlas = grown
+            glyph = Image.new("L", (width, self.height), 0)
+            ImageDraw.Draw(glyph).text((-x0, 0), ch, 255, self.font)
+            self._atlas[:, col:col + width] = np.asarray(glyph)
+            self._used += width
+        self._glyphs[ch] = (col, width, x0, self.font.getlength(ch))
+        self.rasterized += 1
+    
+    @property
+    def nbytes(self) -> int:
+        """图集占用的字节数"""
+        return self._atlas.nbytes
+    
+    def render_mask(self, text: str) -> Tuple[np.ndarray, int]:
+        """
+        组字
+        
+        Args:
+            text: 单行文字
+        
+        Returns:
+            (覆盖率掩码 (行高, 宽) uint8, 掩码左边缘相对落笔原点的偏移)
+        """
+        mask, left, _ = self._compose(text)
+        return mask, left
+    
+    def render(self, text: str) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+        """
+        组字并裁剪到与 font.getbbox(text) 相同的边界框
+        
+        Returns:
+            (掩码 uint8, 边界框)；边界框的左右边缘包含前进宽度，下边缘不高于基线
+        """
+        mask, left, advance = self._compose(text)
+        rows = np.flatnonzero(mask.any(axis=1))
+        if rows.size:
+            y0, y1 = int(rows[0]), max(int(rows[-1]) + 1, self.ascent)
+        else:
+            y0 = y1 = self.ascent if text else 0
+        x0 = min(0, left)
+        x1 = max(left + mask.shape[1], advance)
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        out[:, left - x0:left - x0 + mask.shape[1]] = mask[y0:y1]
+        return out, (x0, y0, x1, y1)
+    
+    def _compose(self, text: str) -> Tuple[np.ndarray, int, int]:
+        """组字，返回 (整行高的掩码, 左边缘偏移, 取整后的总前进宽度)"""
+        missing = [ch for ch in text if ch not in self._glyphs]
+        if missing:
+            self.add(missing)
+        if not text:
+            return np.zeros((self.height, 0), dtype=np.uint8), 0, 0
+        glyphs = np.array([self._glyphs[ch] for ch in text], dtype=np.float64)
+        atlas = self._atlas
+        cols = glyphs[:, 0].astype(np.intp)
+        widths = glyphs[:, 1].astype(np.intp)
+        # 落笔位置：前进宽度累加后取整，再加字形左侧偏移
+        pens = np.rint(np.concatenate(([0.0], np.cumsum(glyphs[:, 3])))).astype(np.intp)
+        advance = int(pens[-1])
+        xs = pens[:-1] + glyphs[:, 2].astype(np.intp)
+        
+        inked = widths > 0
+        if not inked.any():
+            return np.zeros((self.height, 0), dtype=np.uint8), 0, advance
+        cols, widths, xs = cols[inked], widths[inked], xs[inked]
+        left = int(xs.min())
+        right = int((xs + widths).max())
+        
+        # 展开每个字形的列：目标列与图集列一一对应
+        offsets = np.arange(int(widths.sum())) - np.repeat(np.cumsum(widths) - widths, widths)
+        dest = np.repeat(xs - left, widths) + offsets
+        src = np.repeat(cols, widths) + offsets
+        if np.all(xs[1:] >= xs[:-1] + widths[:-1]):
+            # 字形互不重叠（小字号的常见情况）：一次花式索引取出整串
+            index = np.zeros(right - left, dtype=np.intp)
+            index[dest] = src
+            return atlas[:, index], left, advance
+        mask_t = np.zeros((right - left, self.height), dtype=np.uint8)
+        np.maximum.at(mask_t, dest, atlas.T[src])
+        return np.ascontiguousarray(mask_t.T), left, advance
+    
+    def draw_text(self, image: Image.Image, xy: Tuple[int, int], text: str, fill) -> None:
+        """在 PIL 图像上绘制文字（掩码混合由 Image.paste 完成）"""
+        mask, left = self.render_mask(text)
+        if mask.shape[1]:
+            image.paste(fill, (xy[0] + left, xy[1]), Image.fromarray(mask, "L"))
+    
+    def blit(self, frame: np.ndarray, xy: Tuple[int, int], text: str, fill: Tuple[int, int, int]) -> None:
+        """
+        直接混合到 (H, W, 3) uint8 帧缓冲
+        
+        dst = (dst * (255 - a) + fill * a + 127) // 255，超出帧缓冲的部分被裁掉。
+        """
+        mask, left = self.render_mask(text)
+        x = xy[0] + left
+        y = xy[1]
+        height, width = frame.shape[:2]
+        cx0, cy0 = max(x, 0), max(y, 0)
+        cx1, cy1 = min(x + mask.shape[1], width), min(y + mask.shape[0], height)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        alpha = mask[cy0 - y:cy1 - y, cx0 - x:cx1 - x, None].astype(np.uint16)
+        region = frame[cy0:cy1, cx0:cx1]
+        color = np.array(fill, dtype=np.uint16)
+        region[:] = (region * (255 - alpha) + color * alpha + 127) // 255
+    
+    def get_stats(self) -> dict:
+        """获取图集统计"""
+        return {"glyphs": len(self._glyphs), "atlas_columns": self._used, "atlas_bytes": self.nbytes}
+
+
+_atlases: Dict[Hashable, GlyphAtlas] = {}
+
+
+def _font_key(font) -> Hashable:
+    """字体标识（与文字缓存一致）"""
+    return (font.path, font.size, font.index, font.layout_engine)
+
+
+def register_atlas(font, charset: str = ASCII) -> Optional[GlyphAtlas]:
+    """
+    为字体创建字形图集，之后 CachedDraw 栅格化该字体的新文字时由图集组字
+    
+    Returns:
+        图集；非 TrueType 字体返回 None
+    """
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        return None
+    key = _font_key(font)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(font, charset)
+        _atlases[key] = atlas
+    else:
+        atlas.add(charset)
+    return atlas
+
+
+def get_atlas(font) -> Optional[GlyphAtlas]:
+    """字体已注册的图集，未注册时返回 None"""
+    if not _atlases or not isinstance(font, ImageFont.FreeTypeFont):
+        return None
+    return _atlases.get(_font_key(font))
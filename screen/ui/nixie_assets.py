@@ -0,0 +1,279 @@
+"""辉光管数字素材编译模块
+
+时钟页的 10 张辉光管数字 PNG（约 150x357 RGBA）原本在第一次绘制时逐张解码、
+LANCZOS 缩放到 110 像素高，再以 RGBA 图像常驻内存。这里把缩放后的结果一次性
+编译为预乘透明度的 RGB565 + 透明度平面，保存在 PNG 旁边（{数字}.nxa），之后
+启动时直接 mmap 文件，不再解码 PNG，像素页由文件缓存承担，不占用进程堆内存。
+
+文件布局（小端序）：
+
+    偏移  类型     字段
+    0     4s       魔数 b"NXA1"
+    4     uint16   版本
+    6     uint16   头部长度（像素数据起始偏移）
+    8     uint16   宽度
+    10    uint16   高度
+    32    32s      源哈希：sha256(版本, 目标高度, 宽度缩放, PNG 文件内容)
+    64    ...      预乘 RGB565，宽 x 高 x 2 字节（小端序，即 Pillow 的 "BGR;16" 原始格式）
+    ...   ...      透明度，宽 x 高 字节
+
+PNG 内容或缩放参数变化后源哈希不再匹配，加载时自动重新编译。
+
+贴图时由 Pillow 一次解码为预乘透明度的 RGBa 图像，按 RGBa 掩码贴图
+（dst = 预乘颜色 + dst * (255 - a) / 255），比原来按 RGBA 掩码贴图快一倍。
+解码结果放在按字节计容量的小缓存中，只保留最近显示的几个数字。预乘颜色
+先量化到 RGB565，与 RGBA 贴图相比每个通道最多差 8 级，量化到屏幕的 RGB565
+后通常只差最低一位。
+
+用法（可选，预先编译；素材目录只读时编译结果只保存在内存中）:
+    python -m screen.ui.nixie_assets [--dir DIR] [--force]
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import numpy as np
+from typing import Dict, Optional, Tuple
+from PIL import Image
+
+from ..utils.cache import ByteLRUCache
+
+MAGIC = b"NXA1"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sHHHH")
+_HASH_OFFSET = 32
+
+# 素材目录名与时钟页的管子尺寸
+NIXIE_DIR_NAME = "辉光管素材图"
+TUBE_HEIGHT = 110
+WIDTH_SCALE = 1.45
+DIGITS = "0123456789"
+
+# 解码后的 RGBa 贴图缓存：每个数字约 30 KB，够放下时钟同时显示的 4 个数字
+nixie_cache = ByteLRUCache(160 * 1024, name="nixie_cache")
+
+
+def source_hash(png_data: bytes, height: int = TUBE_HEIGHT, width_scale: float = WIDTH_SCALE) -> bytes:
+    """素材源哈希（PNG 内容与缩放参数）"""
+    digest = hashlib.sha256(struct.pack("<Hhd", VERSION, height, width_scale))
+    digest.update(png_data)
+    return digest.digest()
+
+
+def compile_png(png_path: str, height: int = TUBE_HEIGHT, width_scale: float = WIDTH_SCALE) -> bytes:
+    """
+    把一张数字 PNG 编译为素材文件内容
+    
+    缩放方式与原 draw_clock 一致：高度缩放到 height，宽度按同一比例再乘 width_scale。
+    """
+    with open(png_path, "rb") as f:
+        png_data = f.read()
+    with Image.open(png_path) as src:
+        rgba = src.convert("RGBA")
+    ratio = height / rgba.height
+    rgba = rgba.resize((int(rgba.width * ratio * width_scale), height), Image.Resampling.LANCZOS)
+    
+    pixels = np.asarray(rgba, dtype=np.uint16)
+    alpha = pixels[..., 3]
+    # 预乘后按 RGB565Converter 的方式截断量化
+    premul = (pixels[..., :3] * alpha[..., None] + 127) // 255
+    rgb565 = ((premul[..., 0] & 0xF8) << 8) | ((premul[..., 1] & 0xFC) << 3) | (premul[..., 2] >> 3)
+    
+    header = bytearray(HEADER_SIZE)
+    _HEADER.pack_into(header, 0, MAGIC, VERSION, HEADER_SIZE, rgba.width, height)
+    header[_HASH_OFFSET:_HASH_OFFSET + 32] = source_hash(png_data, height, width_scale)
+    return bytes(header) + rgb565.astype("<u2").tobytes() + alpha.astype(np.uint8).tobytes()
+
+
+class NixieSprite:
+    """单个数字的素材（像素为文件缓冲区上的 NumPy 视图）"""
+    
+    def __init__(self, path: str, buffer, width: int, height: int):
+        """
+        Args:
+            path: 编译产物路径
+            buffer: 整个素材文件的缓冲区（mmap 或 bytes）
+            width, height: 素材尺寸
+        """
+        # 解码缓存键：同一路径重新编译后源哈希不同，不会取到旧贴图
+        self.key = (path, bytes(buffer[_HASH_OFFSET:_HASH_OFFSET + 32]))
+        self.width = width
+        self.height = height
+        count = width * height
+        # 保留缓冲区引用（mmap 或 bytes），视图依赖它
+        self._buffer = buffer
+        self.premul = np.frombuffer(buffer, dtype="<u2", count=count, offset=HEADER_SIZE).reshape(height, width)
+        self.alpha = np.frombuffer(buffer, dtype=np.uint8, count=count,
+                                   offset=HEADER_SIZE + count * 2).reshape(height, width)
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+    
+    def _decode(self) -> Tuple[Image.Image, int]:
+        """解码为预乘透明度的 RGBa 图像"""
+        rgb = Image.frombuffer("RGB", self.size, self.premul, "raw", "BGR;16", 0, 1)
+        alpha = Image.frombuffer("L", self.size, self.alpha, "raw", "L", 0, 1)
+        image = Image.merge("RGBa", (*rgb.split(), alpha))
+        return image, self.width * self.height * 4
+    
+    def image(self) -> Image.Image:
+        """RGBa 贴图（来自解码缓存）"""
+        return nixie_cache.get_or_create(self.key, self._decode)
+    
+    def blit(self, image: Image.Image, xy: Tuple[int, int]) -> None:
+        """混合到 RGB 图像（等价于 image.paste(rgba, xy, rgba)，颜色先经 RGB565 量化）"""
+        tile = self.image()
+        image.paste(tile, xy, tile)
+
+
+class NixieAssets:
+    """一个素材目录下的全部数字素材（按需编译并 mmap）"""
+    
+    def __init__(self, directory: str, height: int = TUBE_HEIGHT, width_scale: float = WIDTH_SCALE, logger=None):
+        """
+        Args:
+            directory: 辉光管素材目录（含 0.png ~ 9.png）
+            height: 管子高度
+            width_scale: 宽度缩放
+            logger: 日志记录器
+        """
+        self.directory = directory
+        self.height = height
+        self.width_scale = width_scale
+        self._logger = logger
+        self._sprites: Dict[str, NixieSprite] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.compiled = 0
+        self.mapped = 0
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    def asset_path(self, digit: str) -> str:
+        """数字对应的编译产物路径"""
+        return os.path.join(self.directory, f"{digit}.nxa")
+    
+    def _map(self, path: str, expected_hash: bytes) -> Optional[NixieSprite]:
+        """mmap 已编译的素材，文件缺失、损坏或源哈希不匹配时返回 None"""
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) >= HEADER_SIZE:
+            magic, version, header_size, width, height = _HEADER.unpack_from(mapped, 0)
+            if (magic == MAGIC and version == VERSION and header_size == HEADER_SIZE
+                    and mapped[_HASH_OFFSET:_HASH_OFFSET + 32] == expected_hash
+                    and len(mapped) >= HEADER_SIZE + width * height * 3):
+                return NixieSprite(path, mapped, width, height)
+        mapped.close()
+        return None
+    
+    def _load_digit(self, digit: str, force: bool = False) -> Optional[NixieSprite]:
+        """加载单个数字：优先 mmap 编译产物，过期或缺失时重新编译"""
+        png_path = os.path.join(self.directory, f"{digit}.png")
+        if not os.path.exists(png_path):
+            self._log("warning", f"素材文件不存在: {png_path}")
+            return None
+        with open(png_path, "rb") as f:
+            expected = source_hash(f.read(), self.height, self.width_scale)
+        path = self.asset_path(digit)
+        if not force:
+            sprite = self._map(path, expected)
+            if sprite is not None:
+                self.mapped += 1
+                return sprite
+        
+        data = compile_png(png_path, self.height, self.width_scale)
+        self.compiled += 1
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 素材目录只读：本次运行使用内存中的编译结果
+            self._log("warning", f"保存辉光管素材 {path} 失败: {e}")
+            _, _, _, width, height = _HEADER.unpack_from(data, 0)
+            return NixieSprite(path, data, width, height)
+        sprite = self._map(path, expected)
+        if sprite is not None:
+            self.mapped += 1
+        return sprite
+    
+    def load(self, force: bool = False) -> Dict[str, NixieSprite]:
+        """
+        加载全部数字素材（只在第一次调用或 force 时读取文件）
+        
+        Args:
+            force: 忽略已有编译产物，全部重新编译
+        
+        Returns:
+            数字字符 -> 素材
+        """
+        if self._loaded and not force:
+            return self._sprites
+        with self._lock:
+            if self._loaded and not force:
+                return self._sprites
+            sprites = {}
+            for digit in DIGITS:
+                try:
+                    sprite = self._load_digit(digit, force)
+                except Exception as e:
+                    self._log("warning", f"加载辉光管素材 {digit}.png 失败: {e}")
+                    continue
+                if sprite is not None:
+                    sprites[digit] = sprite
+            if self.compiled:
+                self._log("info", f"辉光管素材已编译 {self.compiled} 张")
+            self._sprites = sprites
+            self._loaded = True
+        return self._sprites
+    
+    def get_stats(self) -> dict:
+        """获取素材统计"""
+        return {
+            "nixie_digits": len(self._sprites),
+            "nixie_compiled": self.compiled,
+            "nixie_mapped": self.mapped,
+            "nixie_bytes": sum(s.width * s.height * 3 for s in self._sprites.values()),
+        }
+
+
+_assets: Dict[Tuple[str, int, float], NixieAssets] = {}
+
+
+def get_nixie_assets(directory: str, height: int = TUBE_HEIGHT, width_scale: float = WIDTH_SCALE,
+                     logger=None) -> Dict[str, NixieSprite]:
+    """获取素材目录的全部数字素材（同一目录与尺寸在进程内只加载一次）"""
+    key = (os.path.abspath(directory), height, width_scale)
+    assets = _assets.get(key)
+    if assets is None:
+        assets = _assets.setdefault(key, NixieAssets(directory, height, width_scale, logger))
+    return assets.load()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="编译辉光管数字素材")
+    default_dir = os.path.join(os.path.dirname(__file__), "..", "..", NIXIE_DIR_NAME)
+    parser.add_argument("--dir", default=default_dir, help="素材目录")
+    parser.add_argument("--force", action="store_true", help="忽略已有编译产物，全部重新编译")
+    args = parser.parse_args()
+    
+    assets = NixieAssets(args.dir)
+    sprites = assets.load(force=args.force)
+    for digit, sprite in sprites.items():
+        print(f"  {digit}: {sprite.width}x{sprite.height} -> {assets.asset_path(digit)}")
+    print(assets.get_stats())
+
+
+if __name__ == "__main__":
+    main()
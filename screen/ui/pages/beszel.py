@@ -1,53 +1,60 @@
 """Beszel 监控页面模块"""
-from PIL import Image, ImageDraw
-from typing import Any
-from ..themes import W, H, get_time_based_colors, is_night_mode, create_dynamic_background
-from ..components import adjust_brightness, draw_page_header
+from PIL import Image
+from typing import Any, List
+from ..themes import W, H
+from ..widgets import Card, Header, Label, Widget, WidgetPage
 
-NIGHT_DARKNESS_FACTOR = 0.3
+CARD_Y = 30
+CARD_H = 50
+MAX_CARDS = 4
 
 
-def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
-    """渲染Beszel服务器监控页面"""
-    night = is_night_mode()
-    
-    img = create_dynamic_background()
-    draw = ImageDraw.Draw(img)
-    bg_top, _, accent = get_time_based_colors()
-    
-    # 页面标题
-    draw_page_header(draw, "服务器监控", (100, 200, 150), fonts['f_sm'])
-    
-    # 获取服务器数据
-    clients = data_store.get("beszel_clients", [])
-    
-    if not clients:
-        draw.text((W // 2 - 50, H // 2 - 10), "暂无服务器数据", (120, 130, 150), fonts['f_mid'])
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
-    
-    # 显示服务器列表
-    y_start = 30
-    card_h = 50
-    
-    for idx, client in enumerate(clients[:4]):
-        cy = y_start + idx * (card_h + 3)
-        
-        # 卡片背景
-        draw.rounded_rectangle([5, cy, W - 5, cy + card_h], 6,
-                              fill=(bg_top[0] + 8, bg_top[1] + 10, bg_top[2] + 14))
-        
-        # 服务器名称
-        name = client.get("name", "Unknown")[:15]
-        draw.text((10, cy + 5), name, (200, 210, 225), fonts['f_sm'])
-        
-        # CPU 和内存使用率
-        cpu = client.get("cpu", 0)
-        mem = client.get("mem", 0)
+def _usage_color(value: float) -> tuple:
+    """使用率对应的颜色"""
+    return (255, 100, 100) if value > 80 else (255, 200, 100) if value > 60 else (100, 200, 150)
+
+
+def _client(index: int, clients: list):
+    """第 index 台服务器的数据，不存在时返回 None"""
+    return clients[index] if clients and index < len(clients) else None
+
+
+def _build_widgets() -> List[Widget]:
+    """页面控件：标题栏、空数据提示，以及每台服务器的卡片"""
+    widgets: List[Widget] = [
+        Header("服务器监控", (100, 200, 150)),
+        Label(W // 2 - 50, H // 2 - 10, 120, 20, ("beszel_clients",),
+              lambda clients: None if clients else "暂无服务器数据", font="f_mid", color=(120, 130, 150)),
+    ]
+    for idx in range(MAX_CARDS):
+        cy = CARD_Y + idx * (CARD_H + 3)
         
-        cpu_color = (255, 100, 100) if cpu > 80 else (255, 200, 100) if cpu > 60 else (100, 200, 150)
-        mem_color = (255, 100, 100) if mem > 80 else (255, 200, 100) if mem > 60 else (100, 200, 150)
+        def client_field(field, fmt, colored=False, idx=idx):
+            def select(clients):
+                client = _client(idx, clients)
+                if client is None:
+                    return None
+                value = client.get(field, 0)
+                return (fmt(value), _usage_color(value)) if colored else fmt(value)
+            return select
         
-        draw.text((10, cy + 25), f"CPU: {cpu}%", cpu_color, fonts['f_tiny'])
-        draw.text((80, cy + 25), f"MEM: {mem}%", mem_color, fonts['f_tiny'])
-    
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        widgets += [
+            Card(5, cy, W - 9, CARD_H + 1, ("beszel_clients",),
+                 lambda clients, idx=idx: True if _client(idx, clients) else None, radius=6),
+            Label(10, cy + 5, W - 20, 18, ("beszel_clients",),
+                  client_field("name", lambda name: str(name or "Unknown")[:15])),
+            Label(10, cy + 25, 68, 14, ("beszel_clients",),
+                  client_field("cpu", lambda cpu: f"CPU: {cpu}%", colored=True), font="f_tiny"),
+            Label(80, cy + 25, 80, 14, ("beszel_clients",),
+                  client_field("mem", lambda mem: f"MEM: {mem}%", colored=True), font="f_tiny"),
+        ]
+    return widgets
+
+
+# 保留模式页面：只重绘数据变化的控件，变化矩形见 page.dirty_regions
+page = WidgetPage(_build_widgets())
+
+
+def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
+    """渲染Beszel服务器监控页面（返回的画布在下次渲染时会被更新）"""
+    return page.render(data_store, fonts)
@@ -2,16 +2,11 @@
 from PIL import Image, ImageDraw
 from datetime import datetime
 from typing import Any
-from ..themes import W, H, get_time_based_colors, is_night_mode, create_dynamic_background
-from ..components import adjust_brightness
-
-NIGHT_DARKNESS_FACTOR = 0.3
+from ..themes import W, H, get_time_based_colors, create_dynamic_background
 
 
 def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     """渲染B站主播监控页面"""
-    night = is_night_mode()
-    
     img = create_dynamic_background()
     draw = ImageDraw.Draw(img)
     bg_top, _, accent = get_time_based_colors()
@@ -46,7 +41,7 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     
     if not streamers:
         draw.text((W // 2 - 40, H // 2 - 10), "暂无关注主播", (100, 105, 120), fonts['f_sm'])
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        return img
     
     # 按直播状态排序
     sorted_streamers = sorted(streamers, key=lambda x: (x.get("live_status", 0) != 1, -x.get("online", 0)))
@@ -87,4 +82,4 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
         else:
             draw.text((cx + 5, cy + 14), "未开播", (80, 85, 100), fonts['f_tiny'])
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
@@ -2,18 +2,14 @@
 from PIL import Image, ImageDraw
 from datetime import datetime, timedelta
 from typing import Any
-from ..themes import W, H, get_time_based_colors, is_night_mode, create_dynamic_background
-from ..components import adjust_brightness
+from ..themes import W, H, get_time_based_colors, create_dynamic_background
 
-NIGHT_DARKNESS_FACTOR = 0.3
 TARGET_DATE = datetime(2026, 2, 17)
 TARGET_NAME = "CNY 2026"
 
 
 def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     """渲染日历倒数日页面"""
-    night = is_night_mode()
-    
     img = create_dynamic_background()
     draw = ImageDraw.Draw(img)
     
@@ -41,4 +37,4 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     date_x = (W - date_w) // 2
     draw.text((date_x, 180), date_text, (150, 160, 180), fonts['f_mid'])
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
@@ -9,12 +9,10 @@ from PIL import Image, ImageDraw
 from zhdate import ZhDate
 from typing import Any
 
+from ..nixie_assets import NIXIE_DIR_NAME, get_nixie_assets
+
 # 这些将来需要从配置或参数传入
 W, H = 320, 240
-NIGHT_DARKNESS_FACTOR = 0.3
-
-# 全局素材缓存
-NIXIE_IMAGE_CACHE = {}
 
 
 def render(data_store: Any, fonts: dict, base_dir: str, logger=None) -> Image.Image:
@@ -30,8 +28,7 @@ def render(data_store: Any, fonts: dict, base_dir: str, logger=None) -> Image.Im
     Returns:
         PIL Image 对象
     """
-    from ..themes import get_time_based_colors, is_night_mode
-    from ..components import adjust_brightness
+    from ..themes import get_time_based_colors, is_night_mode, paste_header_gradient
     
     now = datetime.now()
     night = is_night_mode()
@@ -46,13 +43,8 @@ def render(data_store: Any, fonts: dict, base_dir: str, logger=None) -> Image.Im
     # ========== 1. 顶部信息栏 ==========
     header_h = 28
     
-    # 顶部渐变背景
-    for hy in range(header_h):
-        alpha = hy / header_h
-        r = int(15 * (1 - alpha) + 8 * alpha)
-        g = int(18 * (1 - alpha) + 10 * alpha)
-        b = int(25 * (1 - alpha) + 15 * alpha)
-        draw.rectangle([0, hy, W, hy + 1], fill=(r, g, b))
+    # 顶部渐变背景（按时段缓存的图层）
+    paste_header_gradient(img, header_h, (15, 18, 25), (8, 10, 15))
     
     # 底部发光线
     draw.rectangle([0, header_h - 2, W, header_h - 1], fill=(50, 80, 120))
@@ -96,38 +88,15 @@ def render(data_store: Any, fonts: dict, base_dir: str, logger=None) -> Image.Im
     date_color = (255, 180, 120) if is_weekend else (220, 225, 235)
     draw.text((date_x, 8), date_text, date_color, fonts['f_sm'])
     
-    # ========== 2. 加载辉光管素材图片 (带全局缓存) ==========
-    global NIXIE_IMAGE_CACHE
-    
-    nixie_dir = os.path.join(base_dir, "辉光管素材图")
-    tube_target_h = 110
-    width_scale = 1.45
-    
-    # 如果缓存为空，则加载一次
-    if not NIXIE_IMAGE_CACHE:
-        if logger:
-            logger.info("正在加载辉光管素材至内存缓存...")
-        for d in range(10):
-            try:
-                img_path = f"{nixie_dir}/{d}.png"
-                if os.path.exists(img_path):
-                    nixie_img = Image.open(img_path).convert("RGBA")
-                    ratio = tube_target_h / nixie_img.height
-                    new_w = int(nixie_img.width * ratio * width_scale)
-                    nixie_img = nixie_img.resize((new_w, tube_target_h), Image.Resampling.LANCZOS)
-                    NIXIE_IMAGE_CACHE[str(d)] = nixie_img
-            except Exception as e:
-                if logger:
-                    logger.warning(f"加载辉光管素材 {d}.png 失败: {e}")
-    
-    nixie_images = NIXIE_IMAGE_CACHE
+    # ========== 2. 加载辉光管素材（编译为 RGB565 并 mmap，进程内只加载一次） ==========
+    nixie_images = get_nixie_assets(os.path.join(base_dir, NIXIE_DIR_NAME), logger=logger)
     
     # ========== 3. 绘制时间数字 ==========
     time_str = now.strftime("%H%M")
     digits = list(time_str)
     
     if nixie_images:
-        sample_img = list(nixie_images.values())[0]
+        sample_img = next(iter(nixie_images.values()))
         tube_w = sample_img.width
     else:
         tube_w = 75
@@ -141,8 +110,7 @@ def render(data_store: Any, fonts: dict, base_dir: str, logger=None) -> Image.Im
     curr_x = start_x
     for i, digit in enumerate(digits):
         if digit in nixie_images:
-            nixie_img = nixie_images[digit]
-            img.paste(nixie_img, (curr_x, base_y), nixie_img)
+            nixie_images[digit].blit(img, (curr_x, base_y))
         else:
             draw.text((curr_x + 15, base_y + 30), digit, (255, 140, 40), fonts.get('f_renix_big', fonts['f_sm']))
         
@@ -175,4 +143,4 @@ def render(data_store: Any, fonts: dict, base_dir: str, logger=None) -> Image.Im
         btc_str = f"BTC:{btc_price/1000:.1f}K"
         draw.text((W // 2 - 30, text_y), btc_str, (255, 200, 100), fonts['f_tiny'])
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
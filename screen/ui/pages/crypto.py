@@ -1,16 +1,11 @@
 """加密货币页面模块"""
 from PIL import Image, ImageDraw
 from typing import Any
-from ..themes import W, H, get_time_based_colors, is_night_mode, create_dynamic_background
-from ..components import adjust_brightness
-
-NIGHT_DARKNESS_FACTOR = 0.3
+from ..themes import W, H, get_time_based_colors, create_dynamic_background
 
 
 def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     """渲染加密货币监控页面"""
-    night = is_night_mode()
-    
     # 使用动态背景
     img = create_dynamic_background()
     draw = ImageDraw.Draw(img)
@@ -86,4 +81,4 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
         else:
             draw.text((cx + 3, content_y + 8), coin_name, text_dim, fonts['f_tiny'])
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
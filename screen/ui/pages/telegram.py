@@ -1,16 +1,12 @@
 """Telegram 消息页面模块"""
 from PIL import Image, ImageDraw
 from typing import Any
-from ..themes import W, H, get_time_based_colors, is_night_mode, create_dynamic_background
-from ..components import adjust_brightness, draw_page_header
-
-NIGHT_DARKNESS_FACTOR = 0.3
+from ..themes import W, H, get_time_based_colors, create_dynamic_background
+from ..components import blit_decoration, draw_page_header
 
 
 def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     """渲染Telegram消息页面"""
-    night = is_night_mode()
-    
     img = create_dynamic_background()
     draw = ImageDraw.Draw(img)
     bg_top, _, accent = get_time_based_colors()
@@ -23,7 +19,7 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
     
     if not messages:
         draw.text((W // 2 - 40, H // 2 - 10), "暂无消息", (120, 130, 150), fonts['f_mid'])
-        return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+        return img
     
     # 显示最新的3条消息
     y_start = 30
@@ -33,8 +29,8 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
         cy = y_start + idx * (card_h + 5)
         
         # 卡片背景
-        draw.rounded_rectangle([5, cy, W - 5, cy + card_h], 6,
-                              fill=(bg_top[0] + 8, bg_top[1] + 10, bg_top[2] + 14))
+        blit_decoration(img, (5, cy), "card", w=W - 10, h=card_h, radius=6,
+                        fill=(bg_top[0] + 8, bg_top[1] + 10, bg_top[2] + 14))
         
         # 频道名
         channel = msg.get("channel", "Unknown")[:15]
@@ -50,4 +46,4 @@ def render(data_store: Any, fonts: dict, **kwargs) -> Image.Image:
         time_str = msg.get("time", "")
         draw.text((10, cy + 45), time_str, (120, 130, 150), fonts['f_tiny'])
     
-    return adjust_brightness(img, NIGHT_DARKNESS_FACTOR) if night else img
+    return img
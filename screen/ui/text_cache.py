@@ -0,0 +1,110 @@
+"""文字栅格缓存模块
+
+页面每帧都会重绘大量不变的文字（标题、星期、标签、价格），每次 draw.text 都要
+经过 FreeType 排版与栅格化。这里把文字栅格化为 L 模式的覆盖率掩码并缓存，
+绘制时用 Image.paste(颜色, 位置, 掩码) 一次贴上，结果与 draw.text 逐像素一致。
+
+缓存键为 (文字, 字体)，不含颜色：掩码只记录字形覆盖率，颜色在贴图时才混合，
+同一文字换颜色（涨跌色、夜间色）仍可命中同一条目，缓存条目数与内存也更少。
+"""
+from typing import Any, Hashable, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+from ..utils.cache import ByteLRUCache
+from .glyph_atlas import get_atlas
+
+# 默认容量：320x240 页面上常见文字的掩码约几百字节到几 KB
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+text_cache = ByteLRUCache(DEFAULT_MAX_BYTES, name="text_cache")
+
+Raster = Tuple[Optional[Image.Image], Tuple[int, int, int, int]]
+
+
+def configure_text_cache(max_bytes: int) -> None:
+    """调整文字缓存容量"""
+    text_cache.resize(max_bytes)
+
+
+def font_key(font: Any) -> Hashable:
+    """
+    字体的缓存标识
+    
+    TrueType 字体按 (文件, 字号, 字形索引, 排版引擎) 区分，同一字体文件重复加载
+    也能共享条目；其他字体对象按对象身份区分。
+    """
+    if isinstance(font, ImageFont.FreeTypeFont):
+        return (font.path, font.size, font.index, font.layout_engine)
+    return id(font)
+
+
+def _rasterize(text: str, font: Any) -> Tuple[Raster, int]:
+    """栅格化文字，返回 ((掩码, 边界框), 字节数)；已注册字形图集的字体由图集组字"""
+    atlas = get_atlas(font)
+    if atlas is not None:
+        pixels, bbox = atlas.render(text)
+        if pixels.size == 0:
+            return (None, bbox), 64
+        return (Image.fromarray(pixels, "L"), bbox), pixels.size + 64
+    bbox = tuple(int(v) for v in font.getbbox(text))
+    x0, y0, x1, y1 = bbox
+    if x1 <= x0 or y1 <= y0:
+        # 空白文字只有边界框
+        return (None, bbox), 64
+    mask = Image.new("L", (x1 - x0, y1 - y0), 0)
+    ImageDraw.Draw(mask).text((-x0, -y0), text, 255, font)
+    return (mask, bbox), mask.width * mask.height + 64
+
+
+def get_text_raster(text: str, font: Any) -> Raster:
+    """
+    获取文字的缓存栅格
+    
+    Returns:
+        (掩码, 边界框)；边界框相对于绘制原点（同 font.getbbox），空白文字的掩码为 None
+    """
+    return text_cache.get_or_create((text, font_key(font)), lambda: _rasterize(text, font))
+
+
+def cached_textbbox(xy: Tuple[int, int], text: str, font: Any) -> Tuple[int, int, int, int]:
+    """与 draw.textbbox(xy, text, font=font) 相同，结果来自缓存"""
+    x0, y0, x1, y1 = get_text_raster(text, font)[1]
+    return x0 + xy[0], y0 + xy[1], x1 + xy[0], y1 + xy[1]
+
+
+def draw_cached_text(image: Image.Image, xy: Tuple[int, int], text: str, fill: Any, font: Any) -> None:
+    """
+    绘制文字（等价于 ImageDraw.Draw(image).text(xy, text, fill, font)）
+    
+    多行文字、非整数坐标和非 RGB 图像直接走 draw.text。
+    """
+    x, y = xy
+    if "\n" in text or image.mode != "RGB" or not (isinstance(x, int) and isinstance(y, int)):
+        ImageDraw.Draw(image).text(xy, text, fill, font)
+        return
+    mask, (x0, y0, _, _) = get_text_raster(text, font)
+    if mask is not None:
+        image.paste(fill, (x + x0, y + y0), mask)
+
+
+class CachedDraw(ImageDraw.ImageDraw):
+    """
+    带文字缓存的 ImageDraw
+    
+    text() / textbbox() 的常见调用（整数坐标、给定颜色与字体、无 anchor 等额外参数）
+    走缓存，其余调用与其他绘图方法保持 ImageDraw 原有行为。
+    """
+    
+    def __init__(self, image: Image.Image, mode: Optional[str] = None):
+        super().__init__(image, mode)
+        self._target = image
+    
+    def text(self, xy, text, fill=None, font=None, *args, **kwargs):
+        if args or kwargs or fill is None or font is None or not isinstance(text, str):
+            return super().text(xy, text, fill, font, *args, **kwargs)
+        draw_cached_text(self._target, xy, text, fill, font)
+    
+    def textbbox(self, xy, text, font=None, *args, **kwargs):
+        if args or kwargs or font is None or not isinstance(text, str) or "\n" in text:
+            return super().textbbox(xy, text, font, *args, **kwargs)
+        return cached_textbbox(xy, text, font)
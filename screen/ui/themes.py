@@ -1,7 +1,8 @@
 """UI 主题和颜色管理模块"""
+import numpy as np
 from datetime import datetime
-from typing import Tuple
-from PIL import Image, ImageDraw
+from typing import Dict, Optional, Tuple
+from PIL import Image
 
 # 显示尺寸常量
 W, H = 320, 240
@@ -15,40 +16,115 @@ UI_CHAR_WIDTH_CN = 10
 UI_CHAR_WIDTH_EN = 6
 
 
+# 时间色调分段：(起始小时, 结束小时, 背景主色, 背景副色, 装饰色)，未覆盖的时段为深夜
+TIME_BANDS = (
+    (5, 8, (22, 18, 28), (28, 22, 18), (80, 60, 40)),  # 清晨 - 淡橙暖色
+    (8, 12, (15, 20, 28), (18, 25, 32), (40, 70, 80)),  # 上午 - 清新蓝绿
+    (12, 17, (16, 22, 32), (20, 26, 38), (50, 80, 100)),  # 下午 - 明亮蓝
+    (17, 20, (25, 18, 25), (30, 20, 28), (90, 60, 70)),  # 傍晚 - 暖橙紫
+    (20, 23, (18, 16, 28), (22, 18, 35), (60, 50, 90)),  # 夜晚 - 深蓝紫
+)
+LATE_NIGHT_COLORS = ((12, 14, 22), (15, 16, 26), (40, 45, 70))  # 深夜 - 深邃蓝黑
+
+
+def get_time_band(hour: Optional[int] = None) -> int:
+    """当前时间所在的色调分段序号（深夜为 len(TIME_BANDS)）"""
+    if hour is None:
+        hour = datetime.now().hour
+    for index, (start, end, *_) in enumerate(TIME_BANDS):
+        if start <= hour < end:
+            return index
+    return len(TIME_BANDS)
+
+
 def get_time_based_colors() -> Tuple[Tuple[int, int, int], Tuple[int, int, int], Tuple[int, int, int]]:
     """根据时间返回动态色调 (背景主色, 背景副色, 装饰色)"""
-    hour = datetime.now().hour
-    
-    if 5 <= hour < 8:  # 清晨 - 淡橙暖色
-        return (22, 18, 28), (28, 22, 18), (80, 60, 40)
-    elif 8 <= hour < 12:  # 上午 - 清新蓝绿
-        return (15, 20, 28), (18, 25, 32), (40, 70, 80)
-    elif 12 <= hour < 17:  # 下午 - 明亮蓝
-        return (16, 22, 32), (20, 26, 38), (50, 80, 100)
-    elif 17 <= hour < 20:  # 傍晚 - 暖橙紫
-        return (25, 18, 25), (30, 20, 28), (90, 60, 70)
-    elif 20 <= hour < 23:  # 夜晚 - 深蓝紫
-        return (18, 16, 28), (22, 18, 35), (60, 50, 90)
-    else:  # 深夜 - 深邃蓝黑
-        return (12, 14, 22), (15, 16, 26), (40, 45, 70)
+    band = get_time_band()
+    if band < len(TIME_BANDS):
+        return TIME_BANDS[band][2:]
+    return LATE_NIGHT_COLORS
 
 
-def create_dynamic_background(width: int = W, height: int = H) -> Image.Image:
-    """创建带时间动态色调的背景"""
-    bg_top, bg_bottom, accent = get_time_based_colors()
+def render_vertical_gradient(width: int, height: int, top: Tuple[int, int, int],
+                             bottom: Tuple[int, int, int]) -> Image.Image:
+    """
+    渲染垂直渐变（NumPy 广播，一次生成整幅图像）
+    
+    第 y 行颜色为 int(top * (1 - y / height) + bottom * y / height)，与逐行画线的结果一致。
+    """
+    ratio = (np.arange(height, dtype=np.float64) / height)[:, None]
+    rows = (np.array(top, dtype=np.float64) * (1 - ratio) + np.array(bottom, dtype=np.float64) * ratio).astype(np.uint8)
+    return Image.fromarray(np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3))), "RGB")
+
+
+class ThemeLayerCache:
+    """
+    主题图层缓存
+    
+    背景与标题栏渐变只取决于时间色调分段，每个分段渲染一次；
+    分段变化时自动清空，下次访问按新色调重新渲染。
+    """
+    
+    def __init__(self):
+        self._band: Optional[int] = None
+        self._layers: Dict[tuple, Image.Image] = {}
+        self.hits = 0
+        self.misses = 0
     
-    img = Image.new("RGB", (width, height), bg_top)
-    draw = ImageDraw.Draw(img)
+    def _check_band(self) -> None:
+        """色调分段变化时清空缓存"""
+        band = get_time_band()
+        if band != self._band:
+            self._layers.clear()
+            self._band = band
     
-    # 垂直渐变
-    for y in range(height):
-        ratio = y / height
-        r = int(bg_top[0] * (1 - ratio) + bg_bottom[0] * ratio)
-        g = int(bg_top[1] * (1 - ratio) + bg_bottom[1] * ratio)
-        b = int(bg_top[2] * (1 - ratio) + bg_bottom[2] * ratio)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    def gradient(self, width: int, height: int, top: Tuple[int, int, int],
+                 bottom: Tuple[int, int, int]) -> Image.Image:
+        """
+        获取缓存的垂直渐变图层
+        
+        Returns:
+            共享的图层，只可作为 paste 来源，不可修改
+        """
+        self._check_band()
+        key = (width, height, tuple(top), tuple(bottom))
+        layer = self._layers.get(key)
+        if layer is None:
+            self.misses += 1
+            layer = render_vertical_gradient(width, height, top, bottom)
+            self._layers[key] = layer
+        else:
+            self.hits += 1
+        return layer
     
-    return img
+    def background(self, width: int = W, height: int = H) -> Image.Image:
+        """当前色调的页面背景（返回可修改的副本）"""
+        bg_top, bg_bottom, _ = get_time_based_colors()
+        return self.gradient(width, height, bg_top, bg_bottom).copy()
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        self._layers.clear()
+        self._band = None
+    
+    def get_stats(self) -> dict:
+        """获取缓存统计"""
+        return {"theme_layers": len(self._layers), "theme_hits": self.hits, "theme_misses": self.misses}
+
+
+# 全局图层缓存（页面渲染在主循环线程中进行）
+theme_layers = ThemeLayerCache()
+
+
+def create_dynamic_background(width: int = W, height: int = H) -> Image.Image:
+    """创建带时间动态色调的背景（同一时段内复用缓存的渐变）"""
+    return theme_layers.background(width, height)
+
+
+def paste_header_gradient(img: Image.Image, height: int, top: Tuple[int, int, int],
+                          bottom: Tuple[int, int, int]) -> None:
+    """在图像顶部贴上 height 行的标题栏渐变（缓存图层，一次 paste）"""
+    img.paste(theme_layers.gradient(img.width, height, top, bottom), (0, 0))
 
 
 def is_night_mode(start_hour: int = 1, start_minute: int = 30, 
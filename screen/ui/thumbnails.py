@@ -0,0 +1,62 @@
+"""缩略图流水线
+
+媒体缩略图在后台线程解码：JPEG 用 draft 模式让解码器直接按 1/2、1/4、1/8
+缩小解码（只解出不小于目标尺寸的最小比例），再一次 LANCZOS 缩放到页面上
+缩略图槽位的精确尺寸。结果按 (缩略图键, 尺寸) 存入按字节计容量的 LRU 缓存，
+页面每帧只需取出贴上，不再保留原始尺寸的解码图像，也不再逐帧重采样。
+"""
+import io
+from typing import Hashable, Iterable, Optional, Tuple
+from PIL import Image
+
+from ..utils.cache import ByteLRUCache
+
+Size = Tuple[int, int]
+
+# 默认容量：一张 71x55 的缩略图约 12 KB
+DEFAULT_MAX_BYTES = 512 * 1024
+
+thumb_cache = ByteLRUCache(DEFAULT_MAX_BYTES, name="thumb_cache")
+
+
+def configure_thumb_cache(max_bytes: int) -> None:
+    """调整缩略图缓存容量"""
+    thumb_cache.resize(max_bytes)
+
+
+def decode_thumbnail(data: bytes, size: Size) -> Image.Image:
+    """
+    解码并缩放到指定尺寸（不保持宽高比，与槽位尺寸一致）
+    
+    Args:
+        data: 图像文件内容
+        size: 目标 (宽, 高)
+    
+    Returns:
+        RGB 图像
+    """
+    with Image.open(io.BytesIO(data)) as src:
+        # 仅 JPEG 支持，其他格式为空操作
+        src.draft("RGB", size)
+        image = src.convert("RGB")
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    return image
+
+
+def store_thumbnail(key: Hashable, data: bytes, sizes: Iterable[Size]) -> None:
+    """把一张缩略图按各槽位尺寸解码后放入缓存（已缓存的尺寸跳过）"""
+    for size in sizes:
+        if (key, size) not in thumb_cache:
+            tile = decode_thumbnail(data, size)
+            thumb_cache.put((key, size), tile, size[0] * size[1] * 3 + 64)
+
+
+def has_thumbnail(key: Hashable, size: Size) -> bool:
+    """缓存中是否已有该尺寸的缩略图"""
+    return (key, size) in thumb_cache
+
+
+def get_thumbnail(key: Hashable, size: Size) -> Optional[Image.Image]:
+    """取出已缓存的缩略图，未缓存（或已被淘汰）时返回 None"""
+    return thumb_cache.get((key, size))
@@ -0,0 +1,276 @@
+"""页面切换动画模块
+
+在两页之间播放 slide / wipe / fade 过渡，每一步只发送确实变化的窗口：
+- wipe: 新页按列逐步覆盖，每步只写新露出的列，且限制在两页不同的包围盒内
+- fade: 在 RGB565 分量上线性混合，只重算并发送两页不同的区域
+- slide: 支持硬件滚动的后端每步只写新露出的列（同 HardwareScroller），
+  否则逐帧合成整屏
+
+每步有固定的时间预算（1 / fps）。提前完成的步骤等待到节拍点，落后超过
+一个预算时立即放弃动画，直接切到新页面（只发送剩余差异）。
+"""
+import time
+import numpy as np
+from PIL import Image
+from typing import List, Optional, Tuple
+
+from ..core.dirty import Region, find_dirty_regions
+
+EFFECTS = ("slide", "wipe", "fade", "none")
+
+
+class TransitionEngine:
+    """页面切换动画引擎"""
+    
+    def __init__(self, driver, config=None, logger=None):
+        """
+        初始化动画引擎
+        
+        Args:
+            driver: 显示后端（DisplayBackend）
+            config: 配置对象（读取 display.transition.*）
+            logger: 日志记录器
+        """
+        self._driver = driver
+        self._logger = logger
+        
+        if config:
+            self.effect = config.get("display.transition.effect", "slide")
+            self.duration = config.get("display.transition.duration", 0.25)
+            self.fps = config.get("display.transition.fps", 30)
+        else:
+            self.effect = "slide"
+            self.duration = 0.25
+            self.fps = 30
+        
+        shape = (driver.height, driver.width)
+        self._next = np.zeros(shape, dtype=">u2")
+        self._frame = np.zeros(shape, dtype=">u2")
+        # fade 用的分量与混合缓冲区，每次 fade 按包围盒分配
+        self._planes: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        self._mix: Optional[np.ndarray] = None
+        self._acc: Optional[np.ndarray] = None
+        
+        # 节拍计时函数，测试中可替换为确定性的时钟
+        self._clock = time.perf_counter
+        
+        self.transitions = 0
+        self.aborted = 0
+        self.steps = 0
+        self.step_time = 0.0
+        self.completed_steps = 0
+        self.completed_time = 0.0
+        self.last_fps = 0.0
+    
+    def _log(self, level: str, message: str):
+        """内部日志方法"""
+        if self._logger:
+            getattr(self._logger, level)(message)
+    
+    @property
+    def budget(self) -> float:
+        """每步的时间预算（秒）"""
+        return 1.0 / max(1, self.fps)
+    
+    def run(self, image: Image.Image, effect: Optional[str] = None, direction: int = 1) -> bool:
+        """
+        从当前屏幕过渡到新页面
+        
+        Args:
+            image: 新页面图像
+            effect: 过渡效果，省略时使用配置值
+            direction: 1 为新页从右侧进入，-1 为从左侧进入
+        
+        Returns:
+            动画是否完整播放（False 表示无动画或超出预算后直接切换）
+        """
+        driver = self._driver
+        if not driver.is_ready():
+            return False
+        effect = effect or self.effect
+        
+        driver.wait_flush()
+        next_frame = driver.image_to_rgb565_array(image, out=self._next)
+        current = driver.current_frame()
+        if effect not in EFFECTS or effect == "none" or current is None:
+            driver.flush_frame(next_frame)
+            return False
+        
+        np.copyto(self._frame, current)
+        regions = find_dirty_regions(self._frame, next_frame)
+        if not regions:
+            return True
+        # 两页不同像素的包围盒，动画只在其中进行
+        box = (min(r[0] for r in regions), min(r[1] for r in regions),
+               max(r[2] for r in regions), max(r[3] for r in regions))
+        
+        steps = max(1, int(round(self.duration * self.fps)))
+        start = self._clock()
+        try:
+            if effect == "slide" and driver.supports_hardware_scroll:
+                completed = self._slide_hardware(next_frame, steps, direction, start)
+            else:
+                if effect == "fade":
+                    self._prepare_fade(next_frame, box)
+                step = {"slide": self._slide_step, "wipe": self._wipe_step, "fade": self._fade_step}[effect]
+                completed = self._animate(step, next_frame, box, steps, direction, start)
+        except Exception as e:
+            self._log('error', f"页面切换动画失败: {e}")
+            driver.invalidate()
+            driver.flush_frame(next_frame)
+            self.aborted += 1
+            return False
+        
+        elapsed = self._clock() - start
+        self.transitions += 1
+        if completed:
+            if driver.full_frame_pending:
+                # 切换过像素格式：动画未覆盖的区域仍是旧格式的像素，最后整帧发送一次新页面
+                driver.flush_frame(next_frame)
+            else:
+                driver.adopt_frame(next_frame)
+            self.completed_steps += steps
+            self.completed_time += elapsed
+            self.last_fps = steps / elapsed if elapsed > 0 else 0.0
+        else:
+            # 超出预算：屏幕当前为 self._frame，硬切时只发送与新页面的剩余差异
+            self.aborted += 1
+            self.last_fps = 0.0
+            self._log('debug', f"页面切换动画超出预算（{elapsed * 1000:.0f} ms），直接切换")
+            driver.adopt_frame(self._frame)
+            driver.flush_frame(next_frame)
+        return completed
+    
+    def _animate(self, step, next_frame: np.ndarray, box, steps: int, direction: int, start: float) -> bool:
+        """按节拍执行软件动画步骤，落后超过一个预算时返回 False"""
+        driver = self._driver
+        budget = self.budget
+        for k in range(1, steps + 1):
+            step_start = self._clock()
+            regions = step(next_frame, box, k, steps, direction)
+            if regions:
+                driver.blit(self._frame, regions)
+            self.steps += 1
+            self.step_time += self._clock() - step_start
+            if not self._pace(start, k, budget):
+                return k == steps
+        return True
+    
+    def _pace(self, start: float, k: int, budget: float) -> bool:
+        """等待到第 k 步的节拍点；已落后超过一个预算时返回 False"""
+        delay = start + k * budget - self._clock()
+        if delay > 0:
+            time.sleep(delay)
+            return True
+        return -delay <= budget
+    
+    def _edge(self, x: int) -> int:
+        """分界列；12 位格式的窗口按偶数列对齐，分界取偶数避免多写一列"""
+        if self._driver.pixel_format == "rgb444":
+            return x & ~1
+        return x
+    
+    def _wipe_step(self, next_frame: np.ndarray, box, k: int, steps: int, direction: int) -> List[Region]:
+        """wipe：新页按列覆盖，只发送本步新覆盖的列"""
+        x0, y0, x1, y1 = box
+        width = x1 - x0 + 1
+        before = width * (k - 1) // steps
+        after = width * k // steps
+        if direction > 0:
+            lo, hi = x1 + 1 - after, x1 + 1 - before
+        else:
+            lo, hi = x0 + before, x0 + after
+        if hi <= lo:
+            return []
+        self._frame[y0:y1 + 1, lo:hi] = next_frame[y0:y1 + 1, lo:hi]
+        return [(lo, y0, hi - 1, y1)]
+    
+    def _slide_step(self, next_frame: np.ndarray, box, k: int, steps: int, direction: int) -> List[Region]:
+        """软件 slide：拼接两屏后整屏发送"""
+        driver = self._driver
+        width = driver.width
+        shift = width * k // steps
+        current = driver.current_frame()
+        if direction > 0:
+            self._frame[:, :width - shift] = current[:, shift:]
+            self._frame[:, width - shift:] = next_frame[:, :shift]
+        else:
+            self._frame[:, shift:] = current[:, :width - shift]
+            self._frame[:, :shift] = next_frame[:, width - shift:]
+        return [(0, 0, width - 1, driver.height - 1)]
+    
+    def _slide_hardware(self, next_frame: np.ndarray, steps: int, direction: int, start: float) -> bool:
+        """
+        硬件 slide：移动滚动起始地址，只写入新露出的列
+        
+        新页第 j 列写在显存第 j 列（见 screen.core.scroll），self._frame 跟踪显存内容；
+        中途放弃时起始地址复位为 0，屏幕内容即 self._frame。
+        """
+        driver = self._driver
+        width = driver.width
+        height = driver.height
+        budget = self.budget
+        with driver.io_lock:
+            try:
+                driver.set_scroll_area(0, width, 0)
+                before = 0
+                for k in range(1, steps + 1):
+                    step_start = self._clock()
+                    after = width if k == steps else self._edge(width * k // steps)
+                    if after > before:
+                        if direction > 0:
+                            lo, hi, scroll = before, after, after % width
+                        else:
+                            lo, hi, scroll = width - after, width - before, (width - after) % width
+                        # 先移动起始地址，再把刚移出屏幕的显存列改写为新页内容
+                        driver.set_scroll_start(scroll)
+                        self._frame[:, lo:hi] = next_frame[:, lo:hi]
+                        driver.blit(next_frame, [(lo, 0, hi - 1, height - 1)])
+                        before = after
+                    self.steps += 1
+                    self.step_time += self._clock() - step_start
+                    if not self._pace(start, k, budget):
+                        return k == steps
+                return True
+            finally:
+                driver.set_scroll_start(0)
+    
+    def _prepare_fade(self, next_frame: np.ndarray, box) -> None:
+        """一次性拆出两页包围盒内的 RGB565 分量"""
+        x0, y0, x1, y1 = box
+        shape = (y1 - y0 + 1, x1 - x0 + 1)
+        source = self._frame[y0:y1 + 1, x0:x1 + 1].astype(np.int32)
+        target = next_frame[y0:y1 + 1, x0:x1 + 1].astype(np.int32)
+        self._planes = []
+        for shift, mask in ((11, 0x1F), (5, 0x3F), (0, 0x1F)):
+            a = (source >> shift) & mask
+            b = (target >> shift) & mask
+            self._planes.append((shift, a, b - a))
+        self._mix = np.empty(shape, dtype=np.int32)
+        self._acc = np.empty(shape, dtype=np.int32)
+    
+    def _fade_step(self, next_frame: np.ndarray, box, k: int, steps: int, direction: int) -> List[Region]:
+        """fade：分量线性混合 a + (b - a) * k / steps，只发送两页不同的包围盒"""
+        x0, y0, x1, y1 = box
+        mix = self._mix
+        acc = self._acc
+        acc.fill(0)
+        for shift, a, delta in self._planes:
+            np.multiply(delta, k, out=mix)
+            np.floor_divide(mix, steps, out=mix)
+            np.add(mix, a, out=mix)
+            np.left_shift(mix, shift, out=mix)
+            np.bitwise_or(acc, mix, out=acc)
+        self._frame[y0:y1 + 1, x0:x1 + 1] = acc
+        return [box]
+    
+    def get_stats(self) -> dict:
+        """获取动画统计（step_fps 为不计等待的单步发送能力，fps 为完整播放的动画实际帧率）"""
+        return {
+            "transitions": self.transitions,
+            "transitions_aborted": self.aborted,
+            "transition_steps": self.steps,
+            "transition_step_fps": self.steps / self.step_time if self.step_time > 0 else 0.0,
+            "transition_fps": self.completed_steps / self.completed_time if self.completed_time > 0 else 0.0,
+            "transition_last_fps": self.last_fps,
+        }
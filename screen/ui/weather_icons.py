@@ -0,0 +1,232 @@
+"""动态天气图标精灵图模块
+
+天气图标的动画只由帧号决定：时钟页的帧号为 int(time.time() * 2) % 60，
+因此每种 (天气类型, 尺寸) 最多 60 个画面。雨滴下落偏移 (frame * 2) % 10
+全是整数运算，5 帧一个周期；云与默认图标是静态的；太阳光芒与雪花按角度
+旋转，理论上 15 / 30 帧一个周期，但三角函数截断取整后转过一周的画面会差
+一两个像素，所以按完整的 60 帧生成，再合并内容相同的格子。
+
+首次用到某个 (类型, 尺寸) 时，把所有不同的帧画进一张 RGBA 精灵图（每个
+不同画面一格，格子裁剪到所有帧墨迹的并集），之后每帧只需按帧号取格子贴一次。
+PIL 的 ellipse / line 不做抗锯齿，RGBA 透明底上画出的像素不透明度都是 255，
+所以每格可以拆成 RGB 图与 1 位掩码贴图（比按 RGBA 透明度混合快一倍），
+结果与直接在画布上绘制逐像素一致。
+
+天气类型优先按和风天气（QWeather）图标代码判断，没有代码时退回按天气
+描述文字匹配。
+"""
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+from PIL import Image, ImageDraw
+
+Cell = Tuple[Image.Image, Image.Image]
+
+# 帧号范围（时钟页帧号对 60 取模）
+FRAME_COUNT = 60
+
+# 各类型需要生成的帧数：雨滴 5 帧一个周期（整数运算），云与默认图标静态
+FRAME_PERIODS = {"sun": FRAME_COUNT, "rain": 5, "snow": FRAME_COUNT, "cloud": 1, "default": 1}
+
+# 绘制格子时图标四周预留的边距：光芒、雨滴按固定像素偏移，会画出 size 以外
+_PAD = 24
+
+# 和风天气图标代码中与代码段规律不一致的个别代码（按描述文字的归类）
+_ICON_CODE_KINDS = {
+    103: "sun", 153: "sun",                    # 晴间多云
+    404: "rain", 405: "rain", 406: "rain",     # 雨夹雪 / 雨雪天气 / 阵雨夹雪
+    456: "rain",                               # 阵雨夹雪（夜）
+}
+
+
+def weather_kind(text: str = "", icon: Optional[str] = None) -> str:
+    """
+    天气图标类型
+    
+    Args:
+        text: 天气描述（如 "多云"）
+        icon: 和风天气图标代码（如 "101"），可选
+    
+    Returns:
+        "sun" / "rain" / "cloud" / "snow" / "default"
+    """
+    try:
+        code = int(icon)
+    except (TypeError, ValueError):
+        code = None
+    if code is not None:
+        if code in _ICON_CODE_KINDS:
+            return _ICON_CODE_KINDS[code]
+        if code in (100, 150):
+            return "sun"
+        if 101 <= code <= 104 or 151 <= code <= 153:
+            return "cloud"
+        if 300 <= code <= 399:
+            return "rain"
+        if 400 <= code <= 499:
+            return "snow"
+        if 500 <= code <= 999:
+            return "default"
+    # 未知代码：按描述文字匹配（顺序与原绘制逻辑一致）
+    if "晴" in text:
+        return "sun"
+    if "雨" in text:
+        return "rain"
+    if "云" in text or "阴" in text:
+        return "cloud"
+    if "雪" in text:
+        return "snow"
+    return "default"
+
+
+def paint_weather_icon(draw: ImageDraw.ImageDraw, x: int, y: int, size: int, kind: str, frame: int = 0) -> None:
+    """用绘图调用直接画出一帧天气图标（生成精灵图时使用）"""
+    cx, cy = x + size // 2, y + size // 2
+    
+    if kind == "sun":
+        # 太阳 - 带旋转光芒动效
+        sun_color = (255, 200, 80)
+        ray_color = (255, 180, 60)
+        # 太阳主体
+        r = size // 3
+        draw.ellipse([cx - r, cy - r, cx + r, cy + r], fill=sun_color)
+        # 光芒（根据frame旋转）
+        for i in range(8):
+            angle = math.radians(i * 45 + frame * 3)
+            x1 = cx + int(math.cos(angle) * (r + 3))
+            y1 = cy + int(math.sin(angle) * (r + 3))
+            x2 = cx + int(math.cos(angle) * (r + 8))
+            y2 = cy + int(math.sin(angle) * (r + 8))
+            draw.line([x1, y1, x2, y2], fill=ray_color, width=2)
+    
+    elif kind == "rain":
+        # 云+雨滴
+        cloud_color = (120, 140, 160)
+        rain_color = (100, 180, 255)
+        # 云
+        draw.ellipse([cx - 12, cy - 8, cx + 2, cy + 4], fill=cloud_color)
+        draw.ellipse([cx - 4, cy - 12, cx + 12, cy + 2], fill=cloud_color)
+        draw.ellipse([cx + 2, cy - 6, cx + 14, cy + 4], fill=cloud_color)
+        # 雨滴（动态下落）
+        drop_offset = (frame * 2) % 10
+        for i, dx in enumerate([-6, 2, 10]):
+            dy = (drop_offset + i * 3) % 10
+            draw.line([cx + dx, cy + 6 + dy, cx + dx - 2, cy + 12 + dy], fill=rain_color, width=2)
+    
+    elif kind == "cloud":
+        # 云朵
+        cloud_color = (150, 160, 175)
+        cloud_dark = (120, 130, 145)
+        # 主云
+        draw.ellipse([cx - 14, cy - 4, cx + 2, cy + 10], fill=cloud_color)
+        draw.ellipse([cx - 6, cy - 10, cx + 10, cy + 6], fill=cloud_color)
+        draw.ellipse([cx + 2, cy - 2, cx + 16, cy + 10], fill=cloud_dark)
+    
+    elif kind == "snow":
+        # 雪花
+        snow_color = (220, 230, 255)
+        for i in range(6):
+            angle = math.radians(i * 60 + frame * 2)
+            x1 = cx + int(math.cos(angle) * 4)
+            y1 = cy + int(math.sin(angle) * 4)
+            x2 = cx + int(math.cos(angle) * 10)
+            y2 = cy + int(math.sin(angle) * 10)
+            draw.line([x1, y1, x2, y2], fill=snow_color, width=1)
+        draw.ellipse([cx - 2, cy - 2, cx + 2, cy + 2], fill=snow_color)
+    
+    else:
+        # 默认：小太阳
+        draw.ellipse([cx - 6, cy - 6, cx + 6, cy + 6], fill=(200, 180, 100))
+
+
+class WeatherSprites:
+    """天气图标精灵图缓存（按 (类型, 尺寸) 懒生成）"""
+    
+    def __init__(self):
+        # (类型, 尺寸) -> (精灵图, 各帧对应的格子 (RGB, 1 位掩码), 格子相对图标左上角的偏移)
+        self._sheets: Dict[Tuple[str, int], Tuple[Image.Image, List[Cell], Tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+        self.sheets_built = 0
+        self.pastes = 0
+    
+    def _build(self, kind: str, size: int) -> Tuple[Image.Image, List[Cell], Tuple[int, int]]:
+        """把所有不同的帧画进精灵图"""
+        period = FRAME_PERIODS.get(kind, 1)
+        canvas = size + 2 * _PAD
+        frames = []
+        for frame in range(period):
+            cell = Image.new("RGBA", (canvas, canvas), (0, 0, 0, 0))
+            paint_weather_icon(ImageDraw.Draw(cell), _PAD, _PAD, size, kind, frame)
+            frames.append(cell)
+        # 所有帧共用一个裁剪框（墨迹并集），贴图位置不随帧变化
+        boxes = [cell.getchannel("A").getbbox() for cell in frames]
+        boxes = [box for box in boxes if box] or [(0, 0, 1, 1)]
+        x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+        x1, y1 = max(b[2] for b in boxes), max(b[3] for b in boxes)
+        cell_w, cell_h = x1 - x0, y1 - y0
+        # 内容相同的帧共用一个格子
+        unique: Dict[bytes, int] = {}
+        order = []
+        for cell in frames:
+            order.append(unique.setdefault(cell.crop((x0, y0, x1, y1)).tobytes(), len(unique)))
+        sheet = Image.new("RGBA", (cell_w * len(unique), cell_h), (0, 0, 0, 0))
+        for data, i in unique.items():
+            sheet.paste(Image.frombytes("RGBA", (cell_w, cell_h), data), (i * cell_w, 0))
+        cells = []
+        for i in range(len(unique)):
+            cell = sheet.crop((i * cell_w, 0, (i + 1) * cell_w, cell_h))
+            cells.append((cell.convert("RGB"), cell.getchannel("A").convert("1")))
+        self.sheets_built += 1
+        return sheet, [cells[i] for i in order], (x0 - _PAD, y0 - _PAD)
+    
+    def sheet(self, kind: str, size: int) -> Tuple[Image.Image, List[Cell], Tuple[int, int]]:
+        """获取 (类型, 尺寸) 的精灵图，首次调用时生成"""
+        key = (kind, size)
+        entry = self._sheets.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._sheets.get(key)
+                if entry is None:
+                    entry = self._build(kind, size)
+                    self._sheets[key] = entry
+        return entry
+    
+    def draw(self, image: Image.Image, x: int, y: int, size: int, kind: str, frame: int = 0) -> None:
+        """贴出一帧天气图标（与 paint_weather_icon 直接绘制一致）"""
+        _, cells, (dx, dy) = self.sheet(kind, size)
+        rgb, mask = cells[frame % len(cells)]
+        image.paste(rgb, (x + dx, y + dy), mask)
+        self.pastes += 1
+    
+    def warm_up(self, sizes=(32,)) -> None:
+        """预先生成所有类型的精灵图"""
+        for size in sizes:
+            for kind in FRAME_PERIODS:
+                self.sheet(kind, size)
+    
+    def get_stats(self) -> dict:
+        """获取精灵图统计"""
+        return {
+            "weather_sprite_sheets": len(self._sheets),
+            "weather_sprite_bytes": sum(sheet.width * sheet.height * 4 for sheet, _, _ in self._sheets.values()),
+            "weather_sprite_pastes": self.pastes,
+        }
+
+
+weather_sprites = WeatherSprites()
+
+
+def draw_weather_icon(image: Image.Image, x: int, y: int, size: int, weather: str, frame: int = 0,
+                      icon: Optional[str] = None) -> None:
+    """
+    绘制动态天气图标
+    
+    Args:
+        image: 目标图像
+        x, y: 图标左上角
+        size: 图标尺寸
+        weather: 天气描述文字
+        frame: 动画帧号（对 60 取模）
+        icon: 和风天气图标代码，给出时优先于描述文字
+    """
+    weather_sprites.draw(image, x, y, size, weather_kind(weather, icon), frame)
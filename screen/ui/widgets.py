@@ -0,0 +1,300 @@
+"""保留模式控件模块
+
+页面由一组绑定到 DataStore 键的控件组成。每次渲染只取出各控件的输入值，
+与上一次比较，只有输入变化的控件才重绘；标题栏、卡片、分隔线等静态控件
+在整个时间色调分段内只绘制一次。
+
+页面画布保留上一次渲染的全部像素。重绘一个控件时，先用背景图层恢复它的
+矩形，再按层叠顺序重绘与该矩形相交的控件（每个控件都裁剪在自己的矩形内），
+因此结果与整页重绘逐像素一致。变化的矩形通过 dirty_regions 报告给显示层
+（DisplayBackend.display_image 的 regions 参数），只在这些矩形内比对与发送。
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from PIL import Image
+
+from ..core.dirty import Region
+from .themes import W, H, UI_HEADER_HEIGHT, UI_PADDING, create_dynamic_background, get_time_band, get_time_based_colors
+from .text_cache import CachedDraw
+from .components import blit_decoration, calc_text_width
+from .charts import draw_bars, draw_mini_kline, draw_sparkline
+
+Color = Tuple[int, int, int]
+
+
+def _freeze(value: Any) -> Any:
+    """把列表/字典转换为可比较的不可变快照（工作线程可能原地修改 DataStore 中的列表）"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _intersect(a: Region, b: Region) -> Optional[Region]:
+    """两个闭区间矩形的交集，不相交时返回 None"""
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    if x0 > x1 or y0 > y1:
+        return None
+    return x0, y0, x1, y1
+
+
+class Widget:
+    """
+    控件基类
+    
+    控件占据 (x, y) 起 w x h 像素的矩形，输入值由 keys 对应的 DataStore 数据
+    经 select(*values) 得到；输入值为 None 时控件不绘制（用于按数据隐藏）。
+    """
+    
+    def __init__(self, x: int, y: int, w: int, h: int, keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None):
+        """
+        Args:
+            x, y: 左上角坐标
+            w, h: 宽高（像素）
+            keys: 绑定的 DataStore 键
+            select: 把键值转换为控件输入的函数；省略时输入为键值元组
+        """
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.keys = tuple(keys)
+        self.select = select
+        self.value: Any = None
+    
+    @property
+    def bbox(self) -> Region:
+        """控件矩形（闭区间）"""
+        return self.x, self.y, self.x + self.w - 1, self.y + self.h - 1
+    
+    def read(self, store: Any) -> Any:
+        """从 DataStore 读取本控件的输入值"""
+        values = [store.get(key) for key in self.keys]
+        if self.select is not None:
+            return _freeze(self.select(*values))
+        return _freeze(tuple(values))
+    
+    def paint(self, image: Image.Image, x: int, y: int, value: Any, fonts: Dict[str, Any]) -> None:
+        """
+        绘制控件
+        
+        Args:
+            image: 绘制目标（控件矩形中需要重绘的部分）
+            x, y: 控件左上角在 image 中的坐标（可能为负）
+            value: 输入值
+            fonts: 字体字典
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} must implement paint()")
+
+
+class Card(Widget):
+    """圆角卡片（静态外框，或按输入值显示/隐藏）"""
+    
+    def __init__(self, x: int, y: int, w: int, h: int, keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None, fill: Optional[Color] = None,
+                 outline: Optional[Color] = None, radius: int = 4):
+        super().__init__(x, y, w, h, keys, select or (lambda *values: True))
+        self.fill = fill
+        self.outline = outline
+        self.radius = radius
+    
+    def paint(self, image, x, y, value, fonts):
+        fill = self.fill
+        if fill is None:
+            # 与 draw_card 相同：未指定填充色时按时间色调取卡片底色
+            bg_top, _, _ = get_time_based_colors()
+            fill = (bg_top[0] + 8, bg_top[1] + 10, bg_top[2] + 14)
+        blit_decoration(image, (x, y), "card", w=self.w - 1, h=self.h - 1, radius=self.radius,
+                        fill=fill, outline=self.outline)
+
+
+class Header(Widget):
+    """页面标题栏（背景 + 底部强调线 + 标题），右侧文字可绑定数据"""
+    
+    def __init__(self, title: str, accent: Color, font: str = "f_sm", keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None, height: int = UI_HEADER_HEIGHT, width: int = W):
+        super().__init__(0, 0, width, height + 1, keys, select or (lambda *values: ""))
+        self.title = title
+        self.accent = accent
+        self.font = font
+        self.height = height
+    
+    def paint(self, image, x, y, value, fonts):
+        draw = CachedDraw(image)
+        bg_top, _, _ = get_time_based_colors()
+        right = x + self.w - 1
+        draw.rectangle([x, y, right, y + self.height], fill=(bg_top[0] + 10, bg_top[1] + 12, bg_top[2] + 18))
+        draw.rectangle([x, y + self.height - 2, right, y + self.height], fill=self.accent)
+        draw.text((x + UI_PADDING + 2, y + (self.height - 12) // 2), self.title, (220, 230, 245), fonts[self.font])
+        if value:
+            draw.text((right - calc_text_width(value) - UI_PADDING - 1, y + (self.height - 10) // 2),
+                      value, (120, 140, 170), fonts[self.font])
+
+
+class Label(Widget):
+    """文字标签；输入为文字，或 (文字, 颜色)"""
+    
+    def __init__(self, x: int, y: int, w: int, h: int, keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None, text: str = "",
+                 font: str = "f_sm", color: Color = (200, 210, 225)):
+        if select is None:
+            # 未给出 select 时显示第一个键的值，无绑定键时为静态文字
+            select = (lambda value, *rest: value) if keys else (lambda: text)
+        super().__init__(x, y, w, h, keys, select)
+        self.font = font
+        self.color = color
+    
+    def paint(self, image, x, y, value, fonts):
+        text, color = value if isinstance(value, tuple) else (value, self.color)
+        if text:
+            CachedDraw(image).text((x, y), str(text), color, fonts[self.font])
+
+
+class Bar(Widget):
+    """进度条；输入为 0-100 的数值，或 (数值, 颜色)"""
+    
+    def __init__(self, x: int, y: int, w: int, h: int, keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None, color: Color = (100, 200, 150),
+                 bg_color: Color = (40, 45, 55)):
+        super().__init__(x, y, w, h, keys, select)
+        self.color = color
+        self.bg_color = bg_color
+    
+    def paint(self, image, x, y, value, fonts):
+        percent, color = value if isinstance(value, tuple) else (value, self.color)
+        draw_bars(image, [(x, y, self.w - 1, self.h - 1)], [float(percent or 0)], [color], self.bg_color)
+
+
+class Sparkline(Widget):
+    """折线迷你图；输入为数值序列"""
+    
+    def __init__(self, x: int, y: int, w: int, h: int, keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None, color: Color = (100, 180, 255)):
+        super().__init__(x, y, w, h, keys, select)
+        self.color = color
+    
+    def paint(self, image, x, y, value, fonts):
+        draw_sparkline(image, x, y, self.w, self.h, list(value), self.color)
+
+
+class CandleChart(Widget):
+    """迷你 K 线图；输入为价格序列（相邻两点为一根蜡烛的开收盘价）"""
+    
+    def __init__(self, x: int, y: int, w: int, h: int, keys: Sequence[str] = (),
+                 select: Optional[Callable[..., Any]] = None,
+                 up_color: Color = (100, 255, 180), down_color: Color = (255, 100, 100)):
+        super().__init__(x, y, w, h, keys, select)
+        self.up_color = up_color
+        self.down_color = down_color
+    
+    def paint(self, image, x, y, value, fonts):
+        draw_mini_kline(image, x, y, self.w, self.h - 1, list(value), self.up_color, self.down_color)
+
+
+class ImageWidget(Widget):
+    """图片（图标、缩略图）；输入为 PIL 图像，RGBA 图像按透明度贴图"""
+    
+    def read(self, store: Any) -> Any:
+        # 图像不做快照，按内容比较（PIL 图像的 == 比较像素）
+        values = [store.get(key) for key in self.keys]
+        return self.select(*values) if self.select is not None else values[0]
+    
+    def paint(self, image, x, y, value, fonts):
+        mask = value if value.mode == "RGBA" else None
+        image.paste(value, (x, y), mask)
+
+
+class WidgetPage:
+    """由控件组成的页面，只重绘输入变化的控件"""
+    
+    def __init__(self, widgets: Sequence[Widget], width: int = W, height: int = H,
+                 background: Optional[Callable[[], Image.Image]] = None):
+        """
+        Args:
+            widgets: 控件列表（按层叠顺序，后面的绘制在上层）
+            width, height: 页面尺寸
+            background: 背景图层工厂，省略时使用时间色调渐变背景
+        """
+        self.widgets = list(widgets)
+        self.width = width
+        self.height = height
+        self._background = background or (lambda: create_dynamic_background(width, height))
+        self._base: Optional[Image.Image] = None
+        self._canvas: Optional[Image.Image] = None
+        self._band: Optional[int] = None
+        # 最近一次渲染中变化的矩形（闭区间），首帧或色调分段切换时为整页
+        self.dirty_regions: List[Region] = []
+        
+        self.renders = 0
+        self.full_repaints = 0
+        self.widget_repaints = 0
+    
+    def invalidate(self) -> None:
+        """下一次渲染整页重绘"""
+        self._canvas = None
+    
+    @property
+    def canvas(self) -> Optional[Image.Image]:
+        """最近一次渲染的页面画布"""
+        return self._canvas
+    
+    def render(self, store: Any, fonts: Dict[str, Any]) -> Image.Image:
+        """
+        渲染页面
+        
+        Args:
+            store: DataStore（或任何提供 get(key) 的对象）
+            fonts: 字体字典
+        
+        Returns:
+            页面画布（保留的共享图像，调用方不可修改）
+        """
+        self.renders += 1
+        band = get_time_band()
+        values = [widget.read(store) for widget in self.widgets]
+        
+        if self._canvas is None or band != self._band:
+            # 背景随色调分段变化，静态控件也依赖色调，整页重绘
+            self._band = band
+            self._base = self._background()
+            self._canvas = self._base.copy()
+            dirty = [(0, 0, self.width - 1, self.height - 1)]
+            self.full_repaints += 1
+        else:
+            dirty = [widget.bbox for widget, value in zip(self.widgets, values) if value != widget.value]
+        for widget, value in zip(self.widgets, values):
+            widget.value = value
+        
+        for rect in dirty:
+            self._repaint(rect, fonts)
+        self.widget_repaints += len(dirty)
+        self.dirty_regions = dirty
+        return self._canvas
+    
+    def _repaint(self, rect: Region, fonts: Dict[str, Any]) -> None:
+        """恢复矩形内的背景，再按层叠顺序重绘与之相交的控件"""
+        x0, y0, x1, y1 = rect
+        tile = self._base.crop((x0, y0, x1 + 1, y1 + 1))
+        for widget in self.widgets:
+            if widget.value is None:
+                continue
+            clip = _intersect(rect, widget.bbox)
+            if clip is None:
+                continue
+            # 在控件与矩形的交集上绘制，超出控件矩形的部分被裁掉
+            cx0, cy0, cx1, cy1 = clip
+            box = (cx0 - x0, cy0 - y0, cx1 - x0 + 1, cy1 - y0 + 1)
+            sub = tile.crop(box)
+            widget.paint(sub, widget.x - cx0, widget.y - cy0, widget.value, fonts)
+            tile.paste(sub, box[:2])
+        self._canvas.paste(tile, (x0, y0))
+    
+    def get_stats(self) -> dict:
+        """获取重绘统计"""
+        return {
+            "widget_renders": self.renders,
+            "widget_full_repaints": self.full_repaints,
+            "widget_repaints": self.widget_repaints,
+        }
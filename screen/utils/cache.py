@@ -0,0 +1,106 @@
+"""按字节数限制容量的 LRU 缓存"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+_MISSING = object()
+
+
+class ByteLRUCache:
+    """
+    LRU 缓存，容量按条目的字节数而不是条目个数计算
+    
+    适合缓存大小差异很大的位图（几十字节的小字到几十 KB 的缩略图），
+    超出 max_bytes 时从最久未使用的条目开始淘汰。
+    """
+    
+    def __init__(self, max_bytes: int, name: str = "cache"):
+        """
+        Args:
+            max_bytes: 容量上限（字节）
+            name: 名称，用于统计输出
+        """
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取条目并标记为最近使用"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """
+        写入条目
+        
+        Args:
+            key: 键
+            value: 值
+            size: 条目占用的字节数；超过容量上限的条目不缓存
+        """
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+    
+    def get_or_create(self, key: Hashable, factory: Callable[[], Tuple[Any, int]]) -> Any:
+        """
+        读取条目，不存在时调用 factory() 生成 (值, 字节数) 并写入
+        
+        factory 在锁外执行，并发时可能重复生成，结果一致即可。
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value, size = factory()
+            self.put(key, value, size)
+        return value
+    
+    def resize(self, max_bytes: int) -> None:
+        """调整容量上限，必要时立即淘汰"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+    
+    def get_stats(self) -> dict:
+        """获取缓存统计（键名带缓存名称前缀）"""
+        lookups = self.hits + self.misses
+        return {
+            f"{self.name}_entries": len(self._entries),
+            f"{self.name}_bytes": self.bytes,
+            f"{self.name}_hit_rate": self.hits / lookups if lookups else 0.0,
+            f"{self.name}_evictions": self.evictions,
+        }
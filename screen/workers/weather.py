@@ -49,6 +49,7 @@ class WeatherWorker(BaseWorker):
                 self.data_store.update({
                     "temp": now_data.get("temp", "--"),
                     "text": now_data.get("text", "..."),
+                    "icon": now_data.get("icon", ""),
                     "feelsLike": now_data.get("feelsLike", "--"),
                     "humidity": now_data.get("humidity", "--"),
                     "windSpeed": now_data.get("windSpeed", "--"),
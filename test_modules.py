@@ -54,6 +54,998 @@ def test_hotreload():
     reloader = ConfigReloader()
     print("✓ 配置热加载模块正常")
 
+def test_dirty_regions():
+    """测试脏矩形检测模块"""
+    print("\n测试脏矩形检测模块...")
+    import numpy as np
+    from screen.core.dirty import find_dirty_regions
+    
+    prev = np.zeros((240, 320), dtype=np.uint16)
+    curr = prev.copy()
+    assert find_dirty_regions(prev, curr) == []
+    assert find_dirty_regions(None, curr) == [(0, 0, 319, 239)]
+    
+    # 同一行带内相距较远的两处变化拆成两个窗口
+    curr[10:20, 30:40] = 1
+    curr[12, 200] = 1
+    # 相距很近的行带合并
+    curr[100, 5] = 1
+    curr[104, 6] = 1
+    regions = find_dirty_regions(prev, curr, merge_gap=8)
+    assert regions == [(30, 10, 39, 19), (200, 10, 200, 19), (5, 100, 6, 104)]
+    print("✓ 脏矩形检测模块正常")
+
+def test_gpio_backends():
+    """测试 GPIO 后端模块"""
+    print("\n测试 GPIO 后端模块...")
+    import tempfile
+    from screen.core.gpio import SysfsGPIO, MockGPIO, create_gpio_backend
+    from screen.core.display import DisplayDriver
+    
+    # sysfs 后端：在临时目录中模拟 /sys/class/gpio
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "gpio75"))
+        for name, content in [("direction", "in"), ("value", "0")]:
+            with open(os.path.join(root, "gpio75", name), "w") as f:
+                f.write(content)
+        gpio = SysfsGPIO(root)
+        assert gpio.setup("75", "out")
+        gpio.write("75", 1)
+        assert gpio.read("75") == 1
+        gpio.close()
+    
+    # cdev 后端：sysfs 编号减去芯片起始编号得到行偏移，小于起始编号的视为行偏移
+    from unittest import mock
+    from screen.core.gpio import CdevGPIO
+    with tempfile.TemporaryDirectory() as root:
+        for chip, label, ngpio in [("gpiochip512", "300b000.pinctrl", 288), ("gpiochip800", "7022000.pinctrl", 32)]:
+            os.makedirs(os.path.join(root, chip))
+            for name, content in [("label", label), ("ngpio", str(ngpio)), ("base", chip[8:])]:
+                with open(os.path.join(root, chip, name), "w") as f:
+                    f.write(content + "\n")
+        gpio = CdevGPIO(sysfs_root=root)
+        with mock.patch.object(CdevGPIO, "_chip_info", return_value=("300b000.pinctrl", 288)):
+            assert gpio.chip_base() == 512
+            assert gpio.line_offset("582") == 70 and gpio.line_offset("70") == 70
+    
+    # 驱动通过配置选择模拟后端
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock"}.get(key, default)
+    
+    driver = DisplayDriver(MockConfig())
+    assert isinstance(driver._gpio, MockGPIO)
+    driver.init_button_gpio()
+    assert not driver.read_button_raw()
+    driver._gpio.set_input(driver.button_pin, 0)
+    assert driver.read_button_raw()
+    assert isinstance(create_gpio_backend(None), SysfsGPIO)
+    print("✓ GPIO 后端模块正常")
+
+def test_frame_flusher():
+    """测试异步刷新线程"""
+    print("\n测试异步刷新线程...")
+    import time
+    from PIL import Image
+    from screen.core.display import DisplayDriver
+    
+    class FakeSpi:
+        def __init__(self):
+            self.sent = 0
+        def writebytes(self, data):
+            pass
+        def writebytes2(self, data):
+            self.sent += len(data)
+        def close(self):
+            pass
+    
+    driver = DisplayDriver()
+    driver._spi = FakeSpi()
+    driver.gpio_set = lambda pin, value: None
+    driver.start_async()
+    driver.display_image(Image.new("RGB", (320, 240), (255, 0, 0)))
+    for _ in range(100):
+        if driver.get_stats()["frames_flushed"]:
+            break
+        time.sleep(0.01)
+    stats = driver.get_stats()
+    driver.close()
+    assert stats["frames_flushed"] == 1
+    assert driver._spi.sent == 320 * 240 * 2
+    
+    # 相同帧不再发送
+    driver.flush_frame(driver.image_to_rgb565_array(Image.new("RGB", (320, 240), (255, 0, 0))))
+    assert driver.get_stats()["frames_skipped"] == 1
+    assert driver._spi.sent == 320 * 240 * 2
+    print("✓ 异步刷新线程正常")
+
+def test_rgb565_converter():
+    """测试 RGB565 转换器"""
+    print("\n测试 RGB565 转换器...")
+    import numpy as np
+    from PIL import Image
+    from screen.core.rgb565 import RGB565Converter
+    
+    pixels = np.random.default_rng(0).integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    converter = RGB565Converter(32, 24)
+    result = converter.convert(Image.fromarray(pixels, "RGB"))
+    
+    p = pixels.astype(np.uint16)
+    expected = ((p[:, :, 0] & 0xF8) << 8) | ((p[:, :, 1] & 0xFC) << 3) | (p[:, :, 2] >> 3)
+    assert result.dtype == np.dtype(">u2")
+    assert (result == expected).all()
+    assert converter.as_buffer(result).nbytes == 32 * 24 * 2
+    
+    # 亮度查表与 ImageEnhance.Brightness 结果一致
+    from PIL import ImageEnhance
+    image = Image.fromarray(pixels, "RGB")
+    expected = converter.convert(ImageEnhance.Brightness(image).enhance(0.6)).copy()
+    converter.set_brightness(0.6)
+    assert (converter.convert(image) == expected).all()
+    print("✓ RGB565 转换结果正确")
+
+def test_display_backends():
+    """测试无屏显示后端"""
+    print("\n测试无屏显示后端...")
+    import os
+    import tempfile
+    import numpy as np
+    from PIL import Image
+    from screen.core.backends import create_display_backend, NullSink, ImageSink, SharedMemorySink
+    
+    class MockConfig:
+        def __init__(self, values):
+            self.values = values
+        def get(self, key, default=None):
+            return self.values.get(key, default)
+    
+    tmp_dir = tempfile.mkdtemp()
+    image = Image.new("RGB", (320, 240), (255, 0, 0))
+    
+    null = create_display_backend(MockConfig({"display.backend": "null"}))
+    assert isinstance(null, NullSink) and null.init_display()
+    null.display_image(image)
+    assert null.get_stats()["bytes_sent"] == 320 * 240 * 2
+    
+    sink = create_display_backend(MockConfig({
+        "display.backend": "image",
+        "display.image_sink.path": os.path.join(tmp_dir, "frame_{n}.ppm"),
+        "display.image_sink.every": 1,
+    }))
+    assert isinstance(sink, ImageSink) and sink.init_display()
+    sink.display_image(image)
+    assert Image.open(os.path.join(tmp_dir, "frame_0.ppm")).getpixel((0, 0)) == (255, 0, 0)
+    
+    shm_path = os.path.join(tmp_dir, "fb")
+    shm = create_display_backend(MockConfig({"display.backend": "shm", "display.shm.path": shm_path}))
+    assert isinstance(shm, SharedMemorySink) and shm.init_display()
+    shm.display_image(image)
+    shm.close()
+    assert (np.fromfile(shm_path, dtype=">u2") == 0xF800).all()
+    print("✓ null / image / shm 后端正常")
+
+def test_spi_transport():
+    """测试 SPI 传输层"""
+    print("\n测试 SPI 传输层...")
+    import os
+    import tempfile
+    from screen.core.spi import SpiTransport, MockSpi, detect_bufsiz
+    
+    tmp_dir = tempfile.mkdtemp()
+    bufsiz_path = os.path.join(tmp_dir, "bufsiz")
+    with open(bufsiz_path, "w") as f:
+        f.write("65536\n")
+    assert detect_bufsiz(bufsiz_path) == 65536
+    assert detect_bufsiz(os.path.join(tmp_dir, "missing")) == 4096
+    
+    mock = MockSpi(simulate=False)
+    transport = SpiTransport(chunk_size=1000, spi=mock)
+    transport.open()
+    transport.writebytes2(bytearray(2500))
+    assert mock.calls == 3 and mock.bytes_written == 2500
+    stats = transport.get_stats()
+    assert stats["transfers"] == 1 and stats["spi_bytes"] == 2500
+    print("✓ SPI 分块与统计正常")
+
+def test_hardware_scroll():
+    """测试分屏滑动"""
+    print("\n测试分屏滑动...")
+    from PIL import Image
+    from screen.core.display import DisplayDriver
+    from screen.core.backends import FramebufferSink
+    from screen.core.scroll import HardwareScroller
+    from screen.core.spi import MockSpi
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock", "display.scroll.interval": 0}.get(key, default)
+    
+    red = Image.new("RGB", (320, 240), (255, 0, 0))
+    blue = Image.new("RGB", (320, 240), (0, 0, 255))
+    
+    # ST7789：每步只发送新露出的 8 列
+    driver = DisplayDriver(MockConfig(), spi=MockSpi(simulate=False))
+    driver.init_spi()
+    driver.display_image(red)
+    scroller = HardwareScroller(driver, MockConfig())
+    scroller.slide(blue)
+    assert scroller.get_stats()["slide_bytes"] == 320 * 240 * 2
+    assert driver.get_stats()["transfers"] > 40
+    assert (driver.current_frame() == 0x001F).all()
+    
+    # 无硬件滚动的后端逐帧合成，最终画面一致
+    sink = FramebufferSink(MockConfig())
+    sink.init_display()
+    sink.display_image(red)
+    HardwareScroller(sink, MockConfig()).slide(blue, direction=-1)
+    assert (sink._fb == 0x001F).all()
+    print("✓ 硬件/软件滑动正常")
+
+def test_rgb444_mode():
+    """测试 12 位 RGB444 传输模式"""
+    print("\n测试 RGB444 传输模式...")
+    import numpy as np
+    from screen.core.display import DisplayDriver
+    from screen.core.rgb565 import RGB444Packer
+    from screen.core.spi import MockSpi
+    
+    # 两像素打包为 3 字节：R0G0 B0R1 G1B1
+    frame = np.array([[0xF800 | 0x0400, 0x001F | 0x07E0]], dtype=">u2")
+    packed = bytes(RGB444Packer(2).pack(frame))
+    assert packed == bytes([0xF8, 0x00, 0xFF]), packed.hex()
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock", "display.pixel_format": "rgb444"}.get(key, default)
+    
+    driver = DisplayDriver(MockConfig(), spi=MockSpi(simulate=False))
+    driver.init_spi()
+    driver.send_frame(np.zeros((240, 320), dtype=">u2"))
+    assert driver.get_stats()["bytes_sent"] == 320 * 240 * 3 // 2
+    
+    # 局部刷新窗口按偶数列对齐：第 3 列 -> 2..3 列
+    frame = np.zeros((240, 320), dtype=">u2")
+    frame[10, 3] = 0xFFFF
+    driver.send_frame(frame)
+    assert driver.get_stats()["bytes_sent"] == 320 * 240 * 3 // 2 + 3
+    
+    # 切换格式后整帧重发，不支持的格式保持原样
+    assert driver.set_pixel_format("rgb565")
+    assert driver.full_frame_pending
+    driver.send_frame(frame)
+    assert driver.get_stats()["bytes_sent"] == 320 * 240 * 3 // 2 + 3 + 320 * 240 * 2
+    assert not driver.set_pixel_format("rgb666")
+    assert driver.pixel_format == "rgb565"
+    
+    # 只支持 rgb565 的后端：主循环每次重绘都设置格式，同一格式只警告一次
+    from unittest import mock
+    from screen.core.backends import FramebufferSink
+    for config, warnings in ((None, 0), (MockConfig(), 1)):
+        logger = mock.Mock()
+        sink = FramebufferSink(config, logger)
+        # 配置了 rgb444 时构造即警告一次
+        assert logger.warning.call_count == warnings
+        for _ in range(3):
+            assert not sink.set_pixel_format("rgb444")
+        assert logger.warning.call_count == 1
+    print("✓ RGB444 打包与格式切换正常")
+
+def test_power_states():
+    """测试面板电源状态"""
+    print("\n测试面板电源状态...")
+    from datetime import datetime
+    from screen.core.backends import CommandRecorder
+    from screen.core.power import PowerManager
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {
+                "display.power.enabled": True,
+                "display.power.schedule": [
+                    {"start": "23:00", "end": "06:00", "state": "sleep"},
+                    {"start": "06:00", "end": "07:00", "state": "partial"},
+                    {"start": "07:00", "end": "07:30", "state": "idle"},
+                ],
+                "display.power.partial_columns": [100, 219],
+                "display.power.redraw_interval": {"partial": 10.0},
+            }.get(key, default)
+    
+    driver = CommandRecorder(MockConfig())
+    driver.init_spi()
+    power = PowerManager(driver, MockConfig())
+    
+    assert power.scheduled_state(datetime(2026, 1, 1, 0, 30)) == "sleep"
+    assert power.scheduled_state(datetime(2026, 1, 1, 12, 0)) == "normal"
+    
+    power.update(datetime(2026, 1, 1, 6, 15))
+    assert driver.commands == [[0x30, bytearray([0, 100, 0, 219]), 0], [0x12, bytearray(), 0]]
+    assert power.redraw_interval(1.0) == 10.0
+    
+    driver.clear()
+    power.update(datetime(2026, 1, 1, 7, 10))
+    assert driver.command_codes() == [0x13, 0x39]
+    
+    driver.clear()
+    power.update(datetime(2026, 1, 1, 23, 30))
+    assert driver.command_codes() == [0x38, 0x10]
+    assert power.redraw_interval(1.0) is None
+    
+    # 用户操作临时唤醒
+    driver.clear()
+    power.wake()
+    assert power.update(datetime(2026, 1, 1, 23, 30)) == "normal"
+    assert driver.command_codes() == [0x11]
+    assert power.get_stats()["power_transitions"] == 4
+    
+    # 命令序列中途失败：恢复原状态与列范围，屏幕内容视为未知
+    import numpy as np
+    from unittest import mock
+    driver.send_frame(np.zeros((240, 320), dtype=">u2"))
+    with mock.patch.object(driver, "_apply_power_state", side_effect=OSError("spi")):
+        assert not driver.set_power_state("partial", (10, 20))
+    assert driver.power_state == "normal" and driver.partial_columns == (100, 219)
+    assert driver.current_frame() is None
+    print("✓ 电源状态切换与命令序列正常")
+
+def test_frame_export():
+    """测试共享内存帧导出"""
+    print("\n测试共享内存帧导出...")
+    import os
+    import tempfile
+    import threading
+    import numpy as np
+    from screen.core.backends import NullSink
+    from screen.core.frame_export import FrameExport, FrameReader
+    
+    path = os.path.join(tempfile.mkdtemp(), "frame")
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock", "display.export.enabled": True,
+                    "display.export.path": path}.get(key, default)
+    
+    sink = NullSink(MockConfig())
+    sink.init_display()
+    sink.set_page(3)
+    frame = np.full((240, 320), 0x1234, dtype=">u2")
+    sink.send_frame(frame)
+    
+    reader = FrameReader(path)
+    pixels, seq, timestamp, page = reader.read()
+    assert (pixels == frame).all() and page == 3 and seq == 2 and timestamp > 0
+    # 屏幕当前内容就是共享内存本身
+    assert sink.current_frame() is sink._export.frame
+    sink.close()
+    reader.close()
+    
+    # 写入与读取并发时读到的始终是完整的一帧
+    export = FrameExport(path, 320, 240)
+    reader = FrameReader(path)
+    stop = threading.Event()
+    
+    def writer():
+        value = 0
+        while not stop.is_set():
+            value = (value + 1) & 0xFFFF
+            export.publish(np.full((240, 320), value, dtype=">u2"), value)
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(200):
+            result = reader.read()
+            if result:
+                pixels, _, _, page = result
+                assert (pixels == pixels[0, 0]).all() and pixels[0, 0] == page
+    finally:
+        stop.set()
+        thread.join()
+    reader.close()
+    export.close()
+    print("✓ 帧导出与顺序锁读取正常")
+
+def test_stream_loopback():
+    """测试远程渲染推流（本机回环）"""
+    print("\n测试远程渲染推流...")
+    import socket
+    import time
+    import numpy as np
+    from PIL import Image
+    from screen.core.backends import FramebufferSink
+    from screen.core.stream import StreamReceiver, StreamSink
+    
+    settings = {"hardware.gpio.backend": "mock", "display.stream.receiver.bind": "127.0.0.1",
+                "display.stream.receiver.port": 0, "display.stream.receiver.timeout": 0.5}
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return settings.get(key, default)
+    
+    def wait_for(condition, timeout=3.0):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        return condition()
+    
+    # 接收端晚于发送端启动：初始化仍然成功，接收端就绪后按 retry_interval 重连
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    settings["display.stream.receiver.port"] = settings["display.stream.port"] = probe.getsockname()[1]
+    probe.close()
+    settings["display.stream.retry_interval"] = 0.05
+    panel = FramebufferSink(MockConfig())
+    panel.init_display()
+    sink = StreamSink(MockConfig())
+    receiver = StreamReceiver(panel, MockConfig())
+    try:
+        assert sink.init_display() and not sink.is_ready()
+        sink.display_image(Image.new("RGB", (320, 240)))
+        assert sink.get_stats()["frames"] == 0
+        receiver.start()
+        assert wait_for(sink.is_ready)
+        frame = np.zeros((240, 320), dtype=">u2")
+        frame[:, 100:] = 0xF800
+        sink.send_frame(frame)
+        assert wait_for(lambda: receiver.keyframes == 1)
+        assert receiver.active and (panel._fb == frame).all()
+        
+        # 增量帧只传变化的图块
+        frame[10:20, 10:20] = 0x07E0
+        sink.send_frame(frame)
+        assert wait_for(lambda: receiver.frames == 2)
+        assert (panel._fb == frame).all() and sink.get_stats()["keyframes"] == 1
+        
+        # 期间发生本地渲染：丢弃增量帧并请求关键帧，下一帧整帧重新同步
+        panel.send_frame(np.zeros((240, 320), dtype=">u2"))
+        frame[30:40, 30:40] = 0x001F
+        sink.send_frame(frame)
+        assert wait_for(lambda: receiver.dropped == 1)
+        time.sleep(0.05)
+        sink.send_frame(frame)
+        assert wait_for(lambda: receiver.keyframes == 2)
+        assert (panel._fb == frame).all()
+        
+        # 每帧结束通知驱动；面板睡眠时只更新画布，唤醒后整帧补发
+        ends = []
+        panel._end_frame = lambda: ends.append(1)
+        panel.set_power_state("sleep")
+        frame[50:60, 50:60] = 0xFFFF
+        sink.send_frame(frame)
+        assert wait_for(lambda: receiver.frames == 4)
+        assert not ends and not (panel._fb == frame).all()
+        panel.set_power_state("normal")
+        sink.send_frame(frame)
+        assert wait_for(lambda: receiver.frames == 5)
+        assert ends == [1] and (panel._fb == frame).all()
+        
+        # 发送端停止后超时回退本地渲染
+        assert wait_for(lambda: not receiver.active)
+        
+        # 压缩长度超出图块尺寸或解压后超长：读取负载之前即断开连接，屏幕不变
+        import struct
+        import zlib
+        from screen.core.stream import MAGIC
+        sink.close()
+        for size, payload in ((0xFFFFFFFF, b""), (None, zlib.compress(bytes(1000)))):
+            attacker = socket.create_connection(("127.0.0.1", receiver.port))
+            attacker.settimeout(0.3)
+            attacker.sendall(struct.pack("<4sBBIhH", MAGIC, 0, 0, 1, 0, 1) +
+                             struct.pack("<HHHHI", 0, 0, 4, 4, len(payload) if size is None else size) + payload)
+            assert attacker.recv(1) == b""
+            attacker.close()
+        assert (panel._fb == frame).all()
+    finally:
+        sink.close()
+        receiver.stop()
+    print("✓ 关键帧、增量帧、超时回退与异常图块拒绝正常")
+
+def test_frame_recorder():
+    """测试帧录制与回放"""
+    print("\n测试帧录制与回放...")
+    import os
+    import tempfile
+    import numpy as np
+    from screen.core.backends import FramebufferSink, NullSink
+    from screen.core.recorder import FrameRecorder, FrameRecording, replay, rle_decode, rle_encode
+    
+    words = np.array([0, 0, 0, 7, 7, 1], dtype=np.uint16)
+    assert (rle_decode(rle_encode(words), np.empty(6, dtype=np.uint16)) == words).all()
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock"}.get(key, default)
+    
+    # 通过帧监听器录制送往屏幕的每一帧
+    path = os.path.join(tempfile.mkdtemp(), "screen.tftr")
+    sink = NullSink(MockConfig())
+    sink.init_display()
+    recorder = FrameRecorder(path, 320, 240, keyframe_interval=4)
+    sink.add_frame_listener(recorder.write)
+    frames = []
+    for i in range(10):
+        frame = np.zeros((240, 320), dtype=">u2")
+        frame[i * 10:i * 10 + 10, :50] = 0xF800 + i
+        sink.set_page(i % 3)
+        sink.send_frame(frame)
+        frames.append(frame)
+    recorder.close()
+    stats = recorder.get_stats()
+    assert stats["recorded_frames"] == 10 and stats["recorded_keyframes"] == 3
+    assert stats["compression"] > 50
+    
+    recording = FrameRecording(path)
+    decoded = [(page, frame.copy()) for _, page, frame in recording]
+    assert [page for page, _ in decoded] == [i % 3 for i in range(10)]
+    assert all((a == b).all() for (_, a), b in zip(decoded, frames))
+    
+    # 回放到帧缓冲后端，局部刷新只发送变化区域
+    panel = FramebufferSink(MockConfig())
+    panel.init_display()
+    result = replay(recording, panel, speed=0)
+    assert result["frames"] == 10 and (panel._fb == frames[-1]).all()
+    assert result["bytes_sent"] < result["full_frame_bytes"] / 4
+    print("✓ 录制、解码与回放正常")
+
+def test_page_transitions():
+    """测试页面切换动画"""
+    print("\n测试页面切换动画...")
+    from PIL import Image
+    from screen.core.display import DisplayDriver
+    from screen.core.backends import FramebufferSink
+    from screen.core.spi import MockSpi
+    from screen.ui.transitions import TransitionEngine
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock", "display.transition.fps": 1000}.get(key, default)
+    
+    red = Image.new("RGB", (320, 240), (255, 0, 0))
+    blue = Image.new("RGB", (320, 240), (0, 0, 255))
+    half = Image.new("RGB", (320, 240), (0, 0, 255))
+    half.paste((255, 0, 0), (0, 0, 160, 240))
+    
+    # 帧缓冲后端：wipe 只写右半边（两页不同的区域），fade 与软件 slide 结束于新页面
+    sink = FramebufferSink(MockConfig())
+    sink.init_display()
+    sink.display_image(half)
+    engine = TransitionEngine(sink, MockConfig())
+    engine.fps = 20
+    before = sink.get_stats()["bytes_sent"]
+    assert engine.run(red, effect="wipe")
+    assert sink.get_stats()["bytes_sent"] - before == 160 * 240 * 2
+    assert (sink._fb == 0xF800).all() and (sink.current_frame() == 0xF800).all()
+    assert engine.run(blue, effect="fade")
+    assert (sink._fb == 0x001F).all()
+    engine.run(red, effect="slide", direction=-1)
+    assert (sink._fb == 0xF800).all()
+    
+    # ST7789：硬件滚动 slide，只发送新露出的列
+    driver = DisplayDriver(MockConfig(), spi=MockSpi(simulate=False))
+    driver.init_spi()
+    driver.display_image(red)
+    engine = TransitionEngine(driver, MockConfig())
+    engine.fps = 20
+    before = driver.get_stats()["bytes_sent"]
+    assert engine.run(blue, effect="slide")
+    assert driver.get_stats()["bytes_sent"] - before == 320 * 240 * 2
+    assert (driver.current_frame() == 0x001F).all()
+    
+    # 切换像素格式后仍从当前画面播放动画，结束时整帧发送一次新页面
+    assert driver.set_pixel_format("rgb444")
+    assert driver.current_frame() is not None and driver.full_frame_pending
+    full = driver.get_stats()["full_frames"]
+    assert engine.run(half, effect="wipe")
+    assert driver.get_stats()["full_frames"] == full + 1 and not driver.full_frame_pending
+    assert (driver.current_frame()[:, :160] == 0xF800).all()
+    assert driver.set_pixel_format("rgb565")
+    
+    # 预算过小：放弃动画，硬切到新页面（时钟每次读取前进 1 秒，第一步必然超出预算）
+    import itertools
+    ticks = itertools.count()
+    engine._clock = lambda: float(next(ticks))
+    engine.fps = 1000
+    engine.duration = 1.0
+    assert not engine.run(red, effect="fade")
+    assert (driver.current_frame() == 0xF800).all()
+    stats = engine.get_stats()
+    assert stats["transitions"] == 3 and stats["transitions_aborted"] == 1
+    assert stats["transition_fps"] > 0
+    print(f"✓ slide/wipe/fade 与超预算硬切正常（单步 {stats['transition_step_fps']:.0f} 步/秒）")
+
+def test_theme_layers():
+    """测试主题图层缓存"""
+    print("\n测试主题图层缓存...")
+    import numpy as np
+    from unittest import mock
+    from screen.ui import themes
+    
+    assert themes.get_time_band(6) == 0 and themes.get_time_band(23) == len(themes.TIME_BANDS)
+    
+    # 同一时段复用渐变，返回的背景为独立副本
+    cache = themes.ThemeLayerCache()
+    with mock.patch.object(themes, "get_time_band", return_value=1):
+        first = cache.background()
+        first.paste((255, 0, 0), (0, 0, 10, 10))
+        second = cache.background()
+        assert second.getpixel((0, 0)) == (15, 20, 28)
+        assert second.getpixel((0, 239)) == tuple(int(a * (1 - 239 / 240) + b * 239 / 240)
+                                                  for a, b in zip((15, 20, 28), (18, 25, 32)))
+        assert cache.get_stats()["theme_misses"] == 1 and cache.get_stats()["theme_hits"] == 1
+    
+    # 时段变化后自动重新渲染
+    with mock.patch.object(themes, "get_time_band", return_value=5):
+        assert cache.background().getpixel((0, 0)) == themes.LATE_NIGHT_COLORS[0]
+        assert cache.get_stats()["theme_misses"] == 2 and cache.get_stats()["theme_layers"] == 1
+    
+    gradient = np.asarray(themes.render_vertical_gradient(4, 28, (15, 18, 25), (8, 10, 15)))
+    assert (gradient[0, 0] == (15, 18, 25)).all() and (gradient[:, 0] == gradient[:, 3]).all()
+    print("✓ 渐变图层按时段缓存与失效正常")
+
+def test_widget_page():
+    """测试保留模式控件页面"""
+    print("\n测试保留模式控件页面...")
+    import numpy as np
+    from PIL import ImageFont
+    from screen.core.backends import FramebufferSink
+    from screen.core.data_store import DataStore
+    from screen.ui.widgets import Bar, Card, Label, WidgetPage
+    
+    class MockConfig:
+        def get(self, key, default=None):
+            return {"hardware.gpio.backend": "mock"}.get(key, default)
+    
+    def build():
+        return [
+            Card(10, 10, 300, 60),
+            Label(20, 20, 100, 14, ("cpu_u",), lambda cpu: f"CPU {cpu:.0f}%", font="f"),
+            Bar(20, 40, 200, 8, ("cpu_u",), lambda cpu: cpu),
+            Label(20, 200, 100, 14, ("ip",), font="f"),
+        ]
+    
+    fonts = {"f": ImageFont.load_default()}
+    store = DataStore()
+    page = WidgetPage(build())
+    page.render(store, fonts)
+    assert page.dirty_regions == [(0, 0, 319, 239)]
+    page.render(store, fonts)
+    assert page.dirty_regions == []
+    
+    # 只有绑定 cpu_u 的两个控件重绘，结果与整页重绘一致
+    store.set("cpu_u", 42.0)
+    image = page.render(store, fonts)
+    assert page.dirty_regions == [(20, 20, 119, 33), (20, 40, 219, 47)] and page.canvas is image
+    fresh = WidgetPage(build())
+    assert np.array_equal(np.asarray(image), np.asarray(fresh.render(store, fonts)))
+    
+    # 变化区域提示：显示层只在提示矩形内比对
+    sink = FramebufferSink(MockConfig())
+    sink.init_display()
+    sink.display_image(image)
+    store.set("ip", "10.0.0.2")
+    image = page.render(store, fonts)
+    sink.display_image(image, page.dirty_regions)
+    assert sink.get_stats()["hinted_frames"] == 1
+    assert (sink._fb == sink.image_to_rgb565_array(image)).all()
+    
+    # 屏幕被其他途径改写后提示失效，退回整帧比对
+    sink.adopt_frame(np.zeros((240, 320), dtype=">u2"))
+    sink.display_image(image, [])
+    assert sink.get_stats()["hinted_frames"] == 1
+    assert (sink._fb == sink.image_to_rgb565_array(image)).all()
+    print(f"✓ 控件增量重绘与变化区域提示正常（{page.get_stats()}）")
+
+def test_text_cache():
+    """测试文字栅格缓存"""
+    print("\n测试文字栅格缓存...")
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+    from screen.utils.cache import ByteLRUCache
+    from screen.ui.text_cache import CachedDraw, text_cache
+    
+    # 按字节数淘汰最久未使用的条目
+    cache = ByteLRUCache(100, name="t")
+    cache.put("a", 1, 40)
+    cache.put("b", 2, 40)
+    assert cache.get("a") == 1
+    cache.put("c", 3, 40)
+    assert "b" not in cache and "a" in cache and cache.bytes == 80
+    cache.put("huge", 4, 200)
+    assert "huge" not in cache and cache.get_stats()["t_evictions"] == 1
+    
+    # 与 draw.text / draw.textbbox 逐像素一致，换颜色仍命中同一条目
+    font = ImageFont.load_default()
+    text_cache.clear()
+    hits = text_cache.hits
+    expected = Image.new("RGB", (120, 40), (10, 20, 30))
+    actual = expected.copy()
+    for draw in (ImageDraw.Draw(expected), CachedDraw(actual)):
+        draw.text((3, 2), "ASSETS", (255, 230, 100), font)
+        draw.text((3, 20), "ASSETS", (38, 166, 91), font)
+        draw.text((60, -4), "+1.5%", (234, 57, 67), font)
+    assert np.array_equal(np.asarray(expected), np.asarray(actual))
+    assert CachedDraw(actual).textbbox((5, 5), "ASSETS", font) == ImageDraw.Draw(actual).textbbox((5, 5), "ASSETS", font)
+    stats = text_cache.get_stats()
+    assert stats["text_cache_entries"] == 2 and text_cache.hits - hits == 2
+    print(f"✓ 文字缓存一致且按字节淘汰（{stats['text_cache_bytes']} 字节）")
+
+def test_glyph_atlas():
+    """测试字形图集"""
+    print("\n测试字形图集...")
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+    from screen.bench.text import find_font
+    from screen.ui.glyph_atlas import GlyphAtlas, get_atlas, register_atlas
+    from screen.ui.text_cache import CachedDraw, text_cache
+    
+    path = find_font()
+    if not path:
+        print("⚠ 未找到 TrueType 字体，跳过")
+        return
+    font = ImageFont.truetype(path, 11)
+    atlas = GlyphAtlas(font)
+    ascii_glyphs = atlas.rasterized
+    
+    # 边界框与 font.getbbox 一致，组字结果与 draw.text 逐像素一致
+    for text in ("CPU 23.5%", " 12:34 ", "", " "):
+        assert atlas.render(text)[1] == font.getbbox(text), text
+    expected = Image.new("RGB", (160, 20), (20, 24, 32))
+    actual = expected.copy()
+    ImageDraw.Draw(expected).text((4, 3), "CPU 23.5%  RAM 61%", (200, 210, 225), font)
+    atlas.draw_text(actual, (4, 3), "CPU 23.5%  RAM 61%", (200, 210, 225))
+    assert np.array_equal(np.asarray(expected), np.asarray(actual))
+    frame = np.full((20, 160, 3), (20, 24, 32), dtype=np.uint8)
+    atlas.blit(frame, (4, 3), "CPU 23.5%  RAM 61%", (200, 210, 225))
+    assert np.array_equal(frame, np.asarray(expected))
+    # 超出帧缓冲的部分被裁掉
+    atlas.blit(frame, (150, -5), "CPU", (255, 255, 255))
+    
+    # 新字符首次出现时追加，之后不再栅格化
+    atlas.render_mask("晴 18°C")
+    added = atlas.rasterized - ascii_glyphs
+    atlas.render_mask("晴 18°C")
+    assert added > 0 and atlas.rasterized - ascii_glyphs == added
+    
+    # 注册后 CachedDraw 的新文字由图集组字
+    registered = register_atlas(font)
+    assert get_atlas(ImageFont.truetype(path, 11)) is registered
+    text_cache.clear()
+    before = registered.rasterized
+    expected = Image.new("RGB", (160, 20), (20, 24, 32))
+    actual = expected.copy()
+    ImageDraw.Draw(expected).text((2, 2), "BTC +2.31%", (38, 166, 91), font)
+    CachedDraw(actual).text((2, 2), "BTC +2.31%", (38, 166, 91), font)
+    assert np.array_equal(np.asarray(expected), np.asarray(actual))
+    assert registered.rasterized == before
+    print(f"✓ 图集组字与 draw.text 一致（{atlas.get_stats()['glyphs']} 字形）")
+
+def test_charts():
+    """测试向量化图表渲染"""
+    print("\n测试图表渲染...")
+    import numpy as np
+    from PIL import Image, ImageDraw
+    from screen.ui import charts
+    
+    rng = np.random.default_rng(3)
+    closes = 100 + np.cumsum(rng.normal(0, 1, 40))
+    opens = np.concatenate(([100.0], closes[:-1]))
+    highs = np.maximum(opens, closes) + rng.uniform(0, 0.5, 40)
+    lows = np.minimum(opens, closes) - rng.uniform(0, 0.5, 40)
+    up, down = (38, 166, 91), (234, 57, 67)
+    
+    # 参考：逐根 draw.line + draw.rectangle
+    expected = Image.new("RGB", (320, 240), (20, 25, 32))
+    draw = ImageDraw.Draw(expected)
+    base, span = charts.price_scale(lows.min(), highs.max(), 0.05)
+    to_y = lambda p: max(40, min(190, 40 + int((1 - (p - base) / span) * 150)))
+    for i in range(40):
+        bx = 10 + i * 4
+        color = up if closes[i] >= opens[i] else down
+        draw.line([bx + 1, to_y(highs[i]), bx + 1, to_y(lows[i])], fill=color)
+        top, bottom = sorted((to_y(opens[i]), to_y(closes[i])))
+        draw.rectangle([bx, top, bx + 3, max(bottom, top + 2)], fill=color)
+    
+    geom = charts.candle_geometry(opens, highs, lows, closes, 10, 40, 150, 3)
+    # 逐根绘制与掩码光栅化两条路径都与参考逐像素一致
+    saved = charts.RASTER_MIN_CANDLES
+    try:
+        for threshold in (saved, 0):
+            charts.RASTER_MIN_CANDLES = threshold
+            actual = Image.new("RGB", (320, 240), (20, 25, 32))
+            charts.draw_candles(actual, geom, up, down)
+            assert np.array_equal(np.asarray(expected), np.asarray(actual))
+    finally:
+        charts.RASTER_MIN_CANDLES = saved
+    frame = np.full((240, 320, 3), (20, 25, 32), dtype=np.uint8)
+    charts.rasterize_candles(frame, geom, up, down)
+    assert np.array_equal(np.asarray(expected), frame)
+    
+    # 迷你 K 线与折线：数据不足时不绘制
+    image = Image.new("RGB", (100, 30))
+    charts.draw_mini_kline(image, 0, 0, 80, 16, [1.0])
+    charts.draw_sparkline(image, 0, 0, 80, 16, [], (255, 255, 255))
+    assert image.getbbox() is None
+    assert charts.sparkline_points([1, 3, 2], 0, 0, 11, 5) == [(0, 4), (5, 0), (10, 2)]
+    assert charts.bar_fill_widths([0, 50, 150], 48).tolist() == [2, 24, 48]
+    print(f"✓ {len(geom.left)} 根蜡烛两条路径与逐根绘制一致")
+
+def test_weather_sprites():
+    """测试天气图标精灵图"""
+    print("\n测试天气图标精灵图...")
+    import numpy as np
+    from PIL import Image, ImageDraw
+    from screen.ui.weather_icons import FRAME_COUNT, WeatherSprites, paint_weather_icon, weather_kind
+    
+    # 图标代码与描述文字归类一致，未知代码退回文字匹配
+    assert weather_kind("", "100") == weather_kind("晴") == "sun"
+    assert weather_kind("", "103") == "sun" and weather_kind("", "104") == "cloud"
+    assert weather_kind("", "305") == "rain" and weather_kind("", "404") == "rain"
+    assert weather_kind("", "400") == "snow" and weather_kind("", "501") == "default"
+    assert weather_kind("小雪", None) == "snow" and weather_kind("小雨", "abc") == "rain"
+    
+    # 每一帧都与直接绘制逐像素一致，相同画面共用格子
+    sprites = WeatherSprites()
+    for kind in ("sun", "rain", "snow", "cloud", "default"):
+        for frame in range(FRAME_COUNT):
+            expected = Image.new("RGB", (80, 80), (18, 22, 30))
+            actual = expected.copy()
+            paint_weather_icon(ImageDraw.Draw(expected), 24, 24, 32, kind, frame)
+            sprites.draw(actual, 24, 24, 32, kind, frame)
+            assert np.array_equal(np.asarray(expected), np.asarray(actual)), (kind, frame)
+    sheet, cells, _ = sprites.sheet("rain", 32)
+    assert len(cells) == 5 and sheet.width == cells[0][0].width * 5
+    assert sprites.sheets_built == 5
+    print(f"✓ 精灵图与直接绘制一致（{sprites.get_stats()['weather_sprite_bytes']} 字节）")
+
+def test_decoration_cache():
+    """测试装饰图层缓存"""
+    print("\n测试装饰图层缓存...")
+    import numpy as np
+    from PIL import Image, ImageDraw
+    from screen.ui.components import blit_decoration, decoration_cache
+    
+    # 卡片与 rounded_rectangle 逐像素一致（含越界裁剪），相同参数只渲染一次
+    decoration_cache.clear()
+    misses = decoration_cache.misses
+    expected = Image.new("RGB", (320, 240), (30, 40, 50))
+    actual = expected.copy()
+    draw = ImageDraw.Draw(expected)
+    for x, y in ((4, 30), (4, 100), (250, 200)):
+        draw.rounded_rectangle([x, y, x + 140, y + 50], 6, fill=(18, 22, 30))
+        blit_decoration(actual, (x, y), "card", w=140, h=50, radius=6, fill=(18, 22, 30))
+    draw.rounded_rectangle([10, 10, 110, 90], 5, outline=(50, 58, 72))
+    blit_decoration(actual, (10, 10), "card", w=100, h=80, radius=5, outline=(50, 58, 72))
+    assert np.array_equal(np.asarray(expected), np.asarray(actual))
+    assert decoration_cache.misses - misses == 2 and len(decoration_cache) == 2
+    
+    # 光晕以圆心为锚点；整屏背景完全不透明，直接覆盖
+    blit_decoration(actual, (160, 120), "glow", radius=20, color=(255, 140, 40), intensity=5)
+    assert actual.getpixel((160, 120)) == (15, 8, 2) and actual.getpixel((160, 89)) == (30, 40, 50)
+    blit_decoration(actual, (0, 0), "premium_bg", tube_centers=[(60, 90), (260, 90)])
+    assert actual.getpixel((0, 0)) == (20, 20, 24) and actual.getpixel((1, 1)) == (8, 8, 10)
+    print(f"✓ 装饰与直接绘制一致（{decoration_cache.get_stats()['decoration_cache_bytes']} 字节）")
+
+def test_nixie_assets():
+    """测试辉光管素材编译"""
+    print("\n测试辉光管素材编译...")
+    import os
+    import shutil
+    import tempfile
+    import numpy as np
+    from PIL import Image
+    from screen.ui.nixie_assets import NixieAssets
+    
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "辉光管素材图")
+    with tempfile.TemporaryDirectory() as root:
+        for d in "07":
+            shutil.copy(os.path.join(src_dir, f"{d}.png"), root)
+        
+        # 首次加载编译并写出 .nxa，再次加载直接 mmap
+        sprites = NixieAssets(root).load()
+        assert set(sprites) == {"0", "7"} and sprites["0"].height == 110
+        assert os.path.exists(os.path.join(root, "0.nxa"))
+        assets = NixieAssets(root)
+        sprites = assets.load()
+        assert assets.compiled == 0 and assets.mapped == 2
+        
+        # 与原先 LANCZOS 缩放后按 RGBA 贴图相比，只有 RGB565 量化误差
+        src = Image.open(os.path.join(root, "0.png")).convert("RGBA")
+        ref = src.resize((int(src.width * 110 / src.height * 1.45), 110), Image.Resampling.LANCZOS)
+        assert sprites["0"].size == ref.size
+        expected = Image.new("RGB", (320, 240), (5, 5, 8))
+        actual = expected.copy()
+        expected.paste(ref, (40, 28), ref)
+        sprites["0"].blit(actual, (40, 28))
+        assert int(np.abs(np.asarray(expected, dtype=np.int16) - np.asarray(actual, dtype=np.int16)).max()) <= 8
+        
+        # PNG 内容变化后源哈希不匹配，重新编译
+        Image.open(os.path.join(root, "7.png")).transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(
+            os.path.join(root, "7.png"))
+        assets = NixieAssets(root)
+        assets.load()
+        assert assets.compiled == 1 and assets.mapped == 2
+    print(f"✓ 素材编译与 mmap 加载正常（{assets.get_stats()['nixie_bytes']} 字节）")
+
+def test_compositor():
+    """测试 RGB565 合成器"""
+    print("\n测试 RGB565 合成器...")
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+    from screen.core.backends import NullSink
+    from screen.core.rgb565 import rgb888_to_rgb565
+    from screen.ui.compositor import Compositor
+    
+    # 与先用 PIL 画 RGB888 再整帧转换相比，各通道最多差最低一位
+    font = ImageFont.load_default()
+    image = Image.new("RGB", (320, 240), (20, 24, 32))
+    draw = ImageDraw.Draw(image)
+    canvas = Compositor(320, 240, (20, 24, 32))
+    assert canvas.take_dirty() is None
+    draw.rectangle([10, 10, 60, 30], fill=(255, 0, 0))
+    canvas.fill_rect((10, 10, 60, 30), (255, 0, 0))
+    draw.text((12, 40), "12:34", (255, 140, 40), font)
+    canvas.text((12, 40), "12:34", (255, 140, 40), font)
+    sprite = Image.new("RGBA", (20, 20), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).ellipse([0, 0, 19, 19], fill=(100, 200, 255, 180))
+    image.paste(sprite, (300, 220), sprite)
+    pixels = np.asarray(sprite, dtype=np.uint16)
+    premul = rgb888_to_rgb565(((pixels[..., :3] * pixels[..., 3:] + 127) // 255).astype(np.uint8))
+    canvas.blit_premultiplied(premul, pixels[..., 3].astype(np.uint8), (300, 220))
+    draw.rounded_rectangle([100, 100, 200, 150], 6, fill=(60, 70, 80))
+    with canvas.draw_region((100, 100, 200, 150)) as region:
+        ImageDraw.Draw(region).rounded_rectangle([0, 0, 100, 50], 6, fill=(60, 70, 80))
+    
+    expected = rgb888_to_rgb565(np.asarray(image)).astype(np.int32)
+    actual = canvas.frame.astype(np.int32)
+    for shift, mask in ((11, 0x1F), (5, 0x3F), (0, 0x1F)):
+        assert np.abs(((expected >> shift) & mask) - ((actual >> shift) & mask)).max() <= 1
+    dirty = canvas.take_dirty()
+    assert dirty[0] == (10, 10, 60, 30) and dirty[-1] == (100, 100, 200, 150) and dirty[2] == (300, 220, 319, 239)
+    assert canvas.take_dirty() == []
+    
+    # 直接提交 RGB565 帧：亮度仍然生效，与按图像提交的结果一致
+    sink = NullSink()
+    sink.init_display()
+    sink.set_brightness(0.5)
+    sink.display_frame(canvas.frame)
+    dimmed = sink.current_frame().copy()
+    sink.invalidate()
+    sink.display_image(canvas.to_image())
+    assert np.array_equal(dimmed, sink.current_frame())
+    print(f"✓ 合成结果与 PIL 绘制一致（{canvas.get_stats()['compositor_blits']} 次合成）")
+
+def test_thumbnails():
+    """测试缩略图流水线"""
+    print("\n测试缩略图流水线...")
+    import io
+    import numpy as np
+    from PIL import Image
+    from screen.ui.thumbnails import get_thumbnail, has_thumbnail, store_thumbnail, thumb_cache
+    
+    source = Image.fromarray(np.random.randint(0, 255, (30, 40, 3), dtype=np.uint8)).resize((1280, 960))
+    buf = io.BytesIO()
+    source.save(buf, "JPEG", quality=85)
+    
+    # JPEG 按 draft 缩小解码后一次缩放到槽位尺寸，与整图解码再缩放基本一致
+    thumb_cache.clear()
+    store_thumbnail("tg_test_1", buf.getvalue(), [(62, 48), (71, 55)])
+    tile = get_thumbnail("tg_test_1", (62, 48))
+    assert tile.size == (62, 48) and tile.mode == "RGB" and has_thumbnail("tg_test_1", (71, 55))
+    full = Image.open(io.BytesIO(buf.getvalue())).convert("RGB").resize((62, 48), Image.Resampling.LANCZOS)
+    assert np.abs(np.asarray(full, dtype=np.int16) - np.asarray(tile, dtype=np.int16)).mean() < 4
+    
+    # 已缓存的尺寸不再解码；未准备的尺寸取不到
+    misses = thumb_cache.misses
+    store_thumbnail("tg_test_1", b"", [(62, 48)])
+    assert get_thumbnail("tg_test_1", (62, 48)) is tile and get_thumbnail("tg_test_1", (30, 20)) is None
+    assert thumb_cache.misses - misses == 1
+    
+    # PNG 等不支持 draft 的格式同样缩放到槽位尺寸
+    buf = io.BytesIO()
+    source.resize((200, 150)).save(buf, "PNG")
+    store_thumbnail("tg_test_2", buf.getvalue(), [(62, 48)])
+    assert get_thumbnail("tg_test_2", (62, 48)).size == (62, 48)
+    print(f"✓ 缩略图按槽位尺寸缓存（{thumb_cache.get_stats()['thumb_cache_bytes']} 字节）")
+
 if __name__ == "__main__":
     print("=" * 50)
     print("基础模块验证测试")
@@ -64,6 +1056,29 @@ if __name__ == "__main__":
         test_data_store()
         test_config()
         test_hotreload()
+        test_dirty_regions()
+        test_gpio_backends()
+        test_frame_flusher()
+        test_rgb565_converter()
+        test_display_backends()
+        test_spi_transport()
+        test_hardware_scroll()
+        test_rgb444_mode()
+        test_power_states()
+        test_frame_export()
+        test_stream_loopback()
+        test_frame_recorder()
+        test_page_transitions()
+        test_theme_layers()
+        test_widget_page()
+        test_text_cache()
+        test_glyph_atlas()
+        test_charts()
+        test_weather_sprites()
+        test_decoration_cache()
+        test_nixie_assets()
+        test_compositor()
+        test_thumbnails()
         
         print("\n" + "=" * 50)
         print("✅ 所有基础模块测试通过！")